@@ -1,9 +1,10 @@
-from .bignum_lib import Machine, CallStackUnderrun, InstructionFactory, init_stats
+from .bignum_lib import Machine, CallStackUnderrun, Flag, InstructionFactory, init_stats
 from .sim import ins_objects_from_hex_file, ins_objects_from_asm_file
 
 __all__ = [
     'Machine',
     'CallStackUnderrun',
+    'Flag',
     'InstructionFactory',
     'init_stats',
     'ins_objects_from_hex_file',
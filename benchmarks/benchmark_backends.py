@@ -8,46 +8,69 @@ import os
 import statistics
 import subprocess
 import sys
-import time
 from pathlib import Path
 
 WORKLOAD = """
+import sys
+import time
+
 from ot_dsim.bignum_lib.machine import _USE_C_MACHINE
 import sim_rsa_tests as t
 
-t.ENABLE_TRACE_DUMP = False
-t.init_dmem()
-t.load_program_otbn_asm()
-t.breakpoints = {}
 
-msg = t.get_msg_val("ot_dsim benchmark message")
-enc = t.rsa_encrypt(t.RSA_N[768], 3, msg)
-dec = t.rsa_decrypt(t.RSA_N[768], 3, t.RSA_D[768], enc)
+def setup():
+    # Parse the program once; only the RSA operations are timed.
+    t.ENABLE_TRACE_DUMP = False
+    t.init_dmem()
+    t.load_program_otbn_asm()
+    t.breakpoints = {}
+    return t.get_msg_val("ot_dsim benchmark message")
+
 
-if dec != msg:
-    raise RuntimeError("RSA round-trip failed")
+def timed(msg):
+    enc = t.rsa_encrypt(t.RSA_N[768], 3, msg)
+    return t.rsa_decrypt(t.RSA_N[768], 3, t.RSA_D[768], enc)
 
+
+msg = setup()
 print(f"backend={'c' if _USE_C_MACHINE else 'py'}")
-print(f"inst={t.inst_cnt} cycles={t.cycle_cnt}")
+
+for _ in range(int(sys.argv[1])):
+    # Untimed per-rep reset so every rep starts from the same state.
+    t.init_dmem()
+    t.inst_cnt = 0
+    t.cycle_cnt = 0
+
+    start = time.perf_counter()
+    dec = timed(msg)
+    elapsed = time.perf_counter() - start
+
+    if dec != msg:
+        raise RuntimeError("RSA round-trip failed")
+
+    print(f"elapsed={elapsed} inst={t.inst_cnt} cycles={t.cycle_cnt}", flush=True)
 """.strip()
 
 
-def _run_once(python_exe: str, repo_root: Path, force_pure_python: bool):
+def _run_reps(python_exe: str, repo_root: Path, force_pure_python: bool, reps: int):
+    """Run ``reps`` workload repetitions in a single interpreter.
+
+    Returns the backend marker and one ``(elapsed, inst, cycles)`` tuple per
+    repetition, so interpreter startup and imports are paid once per backend.
+    """
     env = os.environ.copy()
     if force_pure_python:
         env["OT_DSIM_PURE_PYTHON"] = "1"
     else:
         env.pop("OT_DSIM_PURE_PYTHON", None)
 
-    start = time.perf_counter()
     proc = subprocess.run(
-        [python_exe, "-c", WORKLOAD],
+        [python_exe, "-c", WORKLOAD, str(reps)],
         cwd=str(repo_root),
         env=env,
         capture_output=True,
         text=True,
     )
-    elapsed = time.perf_counter() - start
 
     if proc.returncode != 0:
         raise RuntimeError(
@@ -55,21 +78,21 @@ def _run_once(python_exe: str, repo_root: Path, force_pure_python: bool):
         )
 
     backend = None
-    inst = None
-    cycles = None
+    results = []
     for line in proc.stdout.splitlines():
         line = line.strip()
         if line.startswith("backend="):
             backend = line.split("=", 1)[1]
-        if line.startswith("inst=") and "cycles=" in line:
-            parts = line.split()
-            inst = int(parts[0].split("=", 1)[1])
-            cycles = int(parts[1].split("=", 1)[1])
+        elif line.startswith("elapsed="):
+            fields = dict(part.split("=", 1) for part in line.split())
+            results.append(
+                (float(fields["elapsed"]), int(fields["inst"]), int(fields["cycles"]))
+            )
 
-    if backend is None or inst is None or cycles is None:
+    if backend is None or len(results) != reps:
         raise RuntimeError(f"unexpected workload output:\n{proc.stdout}\n{proc.stderr}")
 
-    return elapsed, backend, inst, cycles
+    return backend, results
 
 
 def _summary(values):
@@ -81,32 +104,26 @@ def _summary(values):
     }
 
 
-def _run_backend(label, python_exe, repo_root, runs, force_pure_python):
-    durations = []
-    backends = set()
-    inst_cycles = set()
-
-    for _ in range(runs):
-        elapsed, backend, inst, cycles = _run_once(
-            python_exe, repo_root, force_pure_python
-        )
-        durations.append(elapsed)
-        backends.add(backend)
-        inst_cycles.add((inst, cycles))
+def _run_backend(label, python_exe, repo_root, runs, warmup, force_pure_python):
+    backend, results = _run_reps(
+        python_exe, repo_root, force_pure_python, warmup + runs
+    )
+    timed = results[warmup:]
+    durations = [elapsed for elapsed, _, _ in timed]
 
     return {
         "label": label,
         "durations": durations,
         "summary": _summary(durations),
-        "backends": backends,
-        "inst_cycles": inst_cycles,
+        "backends": {backend},
+        "inst_cycles": {(inst, cycles) for _, inst, cycles in timed},
     }
 
 
 def main():
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--runs", type=int, default=3, help="timed runs per backend")
-    parser.add_argument("--warmup", type=int, default=1, help="warmup runs per backend")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed warmup runs per backend")
     parser.add_argument(
         "--python", default=sys.executable, help="python executable to use"
     )
@@ -114,15 +131,12 @@ def main():
 
     repo_root = Path(__file__).resolve().parents[1]
 
-    for _ in range(args.warmup):
-        _run_once(args.python, repo_root, force_pure_python=False)
-        _run_once(args.python, repo_root, force_pure_python=True)
-
     c_result = _run_backend(
         "c-machine",
         args.python,
         repo_root,
         args.runs,
+        args.warmup,
         force_pure_python=False,
     )
     py_result = _run_backend(
@@ -130,6 +144,7 @@ def main():
         args.python,
         repo_root,
         args.runs,
+        args.warmup,
         force_pure_python=True,
     )
 
@@ -1,5 +1,5 @@
-from .machine import Machine, CallStackUnderrun
+from .machine import Machine, CallStackUnderrun, Flag
 from .instructions import InstructionFactory
 from .sim_helpers import init_stats
 
-__all__ = ['Machine', 'CallStackUnderrun', 'InstructionFactory', 'init_stats']
+__all__ = ['Machine', 'CallStackUnderrun', 'Flag', 'InstructionFactory', 'init_stats']
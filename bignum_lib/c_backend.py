@@ -1,11 +1,23 @@
-"""Optional native backend wrappers for 256-bit operations."""
+"""Optional native backend wrappers for 256-bit operations.
+
+Without the _cops extension every helper falls back to plain Python int
+arithmetic. At 256 bits that is already a handful of machine words per
+operation, and converting to and from a fixed-width limb array costs more
+than the operation itself, so there is deliberately no array/JIT fallback.
+"""
 
 from __future__ import annotations
 
-from typing import Tuple
+from typing import List, Sequence, Tuple
+
+# Native module calling convention expected by these wrappers.
+_COPS_ABI_VERSION = 5
 
 try:
     from ot_dsim import _cops as _native
+
+    if getattr(_native, "ABI_VERSION", None) != _COPS_ABI_VERSION:
+        _native = None
 except Exception:
     _native = None
 
@@ -22,6 +34,9 @@ LIMB_MASK = (1 << LIMB_BITS) - 1
 HALF_LIMB_MASK = (1 << HALF_LIMB_BITS) - 1
 HALF_WORD_MASK = (1 << HALF_WORD_BITS) - 1
 
+# All masks up to the word width, indexed by bit count.
+_MASKS = tuple((1 << bits) - 1 for bits in range(XLEN_BITS + 1))
+
 
 def is_available() -> bool:
     return _native is not None
@@ -38,152 +53,260 @@ def _check_u256(name: str, value: int) -> None:
         raise OverflowError(f"{name} must fit in {XLEN_BITS} bits")
 
 
-def _to_u256_bytes(name: str, value: int) -> bytes:
-    _check_u256(name, value)
-    return value.to_bytes(XLEN_BYTES, byteorder="little", signed=False)
-
-
-def _from_u256_bytes(raw: bytes) -> int:
-    return int.from_bytes(raw, byteorder="little", signed=False)
+def _check_batch_lengths(*operands: Sequence) -> None:
+    if len({len(operand) for operand in operands}) > 1:
+        raise ValueError("operands must have equal lengths")
 
 
 def _mask_for_bits(bits: int) -> int:
     if bits <= 0:
         raise ValueError("bit width must be positive")
+    if bits <= XLEN_BITS:
+        return _MASKS[bits]
     return (1 << bits) - 1
 
 
-def add_u256(lhs: int, rhs: int, carry: bool = False) -> Tuple[int, int]:
-    _check_u256("lhs", lhs)
-    _check_u256("rhs", rhs)
-    carry_in = 1 if carry else 0
+# Unchecked variants for the instruction implementations. Their operands
+# come straight out of WDRs (range-checked when written) or from decoded
+# shift immediates, so the pure-Python path skips validation entirely. The
+# native kernels validate in C at no extra cost.
 
-    if _native is None:
-        total = lhs + rhs + carry_in
-        return total & XLEN_MASK, int(total >> XLEN_BITS)
 
-    out_raw, carry_out = _native.u256_add(
-        _to_u256_bytes("lhs", lhs),
-        _to_u256_bytes("rhs", rhs),
-        carry_in,
-    )
-    return _from_u256_bytes(out_raw), int(carry_out)
+def _py_add_u256(
+    lhs: int, rhs: int, carry: int = 0, *, _mask=XLEN_MASK, _bits=XLEN_BITS
+) -> Tuple[int, int]:
+    total = lhs + rhs + carry
+    return total & _mask, total >> _bits
 
 
-def sub_u256(lhs: int, rhs: int, borrow: bool = False) -> Tuple[int, int]:
-    _check_u256("lhs", lhs)
-    _check_u256("rhs", rhs)
-    borrow_in = 1 if borrow else 0
+def _py_sub_u256(
+    lhs: int, rhs: int, borrow: int = 0, *, _mask=XLEN_MASK
+) -> Tuple[int, int]:
+    total = lhs - rhs - borrow
+    return total & _mask, int(total < 0)
 
-    if _native is None:
-        total = lhs - rhs - borrow_in
-        borrow_out = 1 if total < 0 else 0
-        if borrow_out:
-            total += 1 << XLEN_BITS
-        return total & XLEN_MASK, borrow_out
-
-    out_raw, borrow_out = _native.u256_sub(
-        _to_u256_bytes("lhs", lhs),
-        _to_u256_bytes("rhs", rhs),
-        borrow_in,
-    )
-    return _from_u256_bytes(out_raw), int(borrow_out)
 
+def _py_cmp_u256(lhs: int, rhs: int) -> int:
+    return (lhs > rhs) - (lhs < rhs)
 
-def cmp_u256(lhs: int, rhs: int) -> int:
-    _check_u256("lhs", lhs)
-    _check_u256("rhs", rhs)
 
+def _and_u256(lhs: int, rhs: int) -> int:
+    return lhs & rhs
+
+
+def _or_u256(lhs: int, rhs: int) -> int:
+    return lhs | rhs
+
+
+def _xor_u256(lhs: int, rhs: int) -> int:
+    return lhs ^ rhs
+
+
+def _not_u256(value: int, *, _mask=XLEN_MASK) -> int:
+    return value ^ _mask
+
+
+def _py_shl_u256(value: int, shift_bits: int, *, _mask=XLEN_MASK) -> int:
+    return (value << shift_bits) & _mask
+
+
+def _py_shr_u256(value: int, shift_bits: int) -> int:
+    return value >> shift_bits
+
+
+# With _cops available the unchecked names are bound straight to the native
+# kernels, so instruction handlers call into C without an extra Python frame.
+# The pure versions keep their own _py_ names: the checked wrappers below use
+# them whenever _native is None (including when it is patched out), and the
+# tests call them directly. The bitwise helpers always stay in Python: a
+# single int operator is cheaper than the call and the limb conversion.
+if _native is not None:
+    _add_u256 = _native.u256_add
+    _sub_u256 = _native.u256_sub
+    _cmp_u256 = _native.u256_cmp
+    _shl_u256 = _native.u256_shl
+    _shr_u256 = _native.u256_shr
+else:
+    _add_u256 = _py_add_u256
+    _sub_u256 = _py_sub_u256
+    _cmp_u256 = _py_cmp_u256
+    _shl_u256 = _py_shl_u256
+    _shr_u256 = _py_shr_u256
+
+
+def add_u256(lhs: int, rhs: int, carry: bool = False) -> Tuple[int, int]:
     if _native is None:
-        if lhs < rhs:
-            return -1
-        if lhs > rhs:
-            return 1
-        return 0
+        _check_u256("lhs", lhs)
+        _check_u256("rhs", rhs)
+        return _py_add_u256(lhs, rhs, 1 if carry else 0)
+    return _add_u256(lhs, rhs, 1 if carry else 0)
 
-    return int(_native.u256_cmp(_to_u256_bytes("lhs", lhs), _to_u256_bytes("rhs", rhs)))
 
+def sub_u256(lhs: int, rhs: int, borrow: bool = False) -> Tuple[int, int]:
+    if _native is None:
+        _check_u256("lhs", lhs)
+        _check_u256("rhs", rhs)
+        return _py_sub_u256(lhs, rhs, 1 if borrow else 0)
+    return _sub_u256(lhs, rhs, 1 if borrow else 0)
+
+
+def add_u256_batch(
+    lhs: Sequence[int], rhs: Sequence[int], carry: Sequence[bool]
+) -> Tuple[List[int], List[int]]:
+    """Element-wise add_u256, returning ([sum, ...], [carry, ...])."""
+    if _native is not None:
+        return _native.u256_add_batch(lhs, rhs, carry)
+    _check_batch_lengths(lhs, rhs, carry)
+    vals = []
+    carries = []
+    for lhs_val, rhs_val, carry_in in zip(lhs, rhs, carry):
+        val, carry_out = add_u256(lhs_val, rhs_val, carry_in)
+        vals.append(val)
+        carries.append(carry_out)
+    return vals, carries
+
+
+def sub_u256_batch(
+    lhs: Sequence[int], rhs: Sequence[int], borrow: Sequence[bool]
+) -> Tuple[List[int], List[int]]:
+    """Element-wise sub_u256, returning ([diff, ...], [borrow, ...])."""
+    if _native is not None:
+        return _native.u256_sub_batch(lhs, rhs, borrow)
+    _check_batch_lengths(lhs, rhs, borrow)
+    vals = []
+    borrows = []
+    for lhs_val, rhs_val, borrow_in in zip(lhs, rhs, borrow):
+        val, borrow_out = sub_u256(lhs_val, rhs_val, borrow_in)
+        vals.append(val)
+        borrows.append(borrow_out)
+    return vals, borrows
+
+
+def mul_u256(lhs: int, rhs: int) -> int:
+    """Full 256x256 -> 512-bit product."""
+    if _native is not None:
+        return _native.u256_mul_512(lhs, rhs)
 
-def and_u256(lhs: int, rhs: int) -> int:
     _check_u256("lhs", lhs)
     _check_u256("rhs", rhs)
+    return lhs * rhs
+
+
+def mont_mul(x: int, y: int, n: int, n0inv: int, words: int = 1) -> int:
+    """Montgomery product x * y * 2^(-256 * words) mod n.
+
+    Only the low 32 bits of n0inv (-n^-1 mod 2^32) are used, so the
+    full-width dinv computed by the OTBN library can be passed directly.
+    Like the library's conditional subtraction, n is subtracted only when
+    the intermediate result overflows, so the result is below
+    2^(256 * words) but not necessarily below n.
+    """
+    if _native is not None:
+        return _native.mont_mul(x, y, n, n0inv, words)
+
+    _require_int("words", words)
+    if words < 1 or words > 16:
+        raise ValueError("words must be between 1 and 16")
+    bits = words * XLEN_BITS
+    for name, value in (("x", x), ("y", y), ("n", n)):
+        _require_int(name, value)
+        if value < 0 or value >> bits:
+            raise OverflowError(f"{name} must fit in {bits} bits")
+    _require_int("n0inv", n0inv)
+    if not n & 1:
+        raise ValueError("n must be odd")
+
+    r_mask = (1 << bits) - 1
+    m = (x * y * -pow(n, -1, 1 << bits)) & r_mask
+    t = (x * y + m * n) >> bits
+    if t > r_mask:
+        t -= n
+    return t
+
+
+def mont_mul_u256(x: int, y: int, n: int, n0inv: int) -> int:
+    """Single-word Montgomery product, see mont_mul()."""
+    if _native is not None:
+        return _native.mont_mul_256(x, y, n, n0inv)
+    return mont_mul(x, y, n, n0inv)
+
 
+def cmp_u256(lhs: int, rhs: int) -> int:
     if _native is None:
-        return lhs & rhs
+        _check_u256("lhs", lhs)
+        _check_u256("rhs", rhs)
+        return _py_cmp_u256(lhs, rhs)
+    return _cmp_u256(lhs, rhs)
 
-    return _from_u256_bytes(
-        _native.u256_and(_to_u256_bytes("lhs", lhs), _to_u256_bytes("rhs", rhs))
-    )
 
+def cmp_u256_batch(lhs: Sequence[int], rhs: Sequence[int]) -> List[int]:
+    """Element-wise cmp_u256, returning [-1/0/1, ...]."""
+    if _native is not None:
+        return _native.u256_cmp_batch(lhs, rhs)
+    _check_batch_lengths(lhs, rhs)
+    return [cmp_u256(lhs_val, rhs_val) for lhs_val, rhs_val in zip(lhs, rhs)]
 
-def or_u256(lhs: int, rhs: int) -> int:
+
+def and_u256(lhs: int, rhs: int) -> int:
     _check_u256("lhs", lhs)
     _check_u256("rhs", rhs)
+    return lhs & rhs
 
-    if _native is None:
-        return lhs | rhs
 
-    return _from_u256_bytes(
-        _native.u256_or(_to_u256_bytes("lhs", lhs), _to_u256_bytes("rhs", rhs))
-    )
+def or_u256(lhs: int, rhs: int) -> int:
+    _check_u256("lhs", lhs)
+    _check_u256("rhs", rhs)
+    return lhs | rhs
 
 
 def xor_u256(lhs: int, rhs: int) -> int:
     _check_u256("lhs", lhs)
     _check_u256("rhs", rhs)
-
-    if _native is None:
-        return lhs ^ rhs
-
-    return _from_u256_bytes(
-        _native.u256_xor(_to_u256_bytes("lhs", lhs), _to_u256_bytes("rhs", rhs))
-    )
+    return lhs ^ rhs
 
 
 def not_u256(value: int) -> int:
     _check_u256("value", value)
-
-    if _native is None:
-        return (~value) & XLEN_MASK
-
-    return _from_u256_bytes(_native.u256_not(_to_u256_bytes("value", value)))
+    return value ^ XLEN_MASK
 
 
-def shl_u256(value: int, shift_bits: int) -> int:
+def _check_shift(value: int, shift_bits: int) -> None:
     _check_u256("value", value)
     _require_int("shift_bits", shift_bits)
     if shift_bits < 0:
         raise ValueError("shift_bits must be non-negative")
 
+
+def shl_u256(value: int, shift_bits: int) -> int:
     if _native is None:
+        _check_shift(value, shift_bits)
         if shift_bits >= XLEN_BITS:
             return 0
-        return (value << shift_bits) & XLEN_MASK
-
-    return _from_u256_bytes(
-        _native.u256_shl(_to_u256_bytes("value", value), shift_bits)
-    )
+        return _py_shl_u256(value, shift_bits)
+    return _shl_u256(value, shift_bits)
 
 
 def shr_u256(value: int, shift_bits: int) -> int:
-    _check_u256("value", value)
-    _require_int("shift_bits", shift_bits)
-    if shift_bits < 0:
-        raise ValueError("shift_bits must be non-negative")
-
     if _native is None:
-        if shift_bits >= XLEN_BITS:
-            return 0
-        return value >> shift_bits
-
-    return _from_u256_bytes(
-        _native.u256_shr(_to_u256_bytes("value", value), shift_bits)
-    )
+        _check_shift(value, shift_bits)
+        return _py_shr_u256(value, shift_bits)
+    return _shr_u256(value, shift_bits)
 
 
 def get_limb(
     value: int, idx: int, limb_bits: int = LIMB_BITS, xlen_bits: int = XLEN_BITS
 ) -> int:
+    # For the default widths a plain shift-and-mask beats a call into _cops.
+    # Anything out of range falls through to the checks below, and non-int
+    # operands still raise TypeError from the comparison or the shift.
+    if (
+        limb_bits == LIMB_BITS
+        and xlen_bits == XLEN_BITS
+        and 0 <= idx < LIMBS
+        and 0 <= value <= XLEN_MASK
+    ):
+        return (value >> (idx * LIMB_BITS)) & LIMB_MASK
+
     _require_int("idx", idx)
     if idx < 0:
         raise IndexError("limb index out of range")
@@ -199,9 +322,6 @@ def get_limb(
     if value < 0 or value > value_mask:
         raise OverflowError(f"value must fit in {xlen_bits} bits")
 
-    if _native is not None and limb_bits == LIMB_BITS and xlen_bits == XLEN_BITS:
-        return int(_native.u256_get_limb(_to_u256_bytes("value", value), idx))
-
     limb_mask = _mask_for_bits(limb_bits)
     return (value >> (idx * limb_bits)) & limb_mask
 
@@ -213,6 +333,9 @@ def set_limb(
     limb_bits: int = LIMB_BITS,
     xlen_bits: int = XLEN_BITS,
 ) -> int:
+    if _native is not None and limb_bits == LIMB_BITS and xlen_bits == XLEN_BITS:
+        return _native.u256_set_limb(value, idx, limb_value)
+
     _require_int("idx", idx)
     if idx < 0:
         raise IndexError("limb index out of range")
@@ -233,15 +356,30 @@ def set_limb(
     if limb_value < 0 or limb_value > limb_mask:
         raise OverflowError(f"limb_value must fit in {limb_bits} bits")
 
-    if _native is not None and limb_bits == LIMB_BITS and xlen_bits == XLEN_BITS:
-        updated = _native.u256_set_limb(_to_u256_bytes("value", value), idx, limb_value)
-        return _from_u256_bytes(updated)
-
     shift = idx * limb_bits
     clear_mask = ~(limb_mask << shift) & value_mask
     return (value & clear_mask) | (limb_value << shift)
 
 
+def get_limb_batch(values: Sequence[int], idxs: Sequence[int]) -> List[int]:
+    """Element-wise get_limb at the default widths."""
+    _check_batch_lengths(values, idxs)
+    return [get_limb(value, idx) for value, idx in zip(values, idxs)]
+
+
+def set_limb_batch(
+    values: Sequence[int], idxs: Sequence[int], limb_values: Sequence[int]
+) -> List[int]:
+    """Element-wise set_limb at the default widths."""
+    if _native is not None:
+        return _native.u256_set_limb_batch(values, idxs, limb_values)
+    _check_batch_lengths(values, idxs, limb_values)
+    return [
+        set_limb(value, idx, limb_value)
+        for value, idx, limb_value in zip(values, idxs, limb_values)
+    ]
+
+
 def set_half_limb(
     value: int,
     idx: int,
@@ -250,6 +388,9 @@ def set_half_limb(
     limb_bits: int = LIMB_BITS,
     xlen_bits: int = XLEN_BITS,
 ) -> int:
+    if _native is not None and limb_bits == LIMB_BITS and xlen_bits == XLEN_BITS:
+        return _native.u256_set_half_limb(value, idx, upper, half_limb_value)
+
     if limb_bits % 2:
         raise ValueError("limb_bits must be even")
 
@@ -260,15 +401,6 @@ def set_half_limb(
     if half_limb_value < 0 or half_limb_value > half_limb_mask:
         raise OverflowError(f"half_limb_value must fit in {half_limb_bits} bits")
 
-    if _native is not None and limb_bits == LIMB_BITS and xlen_bits == XLEN_BITS:
-        updated = _native.u256_set_half_limb(
-            _to_u256_bytes("value", value),
-            idx,
-            bool(upper),
-            half_limb_value,
-        )
-        return _from_u256_bytes(updated)
-
     base = set_limb(
         value, idx, get_limb(value, idx, limb_bits, xlen_bits), limb_bits, xlen_bits
     )
@@ -281,6 +413,9 @@ def set_half_limb(
 def set_half_word(
     value: int, idx: int, half_word_value: int, xlen_bits: int = XLEN_BITS
 ) -> int:
+    if _native is not None and xlen_bits == XLEN_BITS:
+        return _native.u256_set_half_word(value, idx, half_word_value)
+
     _require_int("idx", idx)
     if idx < 0 or idx >= 2:
         raise IndexError("half-word index out of range")
@@ -297,16 +432,6 @@ def set_half_word(
     if value < 0 or value > value_mask:
         raise OverflowError(f"value must fit in {xlen_bits} bits")
 
-    if _native is not None and xlen_bits == XLEN_BITS:
-        updated = _native.u256_set_half_word(
-            _to_u256_bytes("value", value),
-            idx,
-            half_word_value.to_bytes(
-                HALF_WORD_BITS // 8, byteorder="little", signed=False
-            ),
-        )
-        return _from_u256_bytes(updated)
-
     shift = idx * half_word_bits
     clear_mask = ~(half_word_mask << shift) & value_mask
     return (value & clear_mask) | (half_word_value << shift)
@@ -45,8 +45,8 @@ import logging
 def _shift_u256(value, shift_right, shift_bytes):
     shift_bits = shift_bytes * 8
     if shift_right:
-        return c_backend.shr_u256(value, shift_bits)
-    return c_backend.shl_u256(value, shift_bits)
+        return c_backend._shr_u256(value, shift_bits)
+    return c_backend._shl_u256(value, shift_bits)
 
 
 def _get_imm(asm_str):
@@ -513,6 +513,9 @@ class Ins(object):
 
     zero_ranges = []
 
+    # zero range masks per instruction class, built on first use
+    _zero_masks = {}
+
     def __init__(self, ins, ctx):
         self.ins = ins
         self.ctx = ctx
@@ -583,15 +586,22 @@ class Ins(object):
         limb = reg & 0b111
         return dmem, inc, limb
 
+    @classmethod
+    def get_zero_mask(cls):
+        """Get a mask of all zero ranges of this class and its super classes"""
+        mask = Ins._zero_masks.get(cls)
+        if mask is None:
+            mask = 0
+            for item in cls.mro()[:-1]:
+                for i in item.zero_ranges:
+                    if i:
+                        mask |= (2 ** (i[0] - i[1] + 1) - 1) << i[1]
+            Ins._zero_masks[cls] = mask
+        return mask
+
     def check_zero_ranges(self):
-        # Get Zero ranges from all super classes
-        zero_ranges = []
-        for item in self.__class__.mro()[:-1]:
-            zero_ranges.extend(item.zero_ranges)
-        for i in zero_ranges:
-            if i:
-                if self.get_bit_slice(i[1], i[0] - i[1] + 1):
-                    self.malformed = True
+        if self.ins & self.get_zero_mask():
+            self.malformed = True
 
     @classmethod
     def enc(cls, addr, mnem, params, ctx):
@@ -1000,32 +1010,32 @@ class IAdd(GIStdShift):
         if self.MNEM.get(self.fun) != "addi":
             rs2op = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
         if self.MNEM.get(self.fun) == "add":
-            res, carry_out = c_backend.add_u256(m.get_reg(self.rs1), rs2op)
+            res, carry_out = c_backend._add_u256(m.get_reg(self.rs1), rs2op)
             flag_val = res + (carry_out << m.XLEN)
             m.stat_record_flag_access("n", self.MNEM.get(self.fun))
             m.set_c_z_m_l(flag_val)
         elif self.MNEM.get(self.fun) == "addc":
-            res, carry_out = c_backend.add_u256(
-                m.get_reg(self.rs1), rs2op, bool(m.get_flag("C"))
+            res, carry_out = c_backend._add_u256(
+                m.get_reg(self.rs1), rs2op, m.get_flag("C")
             )
             flag_val = res + (carry_out << m.XLEN)
             m.stat_record_flag_access("n", self.MNEM.get(self.fun))
             m.set_c_z_m_l(flag_val)
         elif self.MNEM.get(self.fun) == "addi":
-            res, carry_out = c_backend.add_u256(m.get_reg(self.rs1), self.imm)
+            res, carry_out = c_backend._add_u256(m.get_reg(self.rs1), self.imm)
             flag_val = res + (carry_out << m.XLEN)
             m.stat_record_flag_access("n", self.MNEM.get(self.fun))
             m.set_c_z_m_l(flag_val)
         elif self.MNEM.get(self.fun) == "addx":
-            res, carry_out = c_backend.add_u256(
-                m.get_reg(self.rs1), rs2op, bool(m.get_flag("C"))
+            res, carry_out = c_backend._add_u256(
+                m.get_reg(self.rs1), rs2op, m.get_flag("C")
             )
             flag_val = res + (carry_out << m.XLEN)
             m.stat_record_flag_access("x", self.MNEM.get(self.fun))
             m.setx_c_z_m_l(flag_val)
         elif self.MNEM.get(self.fun) == "addcx":
-            res, carry_out = c_backend.add_u256(
-                m.get_reg(self.rs1), rs2op, bool(m.get_flag("XC"))
+            res, carry_out = c_backend._add_u256(
+                m.get_reg(self.rs1), rs2op, m.get_flag("XC")
             )
             flag_val = res + (carry_out << m.XLEN)
             m.stat_record_flag_access("x", self.MNEM.get(self.fun))
@@ -1052,7 +1062,7 @@ class IAddm(GIStdShift):
 
     def execute(self, m):
         rs2op = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
-        sum_low, carry_out = c_backend.add_u256(m.get_reg(self.rs1), rs2op)
+        sum_low, carry_out = c_backend._add_u256(m.get_reg(self.rs1), rs2op)
         sum_full = sum_low + (carry_out << m.XLEN)
         res = sum_full % m.get_reg("mod")
         m.set_z_m_l(res)
@@ -1189,30 +1199,30 @@ class ISub(GIStdShift):
             rs2op = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
         b = m.get_reg(self.rs2) > m.get_reg(self.rs1)
         if self.MNEM.get(self.fun) == "sub":
-            res, _ = c_backend.sub_u256(m.get_reg(self.rs1), rs2op)
+            res, _ = c_backend._sub_u256(m.get_reg(self.rs1), rs2op)
             m.set_flag("C", b)
             m.stat_record_flag_access("n", self.MNEM.get(self.fun))
             m.set_z_m_l(res)
         elif self.MNEM.get(self.fun) == "subb":
-            res, _ = c_backend.sub_u256(
-                m.get_reg(self.rs1), rs2op, bool(m.get_flag("C"))
+            res, _ = c_backend._sub_u256(
+                m.get_reg(self.rs1), rs2op, m.get_flag("C")
             )
             m.set_flag("C", b)
             m.stat_record_flag_access("n", self.MNEM.get(self.fun))
             m.set_z_m_l(res)
         elif self.MNEM.get(self.fun) == "subi":
-            res, _ = c_backend.sub_u256(m.get_reg(self.rs1), self.imm)
+            res, _ = c_backend._sub_u256(m.get_reg(self.rs1), self.imm)
             m.set_flag("C", b)
             m.stat_record_flag_access("n", self.MNEM.get(self.fun))
             m.set_z_m_l(res)
         elif self.MNEM.get(self.fun) == "subx":
-            res, _ = c_backend.sub_u256(m.get_reg(self.rs1), rs2op)
+            res, _ = c_backend._sub_u256(m.get_reg(self.rs1), rs2op)
             m.set_flag("XC", b)
             m.stat_record_flag_access("x", self.MNEM.get(self.fun))
             m.setx_z_m_l(res)
         elif self.MNEM.get(self.fun) == "subbx":
-            res, _ = c_backend.sub_u256(
-                m.get_reg(self.rs1), rs2op, bool(m.get_flag("XC"))
+            res, _ = c_backend._sub_u256(
+                m.get_reg(self.rs1), rs2op, m.get_flag("XC")
             )
             m.set_flag("XC", b)
             m.stat_record_flag_access("x", self.MNEM.get(self.fun))
@@ -1239,7 +1249,7 @@ class ISubm(GIStdShift):
 
     def execute(self, m):
         rs2op = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
-        diff_low, borrow_out = c_backend.sub_u256(m.get_reg(self.rs1), rs2op)
+        diff_low, borrow_out = c_backend._sub_u256(m.get_reg(self.rs1), rs2op)
         diff_full = diff_low - (borrow_out << m.XLEN)
         res = diff_full % m.get_reg("mod")
         m.set_z_m_l(res & m.xlen_mask)
@@ -1315,11 +1325,11 @@ class IMul128(GIStd):
     def execute(self, m):
         op1_shift = (m.XLEN // 2) if self.r1_upper else 0
         op2_shift = (m.XLEN // 2) if self.r2_upper else 0
-        op1 = c_backend.and_u256(
-            c_backend.shr_u256(m.get_reg(self.rs1), op1_shift), m.half_xlen_mask
+        op1 = c_backend._and_u256(
+            c_backend._shr_u256(m.get_reg(self.rs1), op1_shift), m.half_xlen_mask
         )
-        op2 = c_backend.and_u256(
-            c_backend.shr_u256(m.get_reg(self.rs2), op2_shift), m.half_xlen_mask
+        op2 = c_backend._and_u256(
+            c_backend._shr_u256(m.get_reg(self.rs2), op2_shift), m.half_xlen_mask
         )
         res = op1 * op2
         m.set_reg(self.rd, res)
@@ -1360,7 +1370,7 @@ class IAnd(GIStdShift):
 
     def execute(self, m):
         rs2op = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
-        res = c_backend.and_u256(m.get_reg(self.rs1), rs2op)
+        res = c_backend._and_u256(m.get_reg(self.rs1), rs2op)
         m.set_z_m_l(res)
         m.set_reg(self.rd, res)
         trace_str = self.get_asm_str()[1]
@@ -1395,7 +1405,7 @@ class IOr(GIStdShift):
 
     def execute(self, m):
         rs2op = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
-        res = c_backend.or_u256(m.get_reg(self.rs1), rs2op)
+        res = c_backend._or_u256(m.get_reg(self.rs1), rs2op)
         m.set_z_m_l(res)
         m.set_reg(self.rd, res)
         trace_str = self.get_asm_str()[1]
@@ -1448,7 +1458,7 @@ class INot(GIStdShift):
 
     def execute(self, m):
         rsop = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
-        res = c_backend.not_u256(rsop)
+        res = c_backend._not_u256(rsop)
         # Use extended flag setting for notx (fun=4)
         if self.fun == 4:
             m.setx_z_m_l(res)
@@ -1487,7 +1497,7 @@ class IXor(GIStdShift):
 
     def execute(self, m):
         rs2op = _shift_u256(m.get_reg(self.rs2), self.shift_right, self.shift_bytes)
-        res = c_backend.xor_u256(m.get_reg(self.rs1), rs2op)
+        res = c_backend._xor_u256(m.get_reg(self.rs1), rs2op)
         m.set_z_m_l(res)
         m.set_reg(self.rd, res)
         trace_str = self.get_asm_str()[1]
@@ -1644,9 +1654,9 @@ class IRshi(GIStd):
         return [IBnRshi(self.rd, self.rs1, self.rs2, self.imm, self.ctx)]
 
     def execute(self, m):
-        upper = c_backend.shl_u256(m.get_reg(self.rs2), m.XLEN - self.imm)
-        lower = c_backend.shr_u256(m.get_reg(self.rs1), self.imm)
-        res = c_backend.or_u256(upper, lower)
+        upper = c_backend._shl_u256(m.get_reg(self.rs2), m.XLEN - self.imm)
+        lower = c_backend._shr_u256(m.get_reg(self.rs1), self.imm)
+        res = c_backend._or_u256(upper, lower)
         m.set_reg(self.rd, res)
         trace_str = self.get_asm_str()[1]
         return trace_str, None
@@ -1695,7 +1705,7 @@ class ICmp(GIStd):
         return None
 
     def execute(self, m):
-        cmp_res = c_backend.cmp_u256(m.get_reg(self.rs1), m.get_reg(self.rs2))
+        cmp_res = c_backend._cmp_u256(m.get_reg(self.rs1), m.get_reg(self.rs2))
         if self.MNEM.get(self.fun) == "cmp":
             m.stat_record_flag_access("n", self.MNEM.get(self.fun))
             m.set_flag("Z", cmp_res == 0)
@@ -608,6 +608,8 @@ def check_bounds_i_type_imm(imm):
 class GIns(object):
     """Generic instruction"""
 
+    __slots__ = ("ctx", "hex_str", "malformed", "_trace_str")
+
     CYCLES = 1
 
     def __init__(self, ctx):
@@ -627,10 +629,20 @@ class GIns(object):
     def get_cycles(self):
         return self.CYCLES
 
+    def get_trace_str(self):
+        """Get the assembly string for the trace, formatted on first use only"""
+        try:
+            return self._trace_str
+        except AttributeError:
+            self._trace_str = self.get_asm_str()[1]
+            return self._trace_str
+
 
 class GInsBn(GIns):
     """Standard Bignum format BN.<ins> <wrd>, <wrs1>, <wrs2>, FG<flag_group>"""
 
+    __slots__ = ("flag_group", "rd", "rs1", "rs2")
+
     def __init__(self, rd, rs1, rs2, flag_group, ctx):
         self.rd = rd
         self.rs1 = rs1
@@ -673,6 +685,8 @@ class GInsBnShift(GInsBn):
     """Standard Bignum format with immediate shift
     BN.<ins> <wrd>, <wrs1>, <wrs2>, FG<flag_group> [, <shift_type> <shift_bytes>B]"""
 
+    __slots__ = ("shift_bytes", "shift_type")
+
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
         self.shift_type = shift_type
         self.shift_bytes = shift_bytes
@@ -711,9 +725,9 @@ class GInsBnShift(GInsBn):
     def exec_shift(self, m):
         shift_bits = self.shift_bytes * 8
         if self.shift_type == "right":
-            rs2op = c_backend.shr_u256(m.get_reg(self.rs2), shift_bits)
+            rs2op = c_backend._shr_u256(m.get_reg(self.rs2), shift_bits)
         else:
-            rs2op = c_backend.shl_u256(m.get_reg(self.rs2), shift_bits)
+            rs2op = c_backend._shl_u256(m.get_reg(self.rs2), shift_bits)
         return rs2op
 
 
@@ -721,6 +735,8 @@ class GInsBnCmpShift(GInsBn):
     """Bignum compare format with immediate shift
     BN.<ins> <wrs1>, <wrs2>, FG<flag_group> [, <shift_type> <shift_bytes>B]"""
 
+    __slots__ = ("shift_bytes", "shift_type")
+
     def __init__(self, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
         self.shift_type = shift_type
         self.shift_bytes = shift_bytes
@@ -749,9 +765,9 @@ class GInsBnCmpShift(GInsBn):
     def exec_shift(self, m):
         shift_bits = self.shift_bytes * 8
         if self.shift_type == "right":
-            rs2op = c_backend.shr_u256(m.get_reg(self.rs2), shift_bits)
+            rs2op = c_backend._shr_u256(m.get_reg(self.rs2), shift_bits)
         else:
-            rs2op = c_backend.shl_u256(m.get_reg(self.rs2), shift_bits)
+            rs2op = c_backend._shl_u256(m.get_reg(self.rs2), shift_bits)
         return rs2op
 
 
@@ -759,6 +775,8 @@ class GInsBnImm(GInsBn):
     """Standard Bignum format with one source register and immediate
     BN.<ins> <wrd>, <wrs>, <imm>, [ FG<flag_group>]"""
 
+    __slots__ = ("imm",)
+
     def __init__(self, rd, rs, imm, flag_group, ctx):
         self.imm = imm
         super().__init__(rd, rs, None, flag_group, ctx)
@@ -787,6 +805,8 @@ class GInsBnMod(GInsBn):
     """Standard Bignum format for pseudo modulo operations
     BN.<ins> <wrd>, <wrs1>, <wrs2>"""
 
+    __slots__ = ()
+
     def __init__(self, rd, rs1, rs2, ctx):
         super().__init__(rd, rs1, rs2, None, ctx)
 
@@ -815,6 +835,8 @@ class GInsBnMod(GInsBn):
 class GInsIndReg(GIns):
     """Standard Bignum format for indirect move: BN.<ins> x<GPR>[++], x<GPR>[++]"""
 
+    __slots__ = ("inc_xd", "inc_xs", "xd", "xs")
+
     def __init__(self, xd, inc_xd, xs, inc_xs, ctx):
         self.xd = xd
         self.inc_xd = inc_xd
@@ -842,6 +864,8 @@ class GInsIndReg(GIns):
 class GInsIndLs(GIns):
     """Standard Bignum format for indirect load, store : BN.<ins> <gpr>[<inc>], <offset>(<gpr>[<gpr_inc>])"""
 
+    __slots__ = ("inc_x1", "inc_x2", "offset", "x1", "x2")
+
     def __init__(self, x1, inc_x1, x2, inc_x2, offset, ctx):
         self.x1 = x1
         self.inc_x1 = inc_x1
@@ -871,6 +895,8 @@ class GInsIndLs(GIns):
 class GInsWsr(GIns):
     """WSR type"""
 
+    __slots__ = ("wrd", "wrs", "wsr")
+
     def __init__(self, wrd, wsr, wrs, ctx):
         self.wrd = wrd
         self.wsr = wsr
@@ -906,6 +932,8 @@ class GInsWsr(GIns):
 class IBnAdd(GInsBnShift):
     """Add instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.ADD"
 
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -921,17 +949,19 @@ class IBnAdd(GInsBnShift):
     def execute(self, m):
         global debug_cnt
         rs2op = self.exec_shift(m)
-        res, carry_out = c_backend.add_u256(m.get_reg(self.rs1), rs2op)
+        res, carry_out = c_backend._add_u256(m.get_reg(self.rs1), rs2op)
         res_full = res + (carry_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnSub(GInsBnShift):
     """Sub instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.SUB"
 
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -946,17 +976,19 @@ class IBnSub(GInsBnShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res, borrow_out = c_backend.sub_u256(m.get_reg(self.rs1), rs2op)
+        res, borrow_out = c_backend._sub_u256(m.get_reg(self.rs1), rs2op)
         res_full = res + (borrow_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnCmp(GInsBnCmpShift):
     """Cmp instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.CMP"
 
     def __init__(self, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -971,16 +1003,18 @@ class IBnCmp(GInsBnCmpShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res, borrow_out = c_backend.sub_u256(m.get_reg(self.rs1), rs2op)
+        res, borrow_out = c_backend._sub_u256(m.get_reg(self.rs1), rs2op)
         res_full = res + (borrow_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnAddc(GInsBnShift):
     """Add with carry instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.ADDC"
 
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -995,19 +1029,21 @@ class IBnAddc(GInsBnShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res, carry_out = c_backend.add_u256(
-            m.get_reg(self.rs1), rs2op, bool(self.exec_get_carry(m))
+        res, carry_out = c_backend._add_u256(
+            m.get_reg(self.rs1), rs2op, self.exec_get_carry(m)
         )
         res_full = res + (carry_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnSubb(GInsBnShift):
     """Sub with borrow instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.SUBB"
 
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -1022,19 +1058,21 @@ class IBnSubb(GInsBnShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res, borrow_out = c_backend.sub_u256(
-            m.get_reg(self.rs1), rs2op, bool(self.exec_get_carry(m))
+        res, borrow_out = c_backend._sub_u256(
+            m.get_reg(self.rs1), rs2op, self.exec_get_carry(m)
         )
         res_full = res + (borrow_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnCmpb(GInsBnCmpShift):
     """Cmp with borrow instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.CMPB"
 
     def __init__(self, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -1049,18 +1087,20 @@ class IBnCmpb(GInsBnCmpShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res, borrow_out = c_backend.sub_u256(
-            m.get_reg(self.rs1), rs2op, bool(self.exec_get_carry(m))
+        res, borrow_out = c_backend._sub_u256(
+            m.get_reg(self.rs1), rs2op, self.exec_get_carry(m)
         )
         res_full = res + (borrow_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnAddi(GInsBnImm):
     """Add with immediate"""
 
+    __slots__ = ()
+
     MNEM = "BN.ADDI"
 
     def __init__(self, rd, rs, imm, flag_group, ctx):
@@ -1074,17 +1114,19 @@ class IBnAddi(GInsBnImm):
         return super().enc(addr, mnem, params, ctx)
 
     def execute(self, m):
-        res, carry_out = c_backend.add_u256(m.get_reg(self.rs1), self.imm)
+        res, carry_out = c_backend._add_u256(m.get_reg(self.rs1), self.imm)
         res_full = res + (carry_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnSubi(GInsBnImm):
     """Sub with immediate"""
 
+    __slots__ = ()
+
     MNEM = "BN.SUBI"
 
     def __init__(self, rd, rs, imm, flag_group, ctx):
@@ -1098,17 +1140,19 @@ class IBnSubi(GInsBnImm):
         return super().enc(addr, mnem, params, ctx)
 
     def execute(self, m):
-        res, borrow_out = c_backend.sub_u256(m.get_reg(self.rs1), self.imm)
+        res, borrow_out = c_backend._sub_u256(m.get_reg(self.rs1), self.imm)
         res_full = res + (borrow_out << m.XLEN)
         self.exec_set_all_flags(res_full, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnAddm(GInsBnMod):
     """Pseudo modular add"""
 
+    __slots__ = ()
+
     MNEM = "BN.ADDM"
 
     def __init__(self, rd, rs1, rs2, ctx):
@@ -1123,17 +1167,19 @@ class IBnAddm(GInsBnMod):
 
     def execute(self, m):
         mod_val = m.get_reg("mod")
-        res, carry_out = c_backend.add_u256(m.get_reg(self.rs1), m.get_reg(self.rs2))
-        if carry_out or c_backend.cmp_u256(res, mod_val) >= 0:
-            res, _ = c_backend.sub_u256(res, mod_val)
+        res, carry_out = c_backend._add_u256(m.get_reg(self.rs1), m.get_reg(self.rs2))
+        if carry_out or c_backend._cmp_u256(res, mod_val) >= 0:
+            res, _ = c_backend._sub_u256(res, mod_val)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnSubm(GInsBnMod):
     """Pseudo modular sub"""
 
+    __slots__ = ()
+
     MNEM = "BN.SUBM"
 
     def __init__(self, rd, rs1, rs2, ctx):
@@ -1148,17 +1194,19 @@ class IBnSubm(GInsBnMod):
 
     def execute(self, m):
         mod_val = m.get_reg("mod")
-        res, borrow_out = c_backend.sub_u256(m.get_reg(self.rs1), m.get_reg(self.rs2))
+        res, borrow_out = c_backend._sub_u256(m.get_reg(self.rs1), m.get_reg(self.rs2))
         if borrow_out:
-            res, _ = c_backend.add_u256(res, mod_val)
+            res, _ = c_backend._add_u256(res, mod_val)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class GInsBnMulqacc(GInsBn):
     """Quarter-word Multiply and Accumulate base instruction"""
 
+    __slots__ = ("imm", "wrd_hw_sel", "wrs1_qw_sel", "wrs2_qw_sel")
+
     def __init__(
         self, wrd, wrd_hw_sel, wrs1, wrs1_qw_sel, wrs2, wrs2_qw_sel, acc_shift_imm, ctx
     ):
@@ -1186,6 +1234,8 @@ class IBnMulqacc(GInsBnMulqacc):
     """Quarter-word Multiply and Accumulate
     BN.MULQACC <wrs1>.<wrs1_qwsel>, <wrs2>.<wrs2_qwsel>, <acc_shift_imm>"""
 
+    __slots__ = ()
+
     MNEM = "BN.MULQACC"
 
     def execute(self, m):
@@ -1193,7 +1243,7 @@ class IBnMulqacc(GInsBnMulqacc):
         op2 = m.get_reg_qw(self.rs2, self.wrs2_qw_sel)
         res = (op1 * op2) << self.imm
         m.set_acc(m.get_acc() + res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
     @classmethod
@@ -1210,6 +1260,8 @@ class IBnMulqaccZ(GInsBnMulqacc):
     """Quarter-word Multiply and Accumulate
     BN.MULQACC <wrs1>.<wrs1_qwsel>, <wrs2>.<wrs2_qwsel>, <acc_shift_imm>"""
 
+    __slots__ = ()
+
     MNEM = "BN.MULQACC.Z"
 
     def execute(self, m):
@@ -1218,7 +1270,7 @@ class IBnMulqaccZ(GInsBnMulqacc):
         op2 = m.get_reg_qw(self.rs2, self.wrs2_qw_sel)
         res = (op1 * op2) << (self.imm * 64)
         m.set_acc(m.get_acc() + res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
     @classmethod
@@ -1235,6 +1287,8 @@ class IBnMulqaccSo(GInsBnMulqacc):
     """Quarter-word Multiply and Accumulate
     BN.MULQACC <wrs1>.<wrs1_qwsel>, <wrs2>.<wrs2_qwsel>, <acc_shift_imm>"""
 
+    __slots__ = ()
+
     MNEM = "BN.MULQACC.SO"
 
     def execute(self, m):
@@ -1252,7 +1306,7 @@ class IBnMulqaccSo(GInsBnMulqacc):
             self.exec_set_c_m_flags(shift_out << 128, m)
         else:
             raise SyntaxError("Illegal half word indicator")
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
     @classmethod
@@ -1276,6 +1330,8 @@ class IBnMulh(GInsBn):
     """Half Word Multiply
     BN.MULH <rd>, <rs1>[L|U], <rs2>[L|U]"""
 
+    __slots__ = ("rs1_hw_sel", "rs2_hw_sel")
+
     MNEM = "BN.MULH"
 
     def __init__(self, rd, rs1, rs1_hw_sel, rs2, rs2_hw_sel, ctx):
@@ -1306,15 +1362,15 @@ class IBnMulh(GInsBn):
     def execute(self, m):
         op1_shift = (m.XLEN // 2) if self.rs1_hw_sel == "upper" else 0
         op2_shift = (m.XLEN // 2) if self.rs2_hw_sel == "upper" else 0
-        op1 = c_backend.and_u256(
-            c_backend.shr_u256(m.get_reg(self.rs1), op1_shift), m.half_xlen_mask
+        op1 = c_backend._and_u256(
+            c_backend._shr_u256(m.get_reg(self.rs1), op1_shift), m.half_xlen_mask
         )
-        op2 = c_backend.and_u256(
-            c_backend.shr_u256(m.get_reg(self.rs2), op2_shift), m.half_xlen_mask
+        op2 = c_backend._and_u256(
+            c_backend._shr_u256(m.get_reg(self.rs2), op2_shift), m.half_xlen_mask
         )
         res = op1 * op2
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
@@ -1326,6 +1382,8 @@ class IBnMulh(GInsBn):
 class IBnAnd(GInsBnShift):
     """And instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.AND"
 
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -1340,16 +1398,18 @@ class IBnAnd(GInsBnShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res = c_backend.and_u256(m.get_reg(self.rs1), rs2op)
+        res = c_backend._and_u256(m.get_reg(self.rs1), rs2op)
         self.exec_set_zml_flags(res, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnOr(GInsBnShift):
     """Or instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.OR"
 
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -1364,16 +1424,18 @@ class IBnOr(GInsBnShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res = c_backend.or_u256(m.get_reg(self.rs1), rs2op)
+        res = c_backend._or_u256(m.get_reg(self.rs1), rs2op)
         self.exec_set_zml_flags(res, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnXor(GInsBnShift):
     """Or instruction with one shifted input"""
 
+    __slots__ = ()
+
     MNEM = "BN.XOR"
 
     def __init__(self, rd, rs1, rs2, flag_group, shift_type, shift_bytes, ctx):
@@ -1388,16 +1450,18 @@ class IBnXor(GInsBnShift):
 
     def execute(self, m):
         rs2op = self.exec_shift(m)
-        res = c_backend.xor_u256(m.get_reg(self.rs1), rs2op)
+        res = c_backend._xor_u256(m.get_reg(self.rs1), rs2op)
         self.exec_set_zml_flags(res, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnNot(GIns):
     """Not instruction with one shifted input"""
 
+    __slots__ = ("flag_group", "rd", "rs", "shift_bytes", "shift_type")
+
     MNEM = "BN.NOT"
 
     def __init__(self, rd, rs, shift_type, shift_bytes, ctx):
@@ -1433,19 +1497,21 @@ class IBnNot(GIns):
     def execute(self, m):
         shift_bits = self.shift_bytes * 8
         if self.shift_type == "right":
-            rs2op = c_backend.shr_u256(m.get_reg(self.rs), shift_bits)
+            rs2op = c_backend._shr_u256(m.get_reg(self.rs), shift_bits)
         else:
-            rs2op = c_backend.shl_u256(m.get_reg(self.rs), shift_bits)
-        res = c_backend.not_u256(rs2op)
+            rs2op = c_backend._shl_u256(m.get_reg(self.rs), shift_bits)
+        res = c_backend._not_u256(rs2op)
         self.exec_set_zml_flags(res, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnRshi(GInsBn):
     """Concatenate and Right shift"""
 
+    __slots__ = ("shift_bits",)
+
     MNEM = "BN.RSHI"
 
     def __init__(self, rd, rs1, rs2, shift_bits, ctx):
@@ -1478,20 +1544,22 @@ class IBnRshi(GInsBn):
 
     def execute(self, m):
         if self.shift_bits < m.XLEN:
-            upper = c_backend.shl_u256(m.get_reg(self.rs2), m.XLEN - self.shift_bits)
-            lower = c_backend.shr_u256(m.get_reg(self.rs1), self.shift_bits)
-            res = c_backend.or_u256(upper, lower)
+            upper = c_backend._shl_u256(m.get_reg(self.rs2), m.XLEN - self.shift_bits)
+            lower = c_backend._shr_u256(m.get_reg(self.rs1), self.shift_bits)
+            res = c_backend._or_u256(upper, lower)
         else:
-            res = c_backend.shr_u256(m.get_reg(self.rs2), self.shift_bits - m.XLEN)
+            res = c_backend._shr_u256(m.get_reg(self.rs2), self.shift_bits - m.XLEN)
         # self.exec_set_zml_flags(res, m)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnSel(GInsBn):
     """Select by flag"""
 
+    __slots__ = ("flag",)
+
     MNEM = "BN.SEL"
 
     def __init__(self, rd, rs1, rs2, flag_group, flag, ctx):
@@ -1526,7 +1594,7 @@ class IBnSel(GInsBn):
         flag_val = m.get_flag(flag_id)
         res = m.get_reg(self.rs1) if flag_val else m.get_reg(self.rs2)
         m.set_reg(self.rd, res)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
@@ -1538,6 +1606,8 @@ class IBnSel(GInsBn):
 class IBnMov(GIns):
     """Direct move instruction"""
 
+    __slots__ = ("rd", "rs")
+
     MNEM = "BN.MOV"
 
     def __init__(self, rd, rs, ctx):
@@ -1556,13 +1626,15 @@ class IBnMov(GIns):
 
     def execute(self, m):
         m.set_reg(self.rd, m.get_reg(self.rs))
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnMovr(GInsIndReg):
     """Indirect move instruction"""
 
+    __slots__ = ()
+
     MNEM = "BN.MOVR"
 
     def __init__(self, xd, inc_xd, xs, inc_xs, ctx):
@@ -1576,13 +1648,15 @@ class IBnMovr(GInsIndReg):
             m.inc_gpr(self.xd)
         if self.inc_xs:
             m.inc_gpr(self.xs)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnLid(GInsIndLs):
     """Indirect load instruction"""
 
+    __slots__ = ()
+
     MNEM = "BN.LID"
 
     def __init__(self, x1, inc_x1, x2, inc_x2, offset, ctx):
@@ -1601,13 +1675,15 @@ class IBnLid(GInsIndLs):
                 m.inc_gpr_wlen_bytes(self.x2)
             else:
                 m.inc_gpr(self.x2)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnSid(GInsIndLs):
     """Indirect store instruction"""
 
+    __slots__ = ()
+
     MNEM = "BN.SID"
 
     def __init__(self, x1, inc_x1, x2, inc_x2, offset, ctx):
@@ -1626,27 +1702,31 @@ class IBnSid(GInsIndLs):
                 m.inc_gpr_wlen_bytes(self.x2)
             else:
                 m.inc_gpr(self.x2)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnWsrrs(GInsWsr):
     """Atomic Read and Set Bits in WSR"""
 
+    __slots__ = ()
+
     MNEM = "BN.WSRRS"
 
     def execute(self, m):
         wsr_val = m.get_wsr(self.wsr)
         m.set_reg(self.wrd, wsr_val)
-        wsr_new = c_backend.or_u256(wsr_val, m.get_reg(self.wrs))
+        wsr_new = c_backend._or_u256(wsr_val, m.get_reg(self.wrs))
         m.set_wsr(self.wsr, wsr_new)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IBnWsrrw(GInsWsr):
     """Atomic Read/Write WSR"""
 
+    __slots__ = ()
+
     MNEM = "BN.WSRRW"
 
     def execute(self, m):
@@ -1654,7 +1734,7 @@ class IBnWsrrw(GInsWsr):
         m.set_reg(self.wrd, wsr_val)
         wsr_new = m.get_reg(self.wrs)
         m.set_wsr(self.wsr, wsr_new)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
@@ -1666,6 +1746,8 @@ class IBnWsrrw(GInsWsr):
 class IOtLoopi(GIns):
     """Immediate Loop"""
 
+    __slots__ = ("iter", "len")
+
     MNEM = "LOOPI"
 
     def __init__(self, iter, len, ctx):
@@ -1684,13 +1766,15 @@ class IOtLoopi(GIns):
 
     def execute(self, m):
         m.push_loop_stack(self.iter - 1, self.len + m.get_pc(), m.get_pc() + 1)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtLoop(GIns):
     """Indirect Loop"""
 
+    __slots__ = ("len", "xiter")
+
     MNEM = "LOOP"
 
     def __init__(self, xiter, len, ctx):
@@ -1725,7 +1809,7 @@ class IOtLoop(GIns):
     def execute(self, m):
         iter = m.get_gpr(self.xiter)
         m.push_loop_stack(iter - 1, self.len + m.get_pc(), m.get_pc() + 1)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
@@ -1737,6 +1821,8 @@ class IOtLoop(GIns):
 class IOtGpr(GIns):
     """RV based instructions format with one dest and two src GPRs"""
 
+    __slots__ = ("xd", "xs1", "xs2")
+
     def __init__(self, xd, xs1, xs2, ctx):
         self.xd = xd
         self.xs1 = xs1
@@ -1766,13 +1852,15 @@ class IOtGpr(GIns):
     def execute(self, m):
         res = m.get_gpr(self.xs1) + m.get_gpr(self.xs2)
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtImm(GIns):
     """RV based instructions format with one dest and one src GPR + immediate"""
 
+    __slots__ = ("imm", "xd", "xs")
+
     def __init__(self, xd, xs, imm, ctx):
         self.xd = xd
         self.xs = xs
@@ -1803,6 +1891,8 @@ class IOtImm(GIns):
 class IOtBranch(GIns):
     """Branch type"""
 
+    __slots__ = ("addr", "grs1", "grs2", "label", "offset")
+
     def __init__(self, grs1, grs2, offset, addr, ctx, label=None):
         self.grs1 = grs1
         self.grs2 = grs2
@@ -1836,6 +1926,8 @@ class IOtBranch(GIns):
 class IOtCsr(GIns):
     """CSR type"""
 
+    __slots__ = ("csr", "grd", "grs")
+
     def __init__(self, grd, csr, grs, ctx):
         self.grd = grd
         self.csr = csr
@@ -1866,18 +1958,22 @@ class IOtCsr(GIns):
 class IOtAdd(IOtGpr):
     """Base add"""
 
+    __slots__ = ()
+
     MNEM = "ADD"
 
     def execute(self, m):
         res = m.get_gpr(self.xs1) + m.get_gpr(self.xs2)
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtAddi(GIns):
     """Base add immediate"""
 
+    __slots__ = ("imm", "xd", "xs")
+
     MNEM = "ADDI"
 
     def __init__(self, xd, xs, imm, ctx):
@@ -1901,7 +1997,7 @@ class IOtAddi(GIns):
     def execute(self, m):
         res = m.get_gpr(self.xs) + self.imm
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
     @classmethod
@@ -1916,102 +2012,120 @@ class IOtAddi(GIns):
 class IOtSub(IOtGpr):
     """Base subtract"""
 
+    __slots__ = ()
+
     MNEM = "SUB"
 
     def execute(self, m):
         res = m.get_gpr(self.xs1) - m.get_gpr(self.xs2)
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtAnd(IOtGpr):
     """Base bitwise AND"""
 
+    __slots__ = ()
+
     MNEM = "AND"
 
     def execute(self, m):
         res = m.get_gpr(self.xs1) & m.get_gpr(self.xs2)
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtAndi(IOtImm):
     """Base bitwise AND with immediate"""
 
+    __slots__ = ()
+
     MNEM = "ANDI"
 
     def execute(self, m):
         res = m.get_gpr(self.xs) & self.imm
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtOr(IOtGpr):
     """Base bitwise OR"""
 
+    __slots__ = ()
+
     MNEM = "OR"
 
     def execute(self, m):
         res = m.get_gpr(self.xs1) | m.get_gpr(self.xs2)
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtOri(IOtImm):
     """Base bitwise OR with immediate"""
 
+    __slots__ = ()
+
     MNEM = "ORI"
 
     def execute(self, m):
         res = m.get_gpr(self.xs) | self.imm
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtXor(IOtGpr):
     """Base bitwise XOR"""
 
+    __slots__ = ()
+
     MNEM = "XOR"
 
     def execute(self, m):
         res = m.get_gpr(self.xs1) ^ m.get_gpr(self.xs2)
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtXori(IOtImm):
     """Base bitwise XOR with immediate"""
 
+    __slots__ = ()
+
     MNEM = "XORI"
 
     def execute(self, m):
         res = m.get_gpr(self.xs) ^ self.imm
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtSlli(IOtImm):
     """Left shift immediate"""
 
+    __slots__ = ()
+
     MNEM = "SLLI"
 
     def execute(self, m):
         res = m.get_gpr(self.xs) << self.imm
         m.set_gpr(self.xd, res & m.gpr_mask)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtJal(GIns):
     """Jump and link"""
 
+    __slots__ = ("addr", "imm", "label", "xd")
+
     MNEM = "JAL"
 
     def __init__(self, xd, imm, addr, ctx, label=None):
@@ -2038,13 +2152,15 @@ class IOtJal(GIns):
     def execute(self, m):
         m.set_gpr(self.xd, m.get_pc() + 1)
         jump_target = m.get_pc() + self.imm
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, jump_target
 
 
 class IOtJalr(IOtImm):
     """Jump and link register"""
 
+    __slots__ = ()
+
     MNEM = "JALR"
 
     def execute(self, m):
@@ -2059,13 +2175,15 @@ class IOtJalr(IOtImm):
                 m.finish()
                 jump_target = m.get_pc()
 
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, jump_target
 
 
 class IOtEcall(GIns):
     """ECALL instruction"""
 
+    __slots__ = ("addr",)
+
     MNEM = "ECALL"
 
     def __init__(self, addr, ctx, label=None):
@@ -2082,26 +2200,30 @@ class IOtEcall(GIns):
 
     def execute(self, m):
         m.finish(breakpoint=False)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtBne(IOtBranch):
     """Branch not equal"""
 
+    __slots__ = ()
+
     MNEM = "BNE"
 
     def execute(self, m):
         branch_target = None
         if m.get_gpr(self.grs1) != m.get_gpr(self.grs2):
             branch_target = m.get_pc() + self.offset
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, branch_target
 
 
 class IOtBeq(IOtBranch):
     """Branch equal"""
 
+    __slots__ = ()
+
     MNEM = "BEQ"
 
     def execute(self, m):
@@ -2109,13 +2231,15 @@ class IOtBeq(IOtBranch):
         branch = m.get_gpr(self.grs1) == m.get_gpr(self.grs2)
         if branch:
             branch_target = m.get_pc() + self.offset
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, branch_target
 
 
 class IOtCsrrs(IOtCsr):
     """Atomic Read and Set Bits in CSR"""
 
+    __slots__ = ()
+
     MNEM = "CSRRS"
 
     def execute(self, m):
@@ -2123,13 +2247,15 @@ class IOtCsrrs(IOtCsr):
         m.set_gpr(self.grd, csr_val)
         csr_new = csr_val | m.get_gpr(self.grs)
         m.set_csr(self.csr, csr_new)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtCsrrw(IOtCsr):
     """Atomic Read/Write CSR"""
 
+    __slots__ = ()
+
     MNEM = "CSRRW"
 
     def execute(self, m):
@@ -2137,13 +2263,15 @@ class IOtCsrrw(IOtCsr):
         m.set_gpr(self.grd, csr_val)
         csr_new = m.get_gpr(self.grs)
         m.set_csr(self.csr, csr_new)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtLui(GIns):
     """Load upper immediate"""
 
+    __slots__ = ("grd", "imm")
+
     MNEM = "LUI"
 
     def __init__(self, grd, imm, ctx):
@@ -2163,13 +2291,15 @@ class IOtLui(GIns):
     def execute(self, m):
         new_val = self.imm << 12
         m.set_gpr(self.grd, new_val)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtLw(GIns):
     """Load word"""
 
+    __slots__ = ("grd", "grs", "offset")
+
     MNEM = "LW"
 
     def __init__(self, grd, offset, grs, ctx):
@@ -2198,13 +2328,15 @@ class IOtLw(GIns):
 
     def execute(self, m):
         m.set_gpr(self.grd, m.get_dmem_otbn(m.get_gpr(self.grs) + self.offset))
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
 class IOtSw(GIns):
     """Load word"""
 
+    __slots__ = ("grd", "grs", "offset")
+
     MNEM = "SW"
 
     def __init__(self, grd, offset, grs, ctx):
@@ -2234,7 +2366,7 @@ class IOtSw(GIns):
     def execute(self, m):
         addr = m.get_gpr(self.grd) + self.offset
         m.set_dmem_otbn(addr, m.get_gpr(self.grs))
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
@@ -2247,6 +2379,8 @@ class IOtPseudoLi(GIns):
     """Load immediate pseudo instruction
     replacement for addi grd, x0, <imm>"""
 
+    __slots__ = ("grd", "imm")
+
     MNEM = "LI"
 
     def __init__(self, grd, imm, ctx):
@@ -2265,7 +2399,7 @@ class IOtPseudoLi(GIns):
 
     def execute(self, m):
         m.set_gpr(self.grd, self.imm)
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
@@ -2273,6 +2407,8 @@ class IOtPseudoRet(GIns):
     """Ret pseudo instruction
     replacement for jalr x0, x1, 0"""
 
+    __slots__ = ("addr",)
+
     MNEM = "RET"
 
     def __init__(self, addr, ctx, label=None):
@@ -2298,13 +2434,15 @@ class IOtPseudoRet(GIns):
                 m.finish()
                 jump_target = m.get_pc()
 
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, jump_target
 
 
 class IOtPseudoNop(GIns):
     """NOP pseudo instruction, replacement for addi x0, x0, 0"""
 
+    __slots__ = ("addr",)
+
     MNEM = "NOP"
 
     def __init__(self, addr, ctx, label=None):
@@ -2320,7 +2458,7 @@ class IOtPseudoNop(GIns):
         return cls(addr, ctx.ins_ctx)
 
     def execute(self, m):
-        trace_str = self.get_asm_str()[1]
+        trace_str = self.get_trace_str()
         return trace_str, None
 
 
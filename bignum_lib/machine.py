@@ -5,9 +5,12 @@
 import math
 import os
 from collections import Counter
+from enum import IntEnum
+
+from . import c_backend
 
 # C extension ABI version expected by this Python wrapper.
-_C_MACHINE_ABI_VERSION = 1
+_C_MACHINE_ABI_VERSION = 2
 
 
 def _env_truthy(name):
@@ -56,9 +59,82 @@ else:
         pass
 
 
+class Flag(IntEnum):
+    """Flag identifiers, numbered by their bit in get_flags_as_bin()"""
+
+    C = 0
+    L = 1
+    M = 2
+    Z = 3
+    XC = 4
+    XL = 5
+    XM = 6
+    XZ = 7
+
+
+# get_flag/set_flag accept either a Flag or its name. bool hashes like 0/1
+# but is never a flag, see _flag_attr.
+_FLAG_ATTRS = {flag: flag.name for flag in Flag}
+_FLAG_ATTRS.update({flag.name: flag.name for flag in Flag})
+
+
+def _flag_attr(flag):
+    attr = None if isinstance(flag, bool) else _FLAG_ATTRS.get(flag)
+    if attr is None:
+        raise Exception("Invalid flag identifier")
+    return attr
+
+
 class _PyMachine(object):
     """Pure-Python Machine implementation (original code, used as fallback)."""
 
+    __slots__ = (
+        "C",
+        "L",
+        "M",
+        "XC",
+        "XL",
+        "XM",
+        "XZ",
+        "Z",
+        "acc",
+        "breakpoints",
+        "call_stack",
+        "ctx",
+        "dmem",
+        "dmem_idx_mask",
+        "dmem_idx_width",
+        "dmp",
+        "finishFlag",
+        "force_break",
+        "gpr",
+        "gpr_mask",
+        "half_limb_mask",
+        "half_limb_width",
+        "half_xlen_mask",
+        "hw_mask",
+        "hw_width",
+        "imem",
+        "init_dmem",
+        "lc",
+        "limb_mask",
+        "limb_width",
+        "loop_stack",
+        "mod",
+        "pc",
+        "qw_mask",
+        "qw_width",
+        "r",
+        "r_valid_half_limbs",
+        "reg_idx_mask",
+        "reg_idx_width",
+        "rfp",
+        "rnd",
+        "stats",
+        "stop_addr",
+        "xlen_mask",
+    )
+
     NUM_REGS = 32
     NUM_GPRS = 32
     I_TYPE_IMM_WIDTH = 12
@@ -76,15 +152,6 @@ class _PyMachine(object):
     WSR_MOD = 0x0
     WSR_RND = 1
 
-    # breakpoints is dictionary with break addresses being keys and
-    # values are tuples of number of passes required and the pass counter
-    breakpoints = {}
-
-    # force break in later instruction, e.g. when single stepping
-    # Can consider the loop or callstack to allow finishing calls, loops, or step over
-    # Format (Forcebreak active, consider call stack, call stack, consider loop stack, loop stack)
-    force_break = (False, False, 0, False, 0)
-
     def get_func_addr_for_pc(self, pc):
         """Get the function base address for an arbitrary program counter address"""
         func_addr_found = False
@@ -175,6 +242,13 @@ class _PyMachine(object):
         self.dmem_idx_mask = 2**self.dmem_idx_width - 1
         self.gpr_mask = 2**self.GPR_WIDTH - 1
         self.ctx = ctx
+        # breakpoints is dictionary with break addresses being keys and
+        # values are tuples of number of passes required and the pass counter
+        self.breakpoints = {}
+        # force break in later instruction, e.g. when single stepping
+        # Can consider the loop or callstack to allow finishing calls, loops, or step over
+        # Format (Forcebreak active, consider call stack, call stack, consider loop stack, loop stack)
+        self.force_break = (False, False, 0, False, 0)
         self.reset(dmem, imem, s_addr, stop_addr, clear_regs=True)
 
         if breakpoints:
@@ -197,19 +271,12 @@ class _PyMachine(object):
         self.r_valid_half_limbs = [
             [False] * self.LIMBS * 2 for i in range(self.NUM_REGS)
         ]
-        self.dmem = []
-        self.imem = []
-        self.init_dmem = []
         self.loop_stack = []
         self.call_stack = []
-        self.dmem.clear()
-        self.init_dmem.clear()
-        for item in dmem:
-            self.dmem.append(item)
-            self.init_dmem.append(True)
-        for i in range(len(dmem), self.DMEM_DEPTH):
-            self.dmem.append(0)
-            self.init_dmem.append(False)
+        # Build dmem and its init map in bulk rather than word by word
+        unset = max(self.DMEM_DEPTH - len(dmem), 0)
+        self.dmem = list(dmem) + [0] * unset
+        self.init_dmem = [True] * len(dmem) + [False] * unset
         self.imem = imem
         self.pc = s_addr
         if not stop_addr:
@@ -225,12 +292,8 @@ class _PyMachine(object):
         self.pc = 0
         self.acc = 0
         self.mod = 0
-        self.r = []
-        for i in range(self.NUM_REGS):
-            self.r.append(0)
-        self.gpr = []
-        for i in range(self.NUM_GPRS):
-            self.gpr.append(0)
+        self.r = [0] * self.NUM_REGS
+        self.gpr = [0] * self.NUM_GPRS
 
     def __check_reg_idx(self, idx):
         """Check if register index is within bound"""
@@ -552,13 +615,26 @@ class _PyMachine(object):
             )
         return self.dmem[address]
 
+    def get_dmem_range(self, address, count):
+        """Get the values of count consecutive dmem addresses"""
+        if count < 0 or address < 0 or address + count > self.DMEM_DEPTH:
+            raise IndexError
+        for i in range(address, address + count):
+            if not self.init_dmem[i]:
+                print(
+                    "Warning: reading from uninitialized dmem memory address: "
+                    + hex(i)
+                )
+        return self.dmem[address : address + count]
+
     def get_dmem_otbn(self, address):
         """Get value for a dmem address in otbn format"""
         # print('pc: ' + str(self.get_pc()) + '; get byte: ' + str(address))
-        dmem_addr = address // 32
-        limb = (address % 32) // 4
+        dmem_addr = address >> 5
         self.__check_dmem_addr(dmem_addr)
-        return self.__get_limb_from_reg_val(limb, self.dmem[dmem_addr])
+        # Stored words are always in range, so slice the 32-bit limb straight
+        # out of the word: byte offset (address & 0x1C) is bit offset * 8.
+        return (self.dmem[dmem_addr] >> ((address & 0x1C) << 3)) & self.limb_mask
 
     def set_dmem(self, address, value):
         """Set value at a dmem address"""
@@ -636,107 +712,74 @@ class _PyMachine(object):
             raise CallStackUnderrun("Call stack underrun")
 
     def get_flag(self, flag):
-        """Get a flag"""
-        if flag == "M":
-            return self.M
-        elif flag == "L":
-            return self.L
-        elif flag == "Z":
-            return self.Z
-        elif flag == "C":
-            return self.C
-        elif flag == "XM":
-            return self.XM
-        elif flag == "XL":
-            return self.XL
-        elif flag == "XZ":
-            return self.XZ
-        elif flag == "XC":
-            return self.XC
-        else:
-            raise Exception("Invalid flag identifier")
+        """Get a flag, given as a Flag or its name"""
+        return getattr(self, _flag_attr(flag))
 
     def get_flags_as_bin(self):
-        ret = int(self.get_flag("C"))
-        ret += int(self.get_flag("L")) << 1
-        ret += int(self.get_flag("M")) << 2
-        ret += int(self.get_flag("Z")) << 3
-        ret += int(self.get_flag("XC")) << 4
-        ret += int(self.get_flag("XL")) << 5
-        ret += int(self.get_flag("XM")) << 6
-        ret += int(self.get_flag("XZ")) << 7
-        return ret
+        return (
+            int(self.C)
+            | int(self.L) << 1
+            | int(self.M) << 2
+            | int(self.Z) << 3
+            | int(self.XC) << 4
+            | int(self.XL) << 5
+            | int(self.XM) << 6
+            | int(self.XZ) << 7
+        )
 
     def set_flags_as_bin(self, flags):
-        self.set_flag("C", flags & 1)
-        self.set_flag("L", (flags >> 1) & 1)
-        self.set_flag("M", (flags >> 2) & 1)
-        self.set_flag("Z", (flags >> 3) & 1)
-        self.set_flag("XC", (flags >> 4) & 1)
-        self.set_flag("XL", (flags >> 5) & 1)
-        self.set_flag("XM", (flags >> 6) & 1)
-        self.set_flag("XZ", (flags >> 7) & 1)
+        self.C = flags & 1
+        self.L = (flags >> 1) & 1
+        self.M = (flags >> 2) & 1
+        self.Z = (flags >> 3) & 1
+        self.XC = (flags >> 4) & 1
+        self.XL = (flags >> 5) & 1
+        self.XM = (flags >> 6) & 1
+        self.XZ = (flags >> 7) & 1
 
     def set_flag(self, flag, val):
-        """Set/unset a flag"""
-        if flag == "M":
-            self.M = val
-        elif flag == "L":
-            self.L = val
-        elif flag == "Z":
-            self.Z = val
-        elif flag == "C":
-            self.C = val
-        elif flag == "XM":
-            self.XM = val
-        elif flag == "XL":
-            self.XL = val
-        elif flag == "XZ":
-            self.XZ = val
-        elif flag == "XC":
-            self.XC = val
-        else:
-            raise Exception("Invalid flag identifier")
+        """Set/unset a flag, given as a Flag or its name"""
+        setattr(self, _flag_attr(flag), val)
 
     def set_c_z_m_l(self, val):
         """Set/Unset C, Z, M and L flags by examining the given value"""
         self.set_z_m_l(val)
-        self.set_flag("C", self.__test_bit(val, self.XLEN))
+        self.C = self.__test_bit(val, self.XLEN)
 
     def setx_c_z_m_l(self, val):
         """Set/Unset XC, XZ, XM and XL flags by examining the given value"""
         self.setx_z_m_l(val)
-        self.set_flag("XC", self.__test_bit(val, self.XLEN))
+        self.XC = self.__test_bit(val, self.XLEN)
 
     def set_z_m_l(self, val):
         """Set/Unset Z, M and L flags by examining the given value"""
-        self.set_flag("Z", not bool(val & self.xlen_mask))
-        self.set_flag("M", self.__test_bit(val, self.XLEN - 1))
-        self.set_flag("L", self.__test_bit(val, 0))
+        self.Z = not val & self.xlen_mask
+        self.M = self.__test_bit(val, self.XLEN - 1)
+        self.L = bool(val & 1)
 
     def setx_z_m_l(self, val):
         """Set/Unset XZ, XM and XL flags by examining the given value"""
-        self.set_flag("XZ", not bool(val & self.xlen_mask))
-        self.set_flag("XM", self.__test_bit(val, self.XLEN - 1))
-        self.set_flag("XL", self.__test_bit(val, 0))
+        self.XZ = not val & self.xlen_mask
+        self.XM = self.__test_bit(val, self.XLEN - 1)
+        self.XL = bool(val & 1)
 
     def set_c_m(self, val):
         """Set/Unset C and M flags by examining the given value"""
-        self.set_flag("C", self.__test_bit(val, self.XLEN))
-        self.set_flag("M", self.__test_bit(val, self.XLEN - 1))
+        self.C = self.__test_bit(val, self.XLEN)
+        self.M = self.__test_bit(val, self.XLEN - 1)
 
     def setx_c_m(self, val):
         """Set/Unset C and M flags by examining the given value"""
-        self.set_flag("XC", self.__test_bit(val, self.XLEN))
-        self.set_flag("XM", self.__test_bit(val, self.XLEN - 1))
+        self.XC = self.__test_bit(val, self.XLEN)
+        self.XM = self.__test_bit(val, self.XLEN - 1)
 
     def set_l(self, val):
         """Set/Unset L flag by examining the given value"""
-        self.set_flag("L", self.__test_bit(val, 0))
+        self.L = bool(val & 1)
 
     def setx_l(self, val):
         """Set/Unset XL flag by examining the given value"""
-        self.set_flag("XL", self.__test_bit(val, 0))
+        self.XL = bool(val & 1)
 
     def get_instruction(self, address):
         """Get instruction binary at an imem address"""
@@ -1205,47 +1248,42 @@ class _PyMachine(object):
 
     def step(self):
         """Next step"""
-        halt = False
-        if self.get_pc() == self.stop_addr:
-            halt = True  # halt after this instruction
-
-        if self.finishFlag:
-            halt = True
-            # print('\nECALL hit or reached \'ret\' instruction with empty call stack. Finishing here.\n')
+        # halt after this instruction
+        halt = self.pc == self.stop_addr or self.finishFlag
 
         is_break, passes = self.__check_break()
         if is_break:
             self.__handle_break_command(passes)
 
-        instr = self.get_instruction(self.get_pc())
+        instr = self.get_instruction(self.pc)
         cycles = instr.get_cycles()
         self.stat_record_instr(instr)
         trace_str, jump_addr = instr.execute(self)
         # print(self.get_pc())
         # print(self.get_reg_table_debug(False))
-        if len(self.loop_stack) and (self.get_pc() == self.get_top_loop_end_addr()):
+        pc = self.pc
+        if self.loop_stack and pc == self.get_top_loop_end_addr():
             if self.dec_top_loop_cnt():
                 jump_addr = self.get_top_loop_start_addr()
             else:
                 # no loops left, pop the loop stack but continue without jump
                 self.pop_loop_stack()
 
+        imem_len = len(self.imem)
         if jump_addr is not None:
-            if jump_addr < 0 or jump_addr >= len(self.imem):
+            if jump_addr < 0 or jump_addr >= imem_len:
                 raise Exception("Invalid jump address")
-            self.set_pc(jump_addr)
+            self.pc = jump_addr
             cont = True
+        elif pc + 1 >= imem_len:
+            cont = False
         else:
-            if (self.get_pc() + 1) >= len(self.imem):
-                cont = False
-            else:
-                cont = True
-                self.inc_pc()
+            cont = True
+            self.pc = pc + 1
 
         if halt:
             return False, trace_str, cycles
-        else:
-            return cont, trace_str, cycles
+        return cont, trace_str, cycles
 
 
 if _USE_C_MACHINE:
@@ -1253,6 +1291,9 @@ if _USE_C_MACHINE:
     class Machine(_CMachineBase):
         """C-accelerated Machine with Python-level debug/display helpers."""
 
+        # All state lives in the C base type; no per-instance __dict__.
+        __slots__ = ()
+
         # Class-level constants (must be plain ints for code that accesses
         # them on the class without an instance, e.g. Machine.NUM_REGS).
         NUM_REGS = 32
@@ -1627,5 +1668,87 @@ else:
     Machine = _PyMachine
 
 
+# Replace well-known Montgomery routines of the OTBN modexp library by a
+# fused native computation. The routine is no longer simulated instruction
+# by instruction, so instruction/cycle counts and stats are not
+# representative when this is enabled. Only code that calls these routines
+# is affected: in the library that is the modexp routine, which
+# sim_rsa_tests.py runs for decryption when its USE_ASM_MODEXP is set.
+FAST_MONTMUL = _env_truthy("OT_DSIM_FAST_MONTMUL")
+
+
+class MontSqrFastPath(object):
+    """Stand-in for the entry instruction of the sqrx_exp routine.
+
+    Reads the SQR_PTRS pointer word (mod, dinv, rr, a, b, c, words), writes
+    the Montgomery product of a and b to c exactly as the routine leaves it
+    in DMEM and returns to the address on top of the call stack like the
+    routine's final jalr.
+    Registers clobbered by the routine are left as they are; the routine
+    does not hand anything but DMEM back to modexp.
+    """
+
+    LABEL = "sqrx_exp"
+    MNEM = "MONTMUL.FAST"
+    PTR_WORD = 1
+    CYCLES = 1
+
+    def __init__(self, orig, dmem_byte_addressing):
+        self.orig = orig
+        self.dmem_byte_addressing = dmem_byte_addressing
+
+    def get_cycles(self):
+        return self.CYCLES
+
+    def get_asm_str(self):
+        return self.orig.get_asm_str()[0], self.MNEM + " " + self.LABEL, False
+
+    def __get_val(self, m, addr, words):
+        val = 0
+        for i, limb in enumerate(m.get_dmem_range(addr, words)):
+            val |= limb << (m.XLEN * i)
+        return val
+
+    def execute(self, m):
+        ptrs = m.get_dmem(self.PTR_WORD)
+        p_mod, p_dinv, _, p_a, p_b, p_c, words = (
+            (ptrs >> (32 * i)) & 0xFFFFFFFF for i in range(7)
+        )
+        if self.dmem_byte_addressing:
+            p_mod, p_dinv, p_a, p_b, p_c = (
+                p // 32 for p in (p_mod, p_dinv, p_a, p_b, p_c)
+            )
+        res = c_backend.mont_mul(
+            self.__get_val(m, p_a, words),
+            self.__get_val(m, p_b, words),
+            self.__get_val(m, p_mod, words),
+            m.get_dmem(p_dinv),
+            words,
+        )
+        for i in range(words):
+            m.set_dmem(p_c + i, (res >> (m.XLEN * i)) & m.xlen_mask)
+        # The routine is only entered by jal x1 and leaves by jalr x0, x1, 0,
+        # so it returns to the address its caller pushed. Without one, e.g.
+        # when run as a primitive of its own, raise CallStackUnderrun rather
+        # than making up a return address.
+        return self.get_asm_str()[1], m.pop_call_stack()
+
+
+def install_mont_mul_fast_path(ins_objects, ctx):
+    """Return a copy of ins_objects with the Montgomery fast path installed.
+
+    The routine is located by its label in ctx, so this only applies to
+    programs built from the OTBN modexp library; anything else is returned
+    unchanged.
+    """
+    ins_objects = list(ins_objects)
+    for addr, label in ctx.labels.items():
+        if label == MontSqrFastPath.LABEL:
+            ins_objects[addr] = MontSqrFastPath(
+                ins_objects[addr], ctx.dmem_byte_addressing
+            )
+    return ins_objects
+
+
 if __name__ == "__main__":
     raise Exception("This file is not executable")
@@ -5,312 +5,1018 @@
 
 #define U256_BYTES 32
 #define U256_LIMBS 8
-
-static int parse_fixed_buffer(PyObject *obj,
-                              const char *name,
-                              Py_ssize_t expected_len,
-                              Py_buffer *view) {
-    if (PyObject_GetBuffer(obj, view, PyBUF_CONTIG_RO) != 0) {
+#define U256_WORDS 4
+#define U512_BYTES 64
+#define U512_WORDS 8
+
+/* Montgomery operands are up to 16 WDRs (4096 bits) wide. */
+#define MONT_MAX_WORDS 16
+#define MONT_MAX_LIMBS (MONT_MAX_WORDS * U256_LIMBS)
+
+/* GCC/Clang on x86_64 get hand-written carry chains; every other target
+ * (including MSVC) uses the portable C below. */
+#if defined(__GNUC__) && defined(__x86_64__)
+#define OT_DSIM_X86_64_ASM 1
+#include <cpuid.h>
+#else
+#define OT_DSIM_X86_64_ASM 0
+#endif
+
+#if defined(_MSC_VER) && defined(_M_X64)
+#include <intrin.h>
+#endif
+
+/* Bumped whenever the calling convention of the module functions changes.
+ * Version 1 took and returned 32-byte little-endian buffers; version 2
+ * takes and returns Python ints directly; version 3 adds the batched
+ * add/sub entry points, version 4 the batched limb write and version 5
+ * the batched compare. */
+#define OT_DSIM_COPS_ABI_VERSION 5
+
+/* ------------------------------------------------------------------ */
+/* Python int <-> fixed-width conversion                               */
+/* ------------------------------------------------------------------ */
+
+static int bytes_from_pylong(PyObject *obj,
+                             const char *name,
+                             uint8_t *out,
+                             Py_ssize_t nbytes) {
+    if (!PyLong_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "%s must be an int", name);
         return -1;
     }
-    if (view->len != expected_len) {
-        PyErr_Format(PyExc_ValueError,
-                     "%s must be exactly %zd bytes",
+#if PY_VERSION_HEX >= 0x030D0000
+    {
+        Py_ssize_t needed = PyLong_AsNativeBytes(
+            obj,
+            out,
+            nbytes,
+            Py_ASNATIVEBYTES_LITTLE_ENDIAN |
+                Py_ASNATIVEBYTES_UNSIGNED_BUFFER |
+                Py_ASNATIVEBYTES_REJECT_NEGATIVE);
+        if (needed < 0) {
+            if (!PyErr_ExceptionMatches(PyExc_ValueError)) {
+                return -1;
+            }
+            PyErr_Clear();
+        }
+        if (needed < 0 || needed > nbytes) {
+            PyErr_Format(PyExc_OverflowError,
+                         "%s must fit in %d bits",
+                         name,
+                         (int)(nbytes * 8));
+            return -1;
+        }
+    }
+#else
+    if (_PyLong_AsByteArray((PyLongObject *)obj, out, (size_t)nbytes, 1, 0) < 0) {
+        if (!PyErr_ExceptionMatches(PyExc_OverflowError)) {
+            return -1;
+        }
+        PyErr_Clear();
+        PyErr_Format(PyExc_OverflowError,
+                     "%s must fit in %d bits",
                      name,
-                     expected_len);
-        PyBuffer_Release(view);
+                     (int)(nbytes * 8));
         return -1;
     }
+#endif
     return 0;
 }
 
-static PyObject *bytes_from_u256(const uint8_t value[U256_BYTES]) {
-    return PyBytes_FromStringAndSize((const char *)value, U256_BYTES);
+static PyObject *pylong_from_bytes(const uint8_t *value, Py_ssize_t nbytes) {
+#if PY_VERSION_HEX >= 0x030D0000
+    return PyLong_FromUnsignedNativeBytes(value,
+                                          (size_t)nbytes,
+                                          Py_ASNATIVEBYTES_LITTLE_ENDIAN);
+#else
+    return _PyLong_FromByteArray(value, (size_t)nbytes, 1, 0);
+#endif
 }
 
-static PyObject *py_u256_add(PyObject *self, PyObject *args) {
-    PyObject *lhs_obj;
-    PyObject *rhs_obj;
-    int carry_in = 0;
-    Py_buffer lhs;
-    Py_buffer rhs;
-    uint8_t out[U256_BYTES];
-    const uint8_t *lhs_bytes;
-    const uint8_t *rhs_bytes;
-    unsigned int carry;
-    PyObject *out_bytes;
-    PyObject *ret;
-    Py_ssize_t idx;
+#if !PY_LITTLE_ENDIAN
+/* Byte order of the limb arrays is fixed (little-endian, word 0 least
+ * significant) independent of the host, so pack/unpack explicitly. */
+static void words_from_bytes(const uint8_t *in, uint64_t *out, int nwords) {
+    int i;
+    int j;
+
+    for (i = 0; i < nwords; ++i) {
+        uint64_t w = 0;
+        for (j = 7; j >= 0; --j) {
+            w = (w << 8) | (uint64_t)in[i * 8 + j];
+        }
+        out[i] = w;
+    }
+}
 
-    (void)self;
+static void bytes_from_words(const uint64_t *in, uint8_t *out, int nwords) {
+    int i;
+    int j;
+
+    for (i = 0; i < nwords; ++i) {
+        uint64_t w = in[i];
+        for (j = 0; j < 8; ++j) {
+            out[i * 8 + j] = (uint8_t)(w & 0xFFU);
+            w >>= 8;
+        }
+    }
+}
+#endif
+
+/* On little-endian hosts the word arrays already have the byte layout
+ * CPython produces and consumes, so convert in place instead of going
+ * through a staging buffer. */
+static int u256_from_pylong(PyObject *obj, const char *name, uint64_t out[U256_WORDS]) {
+#if PY_LITTLE_ENDIAN
+    return bytes_from_pylong(obj, name, (uint8_t *)out, U256_BYTES);
+#else
+    uint8_t raw[U256_BYTES];
+
+    if (bytes_from_pylong(obj, name, raw, U256_BYTES) != 0) {
+        return -1;
+    }
+    words_from_bytes(raw, out, U256_WORDS);
+    return 0;
+#endif
+}
+
+static PyObject *pylong_from_u256(const uint64_t value[U256_WORDS]) {
+#if PY_LITTLE_ENDIAN
+    return pylong_from_bytes((const uint8_t *)value, U256_BYTES);
+#else
+    uint8_t raw[U256_BYTES];
+
+    bytes_from_words(value, raw, U256_WORDS);
+    return pylong_from_bytes(raw, U256_BYTES);
+#endif
+}
+
+static PyObject *pylong_from_u512(const uint64_t value[U512_WORDS]) {
+#if PY_LITTLE_ENDIAN
+    return pylong_from_bytes((const uint8_t *)value, U512_BYTES);
+#else
+    uint8_t raw[U512_BYTES];
+
+    bytes_from_words(value, raw, U512_WORDS);
+    return pylong_from_bytes(raw, U512_BYTES);
+#endif
+}
 
-    if (!PyArg_ParseTuple(args, "OO|p:u256_add", &lhs_obj, &rhs_obj, &carry_in)) {
+/* ------------------------------------------------------------------ */
+/* Limb arithmetic kernels                                             */
+/* ------------------------------------------------------------------ */
+
+#if OT_DSIM_X86_64_ASM
+/* Set at import time: BMI2 (mulx) and ADX (adcx/adox) are both needed for
+ * the dual carry chain multiply. */
+static int have_mulx_adx = 0;
+
+static void detect_cpu_features(void) {
+    unsigned int eax;
+    unsigned int ebx;
+    unsigned int ecx;
+    unsigned int edx;
+
+    if (__get_cpuid_max(0, NULL) < 7) {
+        return;
+    }
+    __cpuid_count(7, 0, eax, ebx, ecx, edx);
+    have_mulx_adx = (ebx & (1U << 8)) != 0 && (ebx & (1U << 19)) != 0;
+}
+#endif
+
+static uint64_t add_u256_words(uint64_t out[U256_WORDS],
+                               const uint64_t lhs[U256_WORDS],
+                               const uint64_t rhs[U256_WORDS],
+                               uint64_t carry) {
+#if OT_DSIM_X86_64_ASM
+    uint64_t w0 = lhs[0];
+    uint64_t w1 = lhs[1];
+    uint64_t w2 = lhs[2];
+    uint64_t w3 = lhs[3];
+
+    /* carry + (2^64 - 1) sets CF exactly when carry is 1. */
+    __asm__("addq $-1, %[c]\n\t"
+            "adcq %[r0], %[w0]\n\t"
+            "adcq %[r1], %[w1]\n\t"
+            "adcq %[r2], %[w2]\n\t"
+            "adcq %[r3], %[w3]\n\t"
+            "setc %b[c]\n\t"
+            "movzbl %b[c], %k[c]"
+            : [w0] "+r"(w0), [w1] "+r"(w1), [w2] "+r"(w2), [w3] "+r"(w3),
+              [c] "+r"(carry)
+            : [r0] "m"(rhs[0]), [r1] "m"(rhs[1]), [r2] "m"(rhs[2]),
+              [r3] "m"(rhs[3])
+            : "cc");
+    out[0] = w0;
+    out[1] = w1;
+    out[2] = w2;
+    out[3] = w3;
+    return carry;
+#else
+    int idx;
+
+    for (idx = 0; idx < U256_WORDS; ++idx) {
+        uint64_t sum = lhs[idx] + carry;
+        carry = sum < carry;
+        sum += rhs[idx];
+        carry |= sum < rhs[idx];
+        out[idx] = sum;
+    }
+    return carry;
+#endif
+}
+
+static uint64_t sub_u256_words(uint64_t out[U256_WORDS],
+                               const uint64_t lhs[U256_WORDS],
+                               const uint64_t rhs[U256_WORDS],
+                               uint64_t borrow) {
+#if OT_DSIM_X86_64_ASM
+    uint64_t w0 = lhs[0];
+    uint64_t w1 = lhs[1];
+    uint64_t w2 = lhs[2];
+    uint64_t w3 = lhs[3];
+
+    __asm__("addq $-1, %[b]\n\t"
+            "sbbq %[r0], %[w0]\n\t"
+            "sbbq %[r1], %[w1]\n\t"
+            "sbbq %[r2], %[w2]\n\t"
+            "sbbq %[r3], %[w3]\n\t"
+            "setc %b[b]\n\t"
+            "movzbl %b[b], %k[b]"
+            : [w0] "+r"(w0), [w1] "+r"(w1), [w2] "+r"(w2), [w3] "+r"(w3),
+              [b] "+r"(borrow)
+            : [r0] "m"(rhs[0]), [r1] "m"(rhs[1]), [r2] "m"(rhs[2]),
+              [r3] "m"(rhs[3])
+            : "cc");
+    out[0] = w0;
+    out[1] = w1;
+    out[2] = w2;
+    out[3] = w3;
+    return borrow;
+#else
+    int idx;
+
+    for (idx = 0; idx < U256_WORDS; ++idx) {
+        uint64_t diff = lhs[idx] - rhs[idx];
+        uint64_t next_borrow = lhs[idx] < rhs[idx];
+        next_borrow |= diff < borrow;
+        out[idx] = diff - borrow;
+        borrow = next_borrow;
+    }
+    return borrow;
+#endif
+}
+
+/* Full 64x64 -> 128-bit product, returns the low half. */
+static uint64_t mul_64x64(uint64_t a, uint64_t b, uint64_t *hi) {
+#if defined(__SIZEOF_INT128__)
+    unsigned __int128 prod = (unsigned __int128)a * b;
+    *hi = (uint64_t)(prod >> 64);
+    return (uint64_t)prod;
+#elif defined(_MSC_VER) && defined(_M_X64)
+    return _umul128(a, b, hi);
+#else
+    uint64_t a_lo = a & 0xFFFFFFFFU;
+    uint64_t a_hi = a >> 32;
+    uint64_t b_lo = b & 0xFFFFFFFFU;
+    uint64_t b_hi = b >> 32;
+    uint64_t ll = a_lo * b_lo;
+    uint64_t lh = a_lo * b_hi;
+    uint64_t hl = a_hi * b_lo;
+    uint64_t hh = a_hi * b_hi;
+    uint64_t mid = (ll >> 32) + (lh & 0xFFFFFFFFU) + (hl & 0xFFFFFFFFU);
+
+    *hi = hh + (lh >> 32) + (hl >> 32) + (mid >> 32);
+    return (mid << 32) | (ll & 0xFFFFFFFFU);
+#endif
+}
+
+static void mul_u256_words_portable(uint64_t out[U512_WORDS],
+                                    const uint64_t lhs[U256_WORDS],
+                                    const uint64_t rhs[U256_WORDS]) {
+    int i;
+    int j;
+
+    memset(out, 0, U512_WORDS * sizeof(uint64_t));
+    for (i = 0; i < U256_WORDS; ++i) {
+        uint64_t carry = 0;
+        for (j = 0; j < U256_WORDS; ++j) {
+            uint64_t hi;
+            uint64_t lo = mul_64x64(lhs[i], rhs[j], &hi);
+            lo += out[i + j];
+            hi += lo < out[i + j];
+            lo += carry;
+            hi += lo < carry;
+            out[i + j] = lo;
+            carry = hi;
+        }
+        out[i + U256_WORDS] = carry;
+    }
+}
+
+#if OT_DSIM_X86_64_ASM
+/* Row-wise schoolbook multiply: mulx leaves the flags alone, so the low
+ * halves accumulate on the OF chain (adox) while the high halves
+ * accumulate on the CF chain (adcx). Before row i the partial product
+ * fits in out[0..i+3], so out[i+4] starts at zero and neither chain can
+ * carry past it. */
+static void mul_u256_words_mulx(uint64_t out[U512_WORDS],
+                                const uint64_t lhs[U256_WORDS],
+                                const uint64_t rhs[U256_WORDS]) {
+    int i;
+
+    memset(out, 0, U512_WORDS * sizeof(uint64_t));
+    for (i = 0; i < U256_WORDS; ++i) {
+        uint64_t t0 = out[i];
+        uint64_t t1 = out[i + 1];
+        uint64_t t2 = out[i + 2];
+        uint64_t t3 = out[i + 3];
+        uint64_t t4 = 0;
+        uint64_t lo;
+        uint64_t hi;
+
+        __asm__("xorl %k[lo], %k[lo]\n\t"
+                "mulxq %[b0], %[lo], %[hi]\n\t"
+                "adoxq %[lo], %[t0]\n\t"
+                "adcxq %[hi], %[t1]\n\t"
+                "mulxq %[b1], %[lo], %[hi]\n\t"
+                "adoxq %[lo], %[t1]\n\t"
+                "adcxq %[hi], %[t2]\n\t"
+                "mulxq %[b2], %[lo], %[hi]\n\t"
+                "adoxq %[lo], %[t2]\n\t"
+                "adcxq %[hi], %[t3]\n\t"
+                "mulxq %[b3], %[lo], %[hi]\n\t"
+                "adoxq %[lo], %[t3]\n\t"
+                "adcxq %[hi], %[t4]\n\t"
+                "movl $0, %k[lo]\n\t"
+                "adoxq %[lo], %[t4]"
+                : [t0] "+r"(t0), [t1] "+r"(t1), [t2] "+r"(t2), [t3] "+r"(t3),
+                  [t4] "+r"(t4), [lo] "=&r"(lo), [hi] "=&r"(hi)
+                : "d"(lhs[i]), [b0] "m"(rhs[0]), [b1] "m"(rhs[1]),
+                  [b2] "m"(rhs[2]), [b3] "m"(rhs[3])
+                : "cc");
+        out[i] = t0;
+        out[i + 1] = t1;
+        out[i + 2] = t2;
+        out[i + 3] = t3;
+        out[i + 4] = t4;
+    }
+}
+#endif
+
+/* CIOS Montgomery multiplication over 32-bit limbs:
+ * out = (x * y + m * n) / 2^(32 * nlimbs) with m chosen so the division
+ * is exact. n0inv is -n^-1 mod 2^32. The modulus is subtracted once if the
+ * result carries out of nlimbs limbs, which is what the OTBN library's
+ * conditional subtraction does, so the result is below 2^(32 * nlimbs)
+ * but not necessarily below n. */
+static void mont_mul_limbs(uint32_t *out,
+                           const uint32_t *x,
+                           const uint32_t *y,
+                           const uint32_t *n,
+                           uint32_t n0inv,
+                           int nlimbs) {
+    uint32_t t[MONT_MAX_LIMBS + 2];
+    uint64_t acc;
+    uint32_t m;
+    int i;
+    int j;
+
+    memset(t, 0, (size_t)(nlimbs + 2) * sizeof(uint32_t));
+    for (i = 0; i < nlimbs; ++i) {
+        acc = 0;
+        for (j = 0; j < nlimbs; ++j) {
+            acc = (uint64_t)t[j] + (uint64_t)x[j] * y[i] + (acc >> 32);
+            t[j] = (uint32_t)acc;
+        }
+        acc = (uint64_t)t[nlimbs] + (acc >> 32);
+        t[nlimbs] = (uint32_t)acc;
+        t[nlimbs + 1] = (uint32_t)(acc >> 32);
+
+        m = t[0] * n0inv;
+        acc = (uint64_t)t[0] + (uint64_t)m * n[0];
+        for (j = 1; j < nlimbs; ++j) {
+            acc = (uint64_t)t[j] + (uint64_t)m * n[j] + (acc >> 32);
+            t[j - 1] = (uint32_t)acc;
+        }
+        acc = (uint64_t)t[nlimbs] + (acc >> 32);
+        t[nlimbs - 1] = (uint32_t)acc;
+        t[nlimbs] = t[nlimbs + 1] + (uint32_t)(acc >> 32);
+    }
+
+    if (t[nlimbs] != 0) {
+        uint32_t borrow = 0;
+        for (j = 0; j < nlimbs; ++j) {
+            uint64_t diff = (uint64_t)t[j] - n[j] - borrow;
+            t[j] = (uint32_t)diff;
+            borrow = (uint32_t)(diff >> 63);
+        }
+    }
+    memcpy(out, t, (size_t)nlimbs * sizeof(uint32_t));
+}
+
+static void mul_u256_words(uint64_t out[U512_WORDS],
+                           const uint64_t lhs[U256_WORDS],
+                           const uint64_t rhs[U256_WORDS]) {
+#if OT_DSIM_X86_64_ASM
+    if (have_mulx_adx) {
+        mul_u256_words_mulx(out, lhs, rhs);
+        return;
+    }
+#endif
+    mul_u256_words_portable(out, lhs, rhs);
+}
+
+/* ------------------------------------------------------------------ */
+/* Module functions                                                    */
+/* ------------------------------------------------------------------ */
+
+/* Parse (lhs, rhs[, carry]) for the METH_FASTCALL add/sub entry points; the
+ * carry argument follows the truthiness rules of the "p" format unit. */
+static int parse_carry_args(PyObject *const *args,
+                            Py_ssize_t nargs,
+                            const char *fname,
+                            uint64_t lhs[U256_WORDS],
+                            uint64_t rhs[U256_WORDS],
+                            uint64_t *carry_in) {
+    int truth = 0;
+
+    if (nargs < 2 || nargs > 3) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s() takes 2 or 3 arguments (%zd given)",
+                     fname,
+                     nargs);
+        return -1;
+    }
+    if (nargs == 3) {
+        truth = PyObject_IsTrue(args[2]);
+        if (truth < 0) {
+            return -1;
+        }
+    }
+    if (u256_from_pylong(args[0], "lhs", lhs) != 0 ||
+        u256_from_pylong(args[1], "rhs", rhs) != 0) {
+        return -1;
+    }
+    *carry_in = truth ? 1U : 0U;
+    return 0;
+}
+
+/* Build the (value, carry) result tuple directly instead of formatting it
+ * through Py_BuildValue. */
+static PyObject *u256_carry_result(const uint64_t value[U256_WORDS],
+                                   uint64_t carry) {
+    PyObject *value_obj;
+    PyObject *carry_obj;
+    PyObject *result;
+
+    value_obj = pylong_from_u256(value);
+    if (value_obj == NULL) {
         return NULL;
     }
-    if (parse_fixed_buffer(lhs_obj, "lhs", U256_BYTES, &lhs) != 0) {
+    carry_obj = PyLong_FromLong((long)carry);
+    if (carry_obj == NULL) {
+        Py_DECREF(value_obj);
         return NULL;
     }
-    if (parse_fixed_buffer(rhs_obj, "rhs", U256_BYTES, &rhs) != 0) {
-        PyBuffer_Release(&lhs);
+    result = PyTuple_New(2);
+    if (result == NULL) {
+        Py_DECREF(value_obj);
+        Py_DECREF(carry_obj);
         return NULL;
     }
+    PyTuple_SET_ITEM(result, 0, value_obj);
+    PyTuple_SET_ITEM(result, 1, carry_obj);
+    return result;
+}
 
-    lhs_bytes = (const uint8_t *)lhs.buf;
-    rhs_bytes = (const uint8_t *)rhs.buf;
-    carry = carry_in ? 1U : 0U;
+static PyObject *py_u256_add(PyObject *self,
+                             PyObject *const *args,
+                             Py_ssize_t nargs) {
+    uint64_t lhs[U256_WORDS];
+    uint64_t rhs[U256_WORDS];
+    uint64_t out[U256_WORDS];
+    uint64_t carry;
 
-    for (idx = 0; idx < U256_BYTES; ++idx) {
-        unsigned int sum = (unsigned int)lhs_bytes[idx] +
-                           (unsigned int)rhs_bytes[idx] + carry;
-        out[idx] = (uint8_t)(sum & 0xFFU);
-        carry = sum >> 8;
+    (void)self;
+
+    if (parse_carry_args(args, nargs, "u256_add", lhs, rhs, &carry) != 0) {
+        return NULL;
     }
 
-    PyBuffer_Release(&lhs);
-    PyBuffer_Release(&rhs);
+    carry = add_u256_words(out, lhs, rhs, carry);
 
-    out_bytes = bytes_from_u256(out);
-    if (out_bytes == NULL) {
+    return u256_carry_result(out, carry);
+}
+
+static PyObject *py_u256_sub(PyObject *self,
+                             PyObject *const *args,
+                             Py_ssize_t nargs) {
+    uint64_t lhs[U256_WORDS];
+    uint64_t rhs[U256_WORDS];
+    uint64_t out[U256_WORDS];
+    uint64_t borrow;
+
+    (void)self;
+
+    if (parse_carry_args(args, nargs, "u256_sub", lhs, rhs, &borrow) != 0) {
         return NULL;
     }
 
-    ret = Py_BuildValue("Ni", out_bytes, (int)carry);
-    return ret;
+    borrow = sub_u256_words(out, lhs, rhs, borrow);
+
+    return u256_carry_result(out, borrow);
 }
 
-static PyObject *py_u256_sub(PyObject *self, PyObject *args) {
+typedef uint64_t (*u256_carry_op)(uint64_t out[U256_WORDS],
+                                  const uint64_t lhs[U256_WORDS],
+                                  const uint64_t rhs[U256_WORDS],
+                                  uint64_t carry);
+
+/* Apply an add/sub kernel element-wise over three equal-length sequences,
+ * returning ([value, ...], [carry, ...]). Converting a whole batch in one
+ * call saves the per-element call overhead the fuzz tests would otherwise
+ * pay on every operand. */
+static PyObject *u256_carry_batch(PyObject *const *args,
+                                  Py_ssize_t nargs,
+                                  const char *fname,
+                                  u256_carry_op op) {
+    PyObject *lhs_seq = NULL;
+    PyObject *rhs_seq = NULL;
+    PyObject *cin_seq = NULL;
+    PyObject *vals = NULL;
+    PyObject *carries = NULL;
+    PyObject *result = NULL;
+    Py_ssize_t count;
+    Py_ssize_t idx;
+
+    if (nargs != 3) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s() takes exactly 3 arguments (%zd given)",
+                     fname,
+                     nargs);
+        return NULL;
+    }
+
+    lhs_seq = PySequence_Fast(args[0], "lhs must be a sequence");
+    if (lhs_seq == NULL) goto done;
+    rhs_seq = PySequence_Fast(args[1], "rhs must be a sequence");
+    if (rhs_seq == NULL) goto done;
+    cin_seq = PySequence_Fast(args[2], "carry must be a sequence");
+    if (cin_seq == NULL) goto done;
+
+    count = PySequence_Fast_GET_SIZE(lhs_seq);
+    if (PySequence_Fast_GET_SIZE(rhs_seq) != count ||
+        PySequence_Fast_GET_SIZE(cin_seq) != count) {
+        PyErr_Format(PyExc_ValueError,
+                     "%s() operands must have equal lengths",
+                     fname);
+        goto done;
+    }
+
+    vals = PyList_New(count);
+    if (vals == NULL) goto done;
+    carries = PyList_New(count);
+    if (carries == NULL) goto done;
+
+    for (idx = 0; idx < count; ++idx) {
+        uint64_t lhs[U256_WORDS];
+        uint64_t rhs[U256_WORDS];
+        uint64_t out[U256_WORDS];
+        uint64_t carry;
+        PyObject *item;
+        int truth;
+
+        truth = PyObject_IsTrue(PySequence_Fast_GET_ITEM(cin_seq, idx));
+        if (truth < 0) goto done;
+        if (u256_from_pylong(PySequence_Fast_GET_ITEM(lhs_seq, idx), "lhs", lhs) != 0 ||
+            u256_from_pylong(PySequence_Fast_GET_ITEM(rhs_seq, idx), "rhs", rhs) != 0) {
+            goto done;
+        }
+
+        carry = op(out, lhs, rhs, truth ? 1U : 0U);
+
+        item = pylong_from_u256(out);
+        if (item == NULL) goto done;
+        PyList_SET_ITEM(vals, idx, item);
+        item = PyLong_FromLong((long)carry);
+        if (item == NULL) goto done;
+        PyList_SET_ITEM(carries, idx, item);
+    }
+
+    result = PyTuple_Pack(2, vals, carries);
+
+done:
+    Py_XDECREF(lhs_seq);
+    Py_XDECREF(rhs_seq);
+    Py_XDECREF(cin_seq);
+    Py_XDECREF(vals);
+    Py_XDECREF(carries);
+    return result;
+}
+
+static PyObject *py_u256_add_batch(PyObject *self,
+                                   PyObject *const *args,
+                                   Py_ssize_t nargs) {
+    (void)self;
+    return u256_carry_batch(args, nargs, "u256_add_batch", add_u256_words);
+}
+
+static PyObject *py_u256_sub_batch(PyObject *self,
+                                   PyObject *const *args,
+                                   Py_ssize_t nargs) {
+    (void)self;
+    return u256_carry_batch(args, nargs, "u256_sub_batch", sub_u256_words);
+}
+
+static PyObject *py_u256_mul_512(PyObject *self, PyObject *args) {
     PyObject *lhs_obj;
     PyObject *rhs_obj;
-    int borrow_in = 0;
-    Py_buffer lhs;
-    Py_buffer rhs;
-    uint8_t out[U256_BYTES];
-    const uint8_t *lhs_bytes;
-    const uint8_t *rhs_bytes;
-    int borrow;
-    PyObject *out_bytes;
-    PyObject *ret;
-    Py_ssize_t idx;
+    uint64_t lhs[U256_WORDS];
+    uint64_t rhs[U256_WORDS];
+    uint64_t out[U512_WORDS];
 
     (void)self;
 
-    if (!PyArg_ParseTuple(args, "OO|p:u256_sub", &lhs_obj, &rhs_obj, &borrow_in)) {
+    if (!PyArg_ParseTuple(args, "OO:u256_mul_512", &lhs_obj, &rhs_obj)) {
         return NULL;
     }
-    if (parse_fixed_buffer(lhs_obj, "lhs", U256_BYTES, &lhs) != 0) {
+    if (u256_from_pylong(lhs_obj, "lhs", lhs) != 0 ||
+        u256_from_pylong(rhs_obj, "rhs", rhs) != 0) {
         return NULL;
     }
-    if (parse_fixed_buffer(rhs_obj, "rhs", U256_BYTES, &rhs) != 0) {
-        PyBuffer_Release(&lhs);
+
+    mul_u256_words(out, lhs, rhs);
+
+    return pylong_from_u512(out);
+}
+
+static int limbs_from_pylong(PyObject *obj,
+                             const char *name,
+                             uint32_t *out,
+                             int nlimbs) {
+#if PY_LITTLE_ENDIAN
+    return bytes_from_pylong(obj, name, (uint8_t *)out, (Py_ssize_t)nlimbs * 4);
+#else
+    uint8_t raw[MONT_MAX_LIMBS * 4];
+    int i;
+
+    if (bytes_from_pylong(obj, name, raw, (Py_ssize_t)nlimbs * 4) != 0) {
+        return -1;
+    }
+    for (i = 0; i < nlimbs; ++i) {
+        out[i] = (uint32_t)raw[i * 4] |
+                 ((uint32_t)raw[i * 4 + 1] << 8) |
+                 ((uint32_t)raw[i * 4 + 2] << 16) |
+                 ((uint32_t)raw[i * 4 + 3] << 24);
+    }
+    return 0;
+#endif
+}
+
+static PyObject *pylong_from_limbs(const uint32_t *value, int nlimbs) {
+#if PY_LITTLE_ENDIAN
+    return pylong_from_bytes((const uint8_t *)value, (Py_ssize_t)nlimbs * 4);
+#else
+    uint8_t raw[MONT_MAX_LIMBS * 4];
+    int i;
+
+    for (i = 0; i < nlimbs; ++i) {
+        raw[i * 4] = (uint8_t)(value[i] & 0xFFU);
+        raw[i * 4 + 1] = (uint8_t)((value[i] >> 8) & 0xFFU);
+        raw[i * 4 + 2] = (uint8_t)((value[i] >> 16) & 0xFFU);
+        raw[i * 4 + 3] = (uint8_t)(value[i] >> 24);
+    }
+    return pylong_from_bytes(raw, (Py_ssize_t)nlimbs * 4);
+#endif
+}
+
+static PyObject *mont_mul_words(PyObject *x_obj,
+                                PyObject *y_obj,
+                                PyObject *n_obj,
+                                PyObject *n0inv_obj,
+                                Py_ssize_t words) {
+    uint32_t x[MONT_MAX_LIMBS];
+    uint32_t y[MONT_MAX_LIMBS];
+    uint32_t n[MONT_MAX_LIMBS];
+    uint32_t out[MONT_MAX_LIMBS];
+    unsigned long n0inv;
+    int nlimbs;
+
+    if (words < 1 || words > MONT_MAX_WORDS) {
+        PyErr_Format(PyExc_ValueError,
+                     "words must be between 1 and %d",
+                     MONT_MAX_WORDS);
+        return NULL;
+    }
+    if (!PyLong_Check(n0inv_obj)) {
+        PyErr_SetString(PyExc_TypeError, "n0inv must be an int");
+        return NULL;
+    }
+    nlimbs = (int)words * U256_LIMBS;
+    if (limbs_from_pylong(x_obj, "x", x, nlimbs) != 0 ||
+        limbs_from_pylong(y_obj, "y", y, nlimbs) != 0 ||
+        limbs_from_pylong(n_obj, "n", n, nlimbs) != 0) {
+        return NULL;
+    }
+    if ((n[0] & 1U) == 0) {
+        PyErr_SetString(PyExc_ValueError, "n must be odd");
+        return NULL;
+    }
+    /* Only -n^-1 mod 2^32 is needed, so the full-width OTBN dinv can be
+     * passed as is. */
+    n0inv = PyLong_AsUnsignedLongMask(n0inv_obj);
+    if (n0inv == (unsigned long)-1 && PyErr_Occurred()) {
         return NULL;
     }
 
-    lhs_bytes = (const uint8_t *)lhs.buf;
-    rhs_bytes = (const uint8_t *)rhs.buf;
-    borrow = borrow_in ? 1 : 0;
+    mont_mul_limbs(out, x, y, n, (uint32_t)n0inv, nlimbs);
 
-    for (idx = 0; idx < U256_BYTES; ++idx) {
-        int diff = (int)lhs_bytes[idx] - (int)rhs_bytes[idx] - borrow;
-        if (diff < 0) {
-            diff += 256;
-            borrow = 1;
-        } else {
-            borrow = 0;
-        }
-        out[idx] = (uint8_t)diff;
+    return pylong_from_limbs(out, nlimbs);
+}
+
+static PyObject *py_mont_mul_256(PyObject *self, PyObject *args) {
+    PyObject *x_obj;
+    PyObject *y_obj;
+    PyObject *n_obj;
+    PyObject *n0inv_obj;
+
+    (void)self;
+
+    if (!PyArg_ParseTuple(args,
+                          "OOOO:mont_mul_256",
+                          &x_obj,
+                          &y_obj,
+                          &n_obj,
+                          &n0inv_obj)) {
+        return NULL;
     }
 
-    PyBuffer_Release(&lhs);
-    PyBuffer_Release(&rhs);
+    return mont_mul_words(x_obj, y_obj, n_obj, n0inv_obj, 1);
+}
+
+static PyObject *py_mont_mul(PyObject *self, PyObject *args) {
+    PyObject *x_obj;
+    PyObject *y_obj;
+    PyObject *n_obj;
+    PyObject *n0inv_obj;
+    Py_ssize_t words;
+
+    (void)self;
 
-    out_bytes = bytes_from_u256(out);
-    if (out_bytes == NULL) {
+    if (!PyArg_ParseTuple(args,
+                          "OOOOn:mont_mul",
+                          &x_obj,
+                          &y_obj,
+                          &n_obj,
+                          &n0inv_obj,
+                          &words)) {
         return NULL;
     }
 
-    ret = Py_BuildValue("Ni", out_bytes, borrow);
-    return ret;
+    return mont_mul_words(x_obj, y_obj, n_obj, n0inv_obj, words);
+}
+
+/* Branchless: lhs - rhs borrows iff lhs < rhs, and the difference is zero
+ * iff they are equal.  A borrow implies a non-zero difference, so
+ * nonzero - 2 * borrow yields -1, 0 or 1. */
+static long cmp_u256_words(const uint64_t lhs[U256_WORDS],
+                           const uint64_t rhs[U256_WORDS]) {
+    uint64_t diff[U256_WORDS];
+    uint64_t borrow;
+    uint64_t nonzero;
+
+    borrow = sub_u256_words(diff, lhs, rhs, 0);
+    nonzero = diff[0] | diff[1] | diff[2] | diff[3];
+
+    return (long)(nonzero != 0) - 2 * (long)borrow;
 }
 
 static PyObject *py_u256_cmp(PyObject *self, PyObject *args) {
     PyObject *lhs_obj;
     PyObject *rhs_obj;
-    Py_buffer lhs;
-    Py_buffer rhs;
-    const uint8_t *lhs_bytes;
-    const uint8_t *rhs_bytes;
-    Py_ssize_t idx;
-    int cmp = 0;
+    uint64_t lhs[U256_WORDS];
+    uint64_t rhs[U256_WORDS];
 
     (void)self;
 
     if (!PyArg_ParseTuple(args, "OO:u256_cmp", &lhs_obj, &rhs_obj)) {
         return NULL;
     }
-    if (parse_fixed_buffer(lhs_obj, "lhs", U256_BYTES, &lhs) != 0) {
+    if (u256_from_pylong(lhs_obj, "lhs", lhs) != 0 ||
+        u256_from_pylong(rhs_obj, "rhs", rhs) != 0) {
         return NULL;
     }
-    if (parse_fixed_buffer(rhs_obj, "rhs", U256_BYTES, &rhs) != 0) {
-        PyBuffer_Release(&lhs);
+
+    return PyLong_FromLong(cmp_u256_words(lhs, rhs));
+}
+
+/* Element-wise u256_cmp over two equal-length sequences, returning the list
+ * of -1/0/1 results. */
+static PyObject *py_u256_cmp_batch(PyObject *self,
+                                   PyObject *const *args,
+                                   Py_ssize_t nargs) {
+    PyObject *lhs_seq = NULL;
+    PyObject *rhs_seq = NULL;
+    PyObject *out_list = NULL;
+    PyObject *result = NULL;
+    Py_ssize_t count;
+    Py_ssize_t idx;
+
+    (void)self;
+
+    if (nargs != 2) {
+        PyErr_Format(PyExc_TypeError,
+                     "u256_cmp_batch() takes exactly 2 arguments (%zd given)",
+                     nargs);
         return NULL;
     }
 
-    lhs_bytes = (const uint8_t *)lhs.buf;
-    rhs_bytes = (const uint8_t *)rhs.buf;
-    for (idx = U256_BYTES - 1; idx >= 0; --idx) {
-        if (lhs_bytes[idx] < rhs_bytes[idx]) {
-            cmp = -1;
-            break;
-        }
-        if (lhs_bytes[idx] > rhs_bytes[idx]) {
-            cmp = 1;
-            break;
+    lhs_seq = PySequence_Fast(args[0], "lhs must be a sequence");
+    if (lhs_seq == NULL) goto done;
+    rhs_seq = PySequence_Fast(args[1], "rhs must be a sequence");
+    if (rhs_seq == NULL) goto done;
+
+    count = PySequence_Fast_GET_SIZE(lhs_seq);
+    if (PySequence_Fast_GET_SIZE(rhs_seq) != count) {
+        PyErr_SetString(PyExc_ValueError,
+                        "u256_cmp_batch() operands must have equal lengths");
+        goto done;
+    }
+
+    out_list = PyList_New(count);
+    if (out_list == NULL) goto done;
+
+    for (idx = 0; idx < count; ++idx) {
+        uint64_t lhs[U256_WORDS];
+        uint64_t rhs[U256_WORDS];
+        PyObject *item;
+
+        if (u256_from_pylong(PySequence_Fast_GET_ITEM(lhs_seq, idx), "lhs", lhs) != 0 ||
+            u256_from_pylong(PySequence_Fast_GET_ITEM(rhs_seq, idx), "rhs", rhs) != 0) {
+            goto done;
         }
+
+        item = PyLong_FromLong(cmp_u256_words(lhs, rhs));
+        if (item == NULL) goto done;
+        PyList_SET_ITEM(out_list, idx, item);
     }
 
-    PyBuffer_Release(&lhs);
-    PyBuffer_Release(&rhs);
+    result = out_list;
+    out_list = NULL;
 
-    return PyLong_FromLong((long)cmp);
+done:
+    Py_XDECREF(lhs_seq);
+    Py_XDECREF(rhs_seq);
+    Py_XDECREF(out_list);
+    return result;
 }
 
 static PyObject *py_u256_and(PyObject *self, PyObject *args) {
     PyObject *lhs_obj;
     PyObject *rhs_obj;
-    Py_buffer lhs;
-    Py_buffer rhs;
-    uint8_t out[U256_BYTES];
-    const uint8_t *lhs_bytes;
-    const uint8_t *rhs_bytes;
-    Py_ssize_t idx;
+    uint64_t lhs[U256_WORDS];
+    uint64_t rhs[U256_WORDS];
+    uint64_t out[U256_WORDS];
+    int idx;
 
     (void)self;
 
     if (!PyArg_ParseTuple(args, "OO:u256_and", &lhs_obj, &rhs_obj)) {
         return NULL;
     }
-    if (parse_fixed_buffer(lhs_obj, "lhs", U256_BYTES, &lhs) != 0) {
-        return NULL;
-    }
-    if (parse_fixed_buffer(rhs_obj, "rhs", U256_BYTES, &rhs) != 0) {
-        PyBuffer_Release(&lhs);
+    if (u256_from_pylong(lhs_obj, "lhs", lhs) != 0 ||
+        u256_from_pylong(rhs_obj, "rhs", rhs) != 0) {
         return NULL;
     }
 
-    lhs_bytes = (const uint8_t *)lhs.buf;
-    rhs_bytes = (const uint8_t *)rhs.buf;
-    for (idx = 0; idx < U256_BYTES; ++idx) {
-        out[idx] = (uint8_t)(lhs_bytes[idx] & rhs_bytes[idx]);
+    for (idx = 0; idx < U256_WORDS; ++idx) {
+        out[idx] = lhs[idx] & rhs[idx];
     }
 
-    PyBuffer_Release(&lhs);
-    PyBuffer_Release(&rhs);
-
-    return bytes_from_u256(out);
+    return pylong_from_u256(out);
 }
 
 static PyObject *py_u256_or(PyObject *self, PyObject *args) {
     PyObject *lhs_obj;
     PyObject *rhs_obj;
-    Py_buffer lhs;
-    Py_buffer rhs;
-    uint8_t out[U256_BYTES];
-    const uint8_t *lhs_bytes;
-    const uint8_t *rhs_bytes;
-    Py_ssize_t idx;
+    uint64_t lhs[U256_WORDS];
+    uint64_t rhs[U256_WORDS];
+    uint64_t out[U256_WORDS];
+    int idx;
 
     (void)self;
 
     if (!PyArg_ParseTuple(args, "OO:u256_or", &lhs_obj, &rhs_obj)) {
         return NULL;
     }
-    if (parse_fixed_buffer(lhs_obj, "lhs", U256_BYTES, &lhs) != 0) {
-        return NULL;
-    }
-    if (parse_fixed_buffer(rhs_obj, "rhs", U256_BYTES, &rhs) != 0) {
-        PyBuffer_Release(&lhs);
+    if (u256_from_pylong(lhs_obj, "lhs", lhs) != 0 ||
+        u256_from_pylong(rhs_obj, "rhs", rhs) != 0) {
         return NULL;
     }
 
-    lhs_bytes = (const uint8_t *)lhs.buf;
-    rhs_bytes = (const uint8_t *)rhs.buf;
-    for (idx = 0; idx < U256_BYTES; ++idx) {
-        out[idx] = (uint8_t)(lhs_bytes[idx] | rhs_bytes[idx]);
+    for (idx = 0; idx < U256_WORDS; ++idx) {
+        out[idx] = lhs[idx] | rhs[idx];
     }
 
-    PyBuffer_Release(&lhs);
-    PyBuffer_Release(&rhs);
-
-    return bytes_from_u256(out);
+    return pylong_from_u256(out);
 }
 
 static PyObject *py_u256_xor(PyObject *self, PyObject *args) {
     PyObject *lhs_obj;
     PyObject *rhs_obj;
-    Py_buffer lhs;
-    Py_buffer rhs;
-    uint8_t out[U256_BYTES];
-    const uint8_t *lhs_bytes;
-    const uint8_t *rhs_bytes;
-    Py_ssize_t idx;
+    uint64_t lhs[U256_WORDS];
+    uint64_t rhs[U256_WORDS];
+    uint64_t out[U256_WORDS];
+    int idx;
 
     (void)self;
 
     if (!PyArg_ParseTuple(args, "OO:u256_xor", &lhs_obj, &rhs_obj)) {
         return NULL;
     }
-    if (parse_fixed_buffer(lhs_obj, "lhs", U256_BYTES, &lhs) != 0) {
-        return NULL;
-    }
-    if (parse_fixed_buffer(rhs_obj, "rhs", U256_BYTES, &rhs) != 0) {
-        PyBuffer_Release(&lhs);
+    if (u256_from_pylong(lhs_obj, "lhs", lhs) != 0 ||
+        u256_from_pylong(rhs_obj, "rhs", rhs) != 0) {
         return NULL;
     }
 
-    lhs_bytes = (const uint8_t *)lhs.buf;
-    rhs_bytes = (const uint8_t *)rhs.buf;
-    for (idx = 0; idx < U256_BYTES; ++idx) {
-        out[idx] = (uint8_t)(lhs_bytes[idx] ^ rhs_bytes[idx]);
+    for (idx = 0; idx < U256_WORDS; ++idx) {
+        out[idx] = lhs[idx] ^ rhs[idx];
     }
 
-    PyBuffer_Release(&lhs);
-    PyBuffer_Release(&rhs);
-
-    return bytes_from_u256(out);
+    return pylong_from_u256(out);
 }
 
 static PyObject *py_u256_not(PyObject *self, PyObject *args) {
     PyObject *word_obj;
-    Py_buffer word;
-    uint8_t out[U256_BYTES];
-    const uint8_t *word_bytes;
-    Py_ssize_t idx;
+    uint64_t word[U256_WORDS];
+    uint64_t out[U256_WORDS];
+    int idx;
 
     (void)self;
 
     if (!PyArg_ParseTuple(args, "O:u256_not", &word_obj)) {
         return NULL;
     }
-    if (parse_fixed_buffer(word_obj, "word", U256_BYTES, &word) != 0) {
+    if (u256_from_pylong(word_obj, "value", word) != 0) {
         return NULL;
     }
 
-    word_bytes = (const uint8_t *)word.buf;
-    for (idx = 0; idx < U256_BYTES; ++idx) {
-        out[idx] = (uint8_t)(~word_bytes[idx]);
+    for (idx = 0; idx < U256_WORDS; ++idx) {
+        out[idx] = ~word[idx];
     }
 
-    PyBuffer_Release(&word);
+    return pylong_from_u256(out);
+}
 
-    return bytes_from_u256(out);
+/* Shift by whole 64-bit words (q) and then by the remaining bits (r); the
+ * two-word funnel below compiles to shld/shrd on x86_64.  Callers handle
+ * shifts of 256 bits or more. */
+static void shl_u256_words(uint64_t out[U256_WORDS],
+                           const uint64_t in[U256_WORDS],
+                           unsigned shift) {
+    unsigned q = shift / 64;
+    unsigned r = shift % 64;
+    int idx;
+
+    for (idx = U256_WORDS - 1; idx >= (int)q; --idx) {
+        uint64_t word = in[idx - q] << r;
+        if (r != 0 && idx > (int)q) {
+            word |= in[idx - q - 1] >> (64 - r);
+        }
+        out[idx] = word;
+    }
+    for (; idx >= 0; --idx) {
+        out[idx] = 0;
+    }
+}
+
+static void shr_u256_words(uint64_t out[U256_WORDS],
+                           const uint64_t in[U256_WORDS],
+                           unsigned shift) {
+    unsigned q = shift / 64;
+    unsigned r = shift % 64;
+    int idx;
+
+    for (idx = 0; idx < U256_WORDS - (int)q; ++idx) {
+        uint64_t word = in[idx + q] >> r;
+        if (r != 0 && idx + (int)q + 1 < U256_WORDS) {
+            word |= in[idx + q + 1] << (64 - r);
+        }
+        out[idx] = word;
+    }
+    for (; idx < U256_WORDS; ++idx) {
+        out[idx] = 0;
+    }
 }
 
 static PyObject *py_u256_shl(PyObject *self, PyObject *args) {
     PyObject *word_obj;
     Py_ssize_t shift;
-    Py_buffer word;
-    uint8_t out[U256_BYTES];
-    const uint8_t *word_bytes;
+    uint64_t word[U256_WORDS];
+    uint64_t out[U256_WORDS];
 
     (void)self;
 
@@ -318,52 +1024,27 @@ static PyObject *py_u256_shl(PyObject *self, PyObject *args) {
         return NULL;
     }
     if (shift < 0) {
-        PyErr_SetString(PyExc_ValueError, "shift must be non-negative");
+        PyErr_SetString(PyExc_ValueError, "shift_bits must be non-negative");
         return NULL;
     }
-    if (parse_fixed_buffer(word_obj, "word", U256_BYTES, &word) != 0) {
+    if (u256_from_pylong(word_obj, "value", word) != 0) {
         return NULL;
     }
 
-    word_bytes = (const uint8_t *)word.buf;
-    memcpy(out, word_bytes, U256_BYTES);
-
     if (shift >= 256) {
-        memset(out, 0, U256_BYTES);
-    } else if (shift > 0) {
-        Py_ssize_t byte_shift = shift / 8;
-        int bit_shift = (int)(shift % 8);
-        Py_ssize_t i;
-        /* Shift by whole bytes first (little-endian: shifting left means
-         * moving bytes toward higher indices). */
-        if (byte_shift > 0) {
-            for (i = U256_BYTES - 1; i >= byte_shift; --i)
-                out[i] = out[i - byte_shift];
-            for (i = 0; i < byte_shift; ++i)
-                out[i] = 0;
-        }
-        /* Then shift remaining bits within bytes. */
-        if (bit_shift > 0) {
-            uint8_t carry = 0;
-            for (i = byte_shift; i < U256_BYTES; ++i) {
-                uint8_t next_carry = (uint8_t)(out[i] >> (8 - bit_shift));
-                out[i] = (uint8_t)((out[i] << bit_shift) | carry);
-                carry = next_carry;
-            }
-        }
+        memset(out, 0, sizeof(out));
+    } else {
+        shl_u256_words(out, word, (unsigned)shift);
     }
 
-    PyBuffer_Release(&word);
-
-    return bytes_from_u256(out);
+    return pylong_from_u256(out);
 }
 
 static PyObject *py_u256_shr(PyObject *self, PyObject *args) {
     PyObject *word_obj;
     Py_ssize_t shift;
-    Py_buffer word;
-    uint8_t out[U256_BYTES];
-    const uint8_t *word_bytes;
+    uint64_t word[U256_WORDS];
+    uint64_t out[U256_WORDS];
 
     (void)self;
 
@@ -371,52 +1052,26 @@ static PyObject *py_u256_shr(PyObject *self, PyObject *args) {
         return NULL;
     }
     if (shift < 0) {
-        PyErr_SetString(PyExc_ValueError, "shift must be non-negative");
+        PyErr_SetString(PyExc_ValueError, "shift_bits must be non-negative");
         return NULL;
     }
-    if (parse_fixed_buffer(word_obj, "word", U256_BYTES, &word) != 0) {
+    if (u256_from_pylong(word_obj, "value", word) != 0) {
         return NULL;
     }
 
-    word_bytes = (const uint8_t *)word.buf;
-    memcpy(out, word_bytes, U256_BYTES);
-
     if (shift >= 256) {
-        memset(out, 0, U256_BYTES);
-    } else if (shift > 0) {
-        Py_ssize_t byte_shift = shift / 8;
-        int bit_shift = (int)(shift % 8);
-        Py_ssize_t i;
-        /* Shift by whole bytes first (little-endian: shifting right means
-         * moving bytes toward lower indices). */
-        if (byte_shift > 0) {
-            for (i = 0; i < U256_BYTES - byte_shift; ++i)
-                out[i] = out[i + byte_shift];
-            for (i = U256_BYTES - byte_shift; i < U256_BYTES; ++i)
-                out[i] = 0;
-        }
-        /* Then shift remaining bits within bytes. */
-        if (bit_shift > 0) {
-            Py_ssize_t top = U256_BYTES - byte_shift;
-            uint8_t carry = 0;
-            for (i = top - 1; i >= 0; --i) {
-                uint8_t next_carry = (uint8_t)(out[i] << (8 - bit_shift));
-                out[i] = (uint8_t)((out[i] >> bit_shift) | carry);
-                carry = next_carry;
-            }
-        }
+        memset(out, 0, sizeof(out));
+    } else {
+        shr_u256_words(out, word, (unsigned)shift);
     }
 
-    PyBuffer_Release(&word);
-
-    return bytes_from_u256(out);
+    return pylong_from_u256(out);
 }
 
 static PyObject *py_u256_get_limb(PyObject *self, PyObject *args) {
     PyObject *word_obj;
     Py_ssize_t limb_idx;
-    Py_buffer word;
-    const uint8_t *word_bytes;
+    uint8_t word_bytes[U256_BYTES];
     Py_ssize_t offset;
     uint32_t limb;
 
@@ -429,113 +1084,169 @@ static PyObject *py_u256_get_limb(PyObject *self, PyObject *args) {
         PyErr_SetString(PyExc_IndexError, "limb index out of range");
         return NULL;
     }
-    if (parse_fixed_buffer(word_obj, "word", U256_BYTES, &word) != 0) {
+    if (bytes_from_pylong(word_obj, "value", word_bytes, U256_BYTES) != 0) {
         return NULL;
     }
 
-    word_bytes = (const uint8_t *)word.buf;
     offset = limb_idx * 4;
     limb = (uint32_t)word_bytes[offset] |
            ((uint32_t)word_bytes[offset + 1] << 8) |
            ((uint32_t)word_bytes[offset + 2] << 16) |
            ((uint32_t)word_bytes[offset + 3] << 24);
 
-    PyBuffer_Release(&word);
-
     return PyLong_FromUnsignedLong((unsigned long)limb);
 }
 
 static PyObject *py_u256_set_limb(PyObject *self, PyObject *args) {
     PyObject *word_obj;
     Py_ssize_t limb_idx;
-    unsigned long limb_val;
-    Py_buffer word;
+    PyObject *limb_obj;
     uint8_t out[U256_BYTES];
-    const uint8_t *word_bytes;
+    uint8_t limb_bytes[4];
     Py_ssize_t offset;
 
     (void)self;
 
-    if (!PyArg_ParseTuple(args, "Onk:u256_set_limb", &word_obj, &limb_idx, &limb_val)) {
+    if (!PyArg_ParseTuple(args, "OnO:u256_set_limb", &word_obj, &limb_idx, &limb_obj)) {
         return NULL;
     }
     if (limb_idx < 0 || limb_idx >= U256_LIMBS) {
         PyErr_SetString(PyExc_IndexError, "limb index out of range");
         return NULL;
     }
-    if (limb_val > 0xFFFFFFFFUL) {
-        PyErr_SetString(PyExc_OverflowError, "limb value out of range");
+    if (bytes_from_pylong(word_obj, "value", out, U256_BYTES) != 0 ||
+        bytes_from_pylong(limb_obj, "limb_value", limb_bytes, 4) != 0) {
         return NULL;
     }
-    if (parse_fixed_buffer(word_obj, "word", U256_BYTES, &word) != 0) {
+
+    offset = limb_idx * 4;
+    memcpy(out + offset, limb_bytes, 4);
+
+    return pylong_from_bytes(out, U256_BYTES);
+}
+
+/* Element-wise u256_set_limb over three equal-length sequences, returning
+ * the list of updated words. */
+static PyObject *py_u256_set_limb_batch(PyObject *self,
+                                        PyObject *const *args,
+                                        Py_ssize_t nargs) {
+    PyObject *word_seq = NULL;
+    PyObject *idx_seq = NULL;
+    PyObject *limb_seq = NULL;
+    PyObject *out_list = NULL;
+    PyObject *result = NULL;
+    Py_ssize_t count;
+    Py_ssize_t idx;
+
+    (void)self;
+
+    if (nargs != 3) {
+        PyErr_Format(PyExc_TypeError,
+                     "u256_set_limb_batch() takes exactly 3 arguments (%zd given)",
+                     nargs);
         return NULL;
     }
 
-    word_bytes = (const uint8_t *)word.buf;
-    memcpy(out, word_bytes, U256_BYTES);
-    offset = limb_idx * 4;
-    out[offset] = (uint8_t)(limb_val & 0xFFUL);
-    out[offset + 1] = (uint8_t)((limb_val >> 8) & 0xFFUL);
-    out[offset + 2] = (uint8_t)((limb_val >> 16) & 0xFFUL);
-    out[offset + 3] = (uint8_t)((limb_val >> 24) & 0xFFUL);
+    word_seq = PySequence_Fast(args[0], "values must be a sequence");
+    if (word_seq == NULL) goto done;
+    idx_seq = PySequence_Fast(args[1], "idxs must be a sequence");
+    if (idx_seq == NULL) goto done;
+    limb_seq = PySequence_Fast(args[2], "limb_values must be a sequence");
+    if (limb_seq == NULL) goto done;
+
+    count = PySequence_Fast_GET_SIZE(word_seq);
+    if (PySequence_Fast_GET_SIZE(idx_seq) != count ||
+        PySequence_Fast_GET_SIZE(limb_seq) != count) {
+        PyErr_SetString(PyExc_ValueError,
+                        "u256_set_limb_batch() operands must have equal lengths");
+        goto done;
+    }
+
+    out_list = PyList_New(count);
+    if (out_list == NULL) goto done;
+
+    for (idx = 0; idx < count; ++idx) {
+        uint8_t out[U256_BYTES];
+        uint8_t limb_bytes[4];
+        PyObject *idx_obj = PySequence_Fast_GET_ITEM(idx_seq, idx);
+        Py_ssize_t limb_idx;
+        PyObject *item;
+
+        if (!PyLong_Check(idx_obj)) {
+            PyErr_SetString(PyExc_TypeError, "limb index must be an int");
+            goto done;
+        }
+        limb_idx = PyLong_AsSsize_t(idx_obj);
+        if (limb_idx == -1 && PyErr_Occurred()) goto done;
+        if (limb_idx < 0 || limb_idx >= U256_LIMBS) {
+            PyErr_SetString(PyExc_IndexError, "limb index out of range");
+            goto done;
+        }
+        if (bytes_from_pylong(PySequence_Fast_GET_ITEM(word_seq, idx),
+                              "value", out, U256_BYTES) != 0 ||
+            bytes_from_pylong(PySequence_Fast_GET_ITEM(limb_seq, idx),
+                              "limb_value", limb_bytes, 4) != 0) {
+            goto done;
+        }
+
+        memcpy(out + limb_idx * 4, limb_bytes, 4);
 
-    PyBuffer_Release(&word);
+        item = pylong_from_bytes(out, U256_BYTES);
+        if (item == NULL) goto done;
+        PyList_SET_ITEM(out_list, idx, item);
+    }
+
+    result = out_list;
+    out_list = NULL;
 
-    return bytes_from_u256(out);
+done:
+    Py_XDECREF(word_seq);
+    Py_XDECREF(idx_seq);
+    Py_XDECREF(limb_seq);
+    Py_XDECREF(out_list);
+    return result;
 }
 
 static PyObject *py_u256_set_half_limb(PyObject *self, PyObject *args) {
     PyObject *word_obj;
     Py_ssize_t limb_idx;
     int upper;
-    unsigned long half_limb_val;
-    Py_buffer word;
+    PyObject *half_limb_obj;
     uint8_t out[U256_BYTES];
-    const uint8_t *word_bytes;
+    uint8_t half_limb_bytes[2];
     Py_ssize_t offset;
 
     (void)self;
 
     if (!PyArg_ParseTuple(args,
-                          "Onpk:u256_set_half_limb",
+                          "OnpO:u256_set_half_limb",
                           &word_obj,
                           &limb_idx,
                           &upper,
-                          &half_limb_val)) {
+                          &half_limb_obj)) {
         return NULL;
     }
     if (limb_idx < 0 || limb_idx >= U256_LIMBS) {
         PyErr_SetString(PyExc_IndexError, "limb index out of range");
         return NULL;
     }
-    if (half_limb_val > 0xFFFFUL) {
-        PyErr_SetString(PyExc_OverflowError, "half-limb value out of range");
-        return NULL;
-    }
-    if (parse_fixed_buffer(word_obj, "word", U256_BYTES, &word) != 0) {
+    if (bytes_from_pylong(word_obj, "value", out, U256_BYTES) != 0 ||
+        bytes_from_pylong(half_limb_obj, "half_limb_value", half_limb_bytes, 2) != 0) {
         return NULL;
     }
 
-    word_bytes = (const uint8_t *)word.buf;
-    memcpy(out, word_bytes, U256_BYTES);
     offset = limb_idx * 4 + (upper ? 2 : 0);
-    out[offset] = (uint8_t)(half_limb_val & 0xFFUL);
-    out[offset + 1] = (uint8_t)((half_limb_val >> 8) & 0xFFUL);
+    memcpy(out + offset, half_limb_bytes, 2);
 
-    PyBuffer_Release(&word);
-
-    return bytes_from_u256(out);
+    return pylong_from_bytes(out, U256_BYTES);
 }
 
 static PyObject *py_u256_set_half_word(PyObject *self, PyObject *args) {
     PyObject *word_obj;
     Py_ssize_t half_word_idx;
     PyObject *half_word_obj;
-    Py_buffer word;
-    Py_buffer half_word;
     uint8_t out[U256_BYTES];
-    const uint8_t *word_bytes;
-    const uint8_t *half_word_bytes;
+    uint8_t half_word_bytes[U256_BYTES / 2];
     Py_ssize_t offset;
 
     (void)self;
@@ -551,40 +1262,47 @@ static PyObject *py_u256_set_half_word(PyObject *self, PyObject *args) {
         PyErr_SetString(PyExc_IndexError, "half-word index out of range");
         return NULL;
     }
-    if (parse_fixed_buffer(word_obj, "word", U256_BYTES, &word) != 0) {
-        return NULL;
-    }
-    if (parse_fixed_buffer(half_word_obj, "half_word", 16, &half_word) != 0) {
-        PyBuffer_Release(&word);
+    if (bytes_from_pylong(word_obj, "value", out, U256_BYTES) != 0 ||
+        bytes_from_pylong(half_word_obj,
+                          "half_word_value",
+                          half_word_bytes,
+                          U256_BYTES / 2) != 0) {
         return NULL;
     }
 
-    word_bytes = (const uint8_t *)word.buf;
-    half_word_bytes = (const uint8_t *)half_word.buf;
-    memcpy(out, word_bytes, U256_BYTES);
-    offset = half_word_idx * 16;
-    memcpy(out + offset, half_word_bytes, 16);
+    offset = half_word_idx * (U256_BYTES / 2);
+    memcpy(out + offset, half_word_bytes, U256_BYTES / 2);
 
-    PyBuffer_Release(&word);
-    PyBuffer_Release(&half_word);
-
-    return bytes_from_u256(out);
+    return pylong_from_bytes(out, U256_BYTES);
 }
 
 static PyMethodDef module_methods[] = {
-    {"u256_add", py_u256_add, METH_VARARGS, "Add two little-endian 256-bit values."},
-    {"u256_sub", py_u256_sub, METH_VARARGS, "Subtract two little-endian 256-bit values."},
-    {"u256_cmp", py_u256_cmp, METH_VARARGS, "Compare two little-endian 256-bit values."},
-    {"u256_and", py_u256_and, METH_VARARGS, "Bitwise and for little-endian 256-bit values."},
-    {"u256_or", py_u256_or, METH_VARARGS, "Bitwise or for little-endian 256-bit values."},
-    {"u256_xor", py_u256_xor, METH_VARARGS, "Bitwise xor for little-endian 256-bit values."},
-    {"u256_not", py_u256_not, METH_VARARGS, "Bitwise not for a little-endian 256-bit value."},
-    {"u256_shl", py_u256_shl, METH_VARARGS, "Shift left a little-endian 256-bit value."},
-    {"u256_shr", py_u256_shr, METH_VARARGS, "Shift right a little-endian 256-bit value."},
-    {"u256_get_limb", py_u256_get_limb, METH_VARARGS, "Read a 32-bit limb from a 256-bit value."},
-    {"u256_set_limb", py_u256_set_limb, METH_VARARGS, "Write a 32-bit limb into a 256-bit value."},
-    {"u256_set_half_limb", py_u256_set_half_limb, METH_VARARGS, "Write a 16-bit half-limb into a 256-bit value."},
-    {"u256_set_half_word", py_u256_set_half_word, METH_VARARGS, "Write a 128-bit half-word into a 256-bit value."},
+    {"u256_add", (PyCFunction)(void (*)(void))py_u256_add, METH_FASTCALL,
+     "Add two 256-bit ints, returning (sum, carry)."},
+    {"u256_sub", (PyCFunction)(void (*)(void))py_u256_sub, METH_FASTCALL,
+     "Subtract two 256-bit ints, returning (diff, borrow)."},
+    {"u256_add_batch", (PyCFunction)(void (*)(void))py_u256_add_batch, METH_FASTCALL,
+     "Add sequences of 256-bit ints, returning ([sum, ...], [carry, ...])."},
+    {"u256_sub_batch", (PyCFunction)(void (*)(void))py_u256_sub_batch, METH_FASTCALL,
+     "Subtract sequences of 256-bit ints, returning ([diff, ...], [borrow, ...])."},
+    {"u256_mul_512", py_u256_mul_512, METH_VARARGS, "Multiply two 256-bit ints into a 512-bit product."},
+    {"mont_mul_256", py_mont_mul_256, METH_VARARGS, "Montgomery product of two 256-bit ints."},
+    {"mont_mul", py_mont_mul, METH_VARARGS, "Montgomery product of two multi-word ints."},
+    {"u256_cmp", py_u256_cmp, METH_VARARGS, "Compare two 256-bit ints."},
+    {"u256_cmp_batch", (PyCFunction)(void (*)(void))py_u256_cmp_batch, METH_FASTCALL,
+     "Compare sequences of 256-bit ints pairwise, returning [-1/0/1, ...]."},
+    {"u256_and", py_u256_and, METH_VARARGS, "Bitwise and for 256-bit ints."},
+    {"u256_or", py_u256_or, METH_VARARGS, "Bitwise or for 256-bit ints."},
+    {"u256_xor", py_u256_xor, METH_VARARGS, "Bitwise xor for 256-bit ints."},
+    {"u256_not", py_u256_not, METH_VARARGS, "Bitwise not for a 256-bit int."},
+    {"u256_shl", py_u256_shl, METH_VARARGS, "Shift left a 256-bit int."},
+    {"u256_shr", py_u256_shr, METH_VARARGS, "Shift right a 256-bit int."},
+    {"u256_get_limb", py_u256_get_limb, METH_VARARGS, "Read a 32-bit limb from a 256-bit int."},
+    {"u256_set_limb", py_u256_set_limb, METH_VARARGS, "Write a 32-bit limb into a 256-bit int."},
+    {"u256_set_limb_batch", (PyCFunction)(void (*)(void))py_u256_set_limb_batch, METH_FASTCALL,
+     "Write one 32-bit limb into each of a sequence of 256-bit ints."},
+    {"u256_set_half_limb", py_u256_set_half_limb, METH_VARARGS, "Write a 16-bit half-limb into a 256-bit int."},
+    {"u256_set_half_word", py_u256_set_half_word, METH_VARARGS, "Write a 128-bit half-word into a 256-bit int."},
     {NULL, NULL, 0, NULL},
 };
 
@@ -597,5 +1315,19 @@ static struct PyModuleDef module_def = {
 };
 
 PyMODINIT_FUNC PyInit__cops(void) {
-    return PyModule_Create(&module_def);
+    PyObject *m;
+
+#if OT_DSIM_X86_64_ASM
+    detect_cpu_features();
+#endif
+
+    m = PyModule_Create(&module_def);
+    if (!m) return NULL;
+
+    if (PyModule_AddIntConstant(m, "ABI_VERSION", OT_DSIM_COPS_ABI_VERSION) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    return m;
 }
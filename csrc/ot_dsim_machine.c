@@ -45,7 +45,7 @@
 #define CSR_RNG      0xFC0
 #define WSR_MOD      0
 #define WSR_RND      1
-#define OT_DSIM_MACHINE_ABI_VERSION 1
+#define OT_DSIM_MACHINE_ABI_VERSION 2
 
 /* ------------------------------------------------------------------ */
 /* Loop-stack entry                                                    */
@@ -137,6 +137,10 @@ typedef struct {
 static PyTypeObject CMachineType;
 static PyObject *CallStackUnderrun;
 
+/* Reset value of the RND WSR, built once at module init and shared by all
+ * machines (ints are immutable). */
+static PyObject *rnd_reset_value;
+
 /* ------------------------------------------------------------------ */
 /* Helper: create Python int mask for N bits                           */
 /* ------------------------------------------------------------------ */
@@ -266,20 +270,6 @@ static PyObject *extract_qw(PyObject *val, int qwidx) {
     return result;
 }
 
-/* Helper: test bit at position */
-static int test_bit(PyObject *val, int pos) {
-    PyObject *shift = PyLong_FromLong(pos);
-    PyObject *shifted = PyNumber_Rshift(val, shift);
-    PyObject *one = PyLong_FromLong(1);
-    PyObject *result = PyNumber_And(shifted, one);
-    int ret = PyObject_IsTrue(result);
-    Py_DECREF(shift);
-    Py_DECREF(shifted);
-    Py_DECREF(one);
-    Py_DECREF(result);
-    return ret;
-}
-
 /* Helper: check Python int is in [0, mask] */
 static int check_val_range(PyObject *val, PyObject *mask, const char *msg) {
     PyObject *zero = PyLong_FromLong(0);
@@ -339,8 +329,8 @@ CMachine_init(CMachine *self, PyObject *args, PyObject *kwds) {
     self->rfp = py_zero();
     self->lc = py_zero();
     /* rnd has a special default */
-    self->rnd = PyLong_FromString(
-        "9999999999999999999999999999999999999999999999999999999999999999", NULL, 16);
+    Py_INCREF(rnd_reset_value);
+    self->rnd = rnd_reset_value;
     self->acc = py_zero();
 
     /* GPRs */
@@ -916,154 +906,237 @@ CMachine_set_wsr(CMachine *self, PyObject *args) {
 /* ------------------------------------------------------------------ */
 /* Flag operations                                                     */
 /* ------------------------------------------------------------------ */
+/* Resolve a flag identifier to its slot. Accepts an int (the flag's bit in
+ * get_flags_as_bin, as Flag members are numbered) or the flag's name. bool
+ * is an int subclass but never a flag, so True must not resolve to L. */
+static int *flag_slot(CMachine *self, PyObject *flag) {
+    if (PyLong_Check(flag) && !PyBool_Check(flag)) {
+        long bit = PyLong_AsLong(flag);
+        if (bit == -1 && PyErr_Occurred())
+            PyErr_Clear();
+        switch (bit) {
+        case 0: return &self->C;
+        case 1: return &self->L;
+        case 2: return &self->M;
+        case 3: return &self->Z;
+        case 4: return &self->XC;
+        case 5: return &self->XL;
+        case 6: return &self->XM;
+        case 7: return &self->XZ;
+        default: break;
+        }
+    } else if (PyUnicode_Check(flag)) {
+        const char *name = PyUnicode_AsUTF8(flag);
+        if (name == NULL)
+            return NULL;
+        if (strcmp(name, "M") == 0) return &self->M;
+        else if (strcmp(name, "L") == 0) return &self->L;
+        else if (strcmp(name, "Z") == 0) return &self->Z;
+        else if (strcmp(name, "C") == 0) return &self->C;
+        else if (strcmp(name, "XM") == 0) return &self->XM;
+        else if (strcmp(name, "XL") == 0) return &self->XL;
+        else if (strcmp(name, "XZ") == 0) return &self->XZ;
+        else if (strcmp(name, "XC") == 0) return &self->XC;
+    }
+    PyErr_SetString(PyExc_ValueError, "Invalid flag identifier");
+    return NULL;
+}
+
 static PyObject *
 CMachine_get_flag(CMachine *self, PyObject *args) {
-    const char *flag;
-    if (!PyArg_ParseTuple(args, "s", &flag))
+    PyObject *flag;
+    int *slot;
+    if (!PyArg_ParseTuple(args, "O", &flag))
         return NULL;
 
-    int val = 0;
-    if (strcmp(flag, "M") == 0) val = self->M;
-    else if (strcmp(flag, "L") == 0) val = self->L;
-    else if (strcmp(flag, "Z") == 0) val = self->Z;
-    else if (strcmp(flag, "C") == 0) val = self->C;
-    else if (strcmp(flag, "XM") == 0) val = self->XM;
-    else if (strcmp(flag, "XL") == 0) val = self->XL;
-    else if (strcmp(flag, "XZ") == 0) val = self->XZ;
-    else if (strcmp(flag, "XC") == 0) val = self->XC;
-    else {
-        PyErr_SetString(PyExc_ValueError, "Invalid flag identifier");
+    slot = flag_slot(self, flag);
+    if (slot == NULL)
         return NULL;
-    }
-    return PyBool_FromLong(val);
+    return PyBool_FromLong(*slot);
 }
 
 static PyObject *
 CMachine_set_flag(CMachine *self, PyObject *args) {
-    const char *flag;
+    PyObject *flag;
     int val;
-    if (!PyArg_ParseTuple(args, "si", &flag, &val))
+    int *slot;
+    if (!PyArg_ParseTuple(args, "Oi", &flag, &val))
         return NULL;
 
-    val = val ? 1 : 0;
-    if (strcmp(flag, "M") == 0) self->M = val;
-    else if (strcmp(flag, "L") == 0) self->L = val;
-    else if (strcmp(flag, "Z") == 0) self->Z = val;
-    else if (strcmp(flag, "C") == 0) self->C = val;
-    else if (strcmp(flag, "XM") == 0) self->XM = val;
-    else if (strcmp(flag, "XL") == 0) self->XL = val;
-    else if (strcmp(flag, "XZ") == 0) self->XZ = val;
-    else if (strcmp(flag, "XC") == 0) self->XC = val;
-    else {
-        PyErr_SetString(PyExc_ValueError, "Invalid flag identifier");
+    slot = flag_slot(self, flag);
+    if (slot == NULL)
         return NULL;
-    }
+    *slot = val ? 1 : 0;
     Py_RETURN_NONE;
 }
 
+/* Bits 0..XLEN of a result value: the word plus the carry-out bit. */
+#define FLAG_BYTES (XLEN_BYTES + 1)
+
+/* Flags derived from a result value, as the set_*_z_m_l family needs them:
+ * C = bit XLEN, M = bit XLEN - 1, L = bit 0, Z = (val & xlen_mask) == 0. */
+typedef struct {
+    int c;
+    int z;
+    int m;
+    int l;
+} result_flags;
+
+/* Decode the flags of a result value from its low FLAG_BYTES bytes in two's
+ * complement (the bits val & ((1 << (XLEN + 1)) - 1) keeps), so the common
+ * case builds no temporary ints. */
+static int decode_result_flags(PyObject *val, result_flags *out) {
+    uint8_t raw[FLAG_BYTES];
+    uint8_t any = 0;
+    int idx;
+
+    if (!PyLong_Check(val)) {
+        PyErr_SetString(PyExc_TypeError, "flag source value must be an int");
+        return -1;
+    }
+#if PY_VERSION_HEX >= 0x030D0000
+    /* Wider values are truncated to their low bytes, which is all we need. */
+    if (PyLong_AsNativeBytes(val, raw, FLAG_BYTES,
+                             Py_ASNATIVEBYTES_LITTLE_ENDIAN) < 0)
+        return -1;
+#else
+    if (_PyLong_AsByteArray((PyLongObject *)val, raw, FLAG_BYTES, 1, 1) < 0) {
+        PyObject *mask;
+        PyObject *low;
+        int rc;
+
+        if (!PyErr_ExceptionMatches(PyExc_OverflowError))
+            return -1;
+        PyErr_Clear();
+        mask = make_mask(FLAG_BYTES * 8);
+        if (mask == NULL)
+            return -1;
+        low = PyNumber_And(val, mask);
+        Py_DECREF(mask);
+        if (low == NULL)
+            return -1;
+        rc = _PyLong_AsByteArray((PyLongObject *)low, raw, FLAG_BYTES, 1, 0);
+        Py_DECREF(low);
+        if (rc < 0)
+            return -1;
+    }
+#endif
+
+    for (idx = 0; idx < XLEN_BYTES; ++idx)
+        any |= raw[idx];
+    out->c = raw[XLEN_BYTES] & 1;
+    out->z = any == 0;
+    out->m = raw[XLEN_BYTES - 1] >> 7;
+    out->l = raw[0] & 1;
+    return 0;
+}
+
 /* set_c_z_m_l(val) - set C, Z, M, L from 257-bit value */
 static PyObject *
 CMachine_set_c_z_m_l(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-
-    /* C = bit 256, M = bit 255, L = bit 0, Z = (val & xlen_mask) == 0 */
-    self->C = test_bit(val, XLEN);
-    self->M = test_bit(val, XLEN - 1);
-    self->L = test_bit(val, 0);
-    PyObject *masked = PyNumber_And(val, self->xlen_mask);
-    PyObject *zero = PyLong_FromLong(0);
-    self->Z = PyObject_RichCompareBool(masked, zero, Py_EQ);
-    Py_DECREF(masked);
-    Py_DECREF(zero);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->C = f.c;
+    self->Z = f.z;
+    self->M = f.m;
+    self->L = f.l;
     Py_RETURN_NONE;
 }
 
 static PyObject *
 CMachine_setx_c_z_m_l(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-
-    self->XC = test_bit(val, XLEN);
-    self->XM = test_bit(val, XLEN - 1);
-    self->XL = test_bit(val, 0);
-    PyObject *masked = PyNumber_And(val, self->xlen_mask);
-    PyObject *zero = PyLong_FromLong(0);
-    self->XZ = PyObject_RichCompareBool(masked, zero, Py_EQ);
-    Py_DECREF(masked);
-    Py_DECREF(zero);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->XC = f.c;
+    self->XZ = f.z;
+    self->XM = f.m;
+    self->XL = f.l;
     Py_RETURN_NONE;
 }
 
 static PyObject *
 CMachine_set_z_m_l(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-
-    PyObject *masked = PyNumber_And(val, self->xlen_mask);
-    PyObject *zero = PyLong_FromLong(0);
-    self->Z = PyObject_RichCompareBool(masked, zero, Py_EQ);
-    Py_DECREF(masked);
-    Py_DECREF(zero);
-    self->M = test_bit(val, XLEN - 1);
-    self->L = test_bit(val, 0);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->Z = f.z;
+    self->M = f.m;
+    self->L = f.l;
     Py_RETURN_NONE;
 }
 
 static PyObject *
 CMachine_setx_z_m_l(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-
-    PyObject *masked = PyNumber_And(val, self->xlen_mask);
-    PyObject *zero = PyLong_FromLong(0);
-    self->XZ = PyObject_RichCompareBool(masked, zero, Py_EQ);
-    Py_DECREF(masked);
-    Py_DECREF(zero);
-    self->XM = test_bit(val, XLEN - 1);
-    self->XL = test_bit(val, 0);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->XZ = f.z;
+    self->XM = f.m;
+    self->XL = f.l;
     Py_RETURN_NONE;
 }
 
 static PyObject *
 CMachine_set_c_m(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-    self->C = test_bit(val, XLEN);
-    self->M = test_bit(val, XLEN - 1);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->C = f.c;
+    self->M = f.m;
     Py_RETURN_NONE;
 }
 
 static PyObject *
 CMachine_setx_c_m(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-    self->XC = test_bit(val, XLEN);
-    self->XM = test_bit(val, XLEN - 1);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->XC = f.c;
+    self->XM = f.m;
     Py_RETURN_NONE;
 }
 
 static PyObject *
 CMachine_set_l(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-    self->L = test_bit(val, 0);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->L = f.l;
     Py_RETURN_NONE;
 }
 
 static PyObject *
 CMachine_setx_l(CMachine *self, PyObject *args) {
     PyObject *val;
+    result_flags f;
     if (!PyArg_ParseTuple(args, "O", &val))
         return NULL;
-    self->XL = test_bit(val, 0);
+    if (decode_result_flags(val, &f) < 0)
+        return NULL;
+    self->XL = f.l;
     Py_RETURN_NONE;
 }
 
@@ -1168,6 +1241,29 @@ CMachine_get_dmem(CMachine *self, PyObject *args) {
     return val;
 }
 
+static PyObject *
+CMachine_get_dmem_range(CMachine *self, PyObject *args) {
+    long address;
+    long count;
+    if (!PyArg_ParseTuple(args, "ll", &address, &count))
+        return NULL;
+    if (count < 0 || address < 0 || address + count > DMEM_DEPTH) {
+        PyErr_SetString(PyExc_IndexError, "DMEM address out of range");
+        return NULL;
+    }
+
+    for (long i = address; i < address + count; i++) {
+        PyObject *init = PyList_GetItem(self->init_dmem, i);
+        if (init == NULL)
+            return NULL;
+        if (init == Py_False) {
+            PySys_WriteStderr("Warning: reading from uninitialized dmem memory address: 0x%lx\n", i);
+        }
+    }
+
+    return PyList_GetSlice(self->dmem, address, address + count);
+}
+
 static PyObject *
 CMachine_set_dmem(CMachine *self, PyObject *args) {
     long address;
@@ -1353,8 +1449,8 @@ CMachine_clear_regs(CMachine *self, PyObject *Py_UNUSED(args)) {
     Py_DECREF(self->rfp); self->rfp = py_zero();
     Py_DECREF(self->lc);  self->lc = py_zero();
     Py_DECREF(self->rnd);
-    self->rnd = PyLong_FromString(
-        "9999999999999999999999999999999999999999999999999999999999999999", NULL, 16);
+    Py_INCREF(rnd_reset_value);
+    self->rnd = rnd_reset_value;
     Py_DECREF(self->acc); self->acc = py_zero();
     self->pc = 0;
     memset(self->gpr, 0, sizeof(self->gpr));
@@ -2067,6 +2163,7 @@ static PyMethodDef CMachine_methods[] = {
     {"set_pc", (PyCFunction)CMachine_set_pc, METH_VARARGS, NULL},
     {"inc_pc", (PyCFunction)CMachine_inc_pc, METH_NOARGS, NULL},
     {"get_dmem", (PyCFunction)CMachine_get_dmem, METH_VARARGS, NULL},
+    {"get_dmem_range", (PyCFunction)CMachine_get_dmem_range, METH_VARARGS, NULL},
     {"set_dmem", (PyCFunction)CMachine_set_dmem, METH_VARARGS, NULL},
     {"get_dmem_otbn", (PyCFunction)CMachine_get_dmem_otbn, METH_VARARGS, NULL},
     {"set_dmem_otbn", (PyCFunction)CMachine_set_dmem_otbn, METH_VARARGS, NULL},
@@ -2203,6 +2300,15 @@ PyMODINIT_FUNC PyInit__machine(void) {
     if (PyType_Ready(&CMachineType) < 0)
         return NULL;
 
+    if (rnd_reset_value == NULL) {
+        rnd_reset_value = PyLong_FromString(
+            "9999999999999999999999999999999999999999999999999999999999999999", NULL, 16);
+        if (rnd_reset_value == NULL) {
+            Py_DECREF(m);
+            return NULL;
+        }
+    }
+
     Py_INCREF(&CMachineType);
     if (PyModule_AddObject(m, "CMachine", (PyObject *)&CMachineType) < 0) {
         Py_DECREF(&CMachineType);
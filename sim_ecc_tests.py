@@ -100,51 +100,28 @@ stats = init_stats()
 
 
 # Helper functions
-def bit_len(int_type):
-    """Helper function returning the number of bits required to binary encode an integer."""
-    length = 0
-    while int_type:
-        int_type >>= 1
-        length += 1
-    return length
-
-
 def test_bit(int_type, offset):
     """Helper function indicationg if a specific bit in the bin representation of an int is set."""
     mask = 1 << offset
     return bool(int_type & mask)
 
 
-def egcd(a, b):
-    """Helper function to run the extended euclidian algorithm"""
-    if a == 0:
-        return b, 0, 1
-    g, y, x = egcd(b % a, a)
-    return g, x - (b // a) * y, y
-
-
 def mod_inv(val, mod):
     """Helper function to compute a modular inverse"""
-    g, x, _ = egcd(val, mod)
-    if g != 1:
-        raise Exception("modular inverse does not exist")
-    return x % mod
+    try:
+        return pow(val, -1, mod)
+    except ValueError:
+        raise Exception("modular inverse does not exist") from None
 
 
 def get_msg_val(msg):
     """Helper function to return a ascii encoded bignum value for a string"""
-    msg_hex_str = "".join(format(ord(x), "02x") for x in msg)
-    msg_val = int(msg_hex_str, 16)
-    return msg_val
+    return int.from_bytes(msg.encode("latin-1"), "big")
 
 
 def get_msg_str(val):
     """Helper function to return a string for an ascii bignum value"""
-    hex_str = hex(val)
-    ret = ""
-    for i in range(2, len(hex_str), 2):
-        ret += chr(int(hex_str[i : i + 2], 16))
-    return ret
+    return val.to_bytes((val.bit_length() + 7) // 8, "big").decode("latin-1")
 
 
 # DMEM manipulation
@@ -9,7 +9,15 @@ the generic bignum library. Hence these are wrappers around mainly modexp and
 montmul operations.
 """
 
-from ot_dsim.bignum_lib.machine import Machine
+import multiprocessing
+import os
+from functools import lru_cache
+
+from ot_dsim.bignum_lib.machine import (
+    FAST_MONTMUL,
+    Machine,
+    install_mont_mul_fast_path,
+)
 from ot_dsim.bignum_lib.sim_helpers import *
 
 from Crypto.PublicKey import RSA
@@ -17,6 +25,11 @@ from Crypto.PublicKey import RSA
 # Switch to True to get a full instruction trace
 ENABLE_TRACE_DUMP = False
 
+# Switch to True to decrypt with the modexp routine of the library instead of
+# modexp_window. Only that routine calls sqrx_exp, so OT_DSIM_FAST_MONTMUL
+# does not change decryption unless this is set.
+USE_ASM_MODEXP = False
+
 # Configuration for the statistics prints
 STATS_CONFIG = {
     "instruction_histo_sort_by": "key",
@@ -26,12 +39,15 @@ DMEM_BYTE_ADDRESSING = True
 BN_WORD_LEN = 256
 BN_LIMB_LEN = 32
 BN_MASK = 2**BN_WORD_LEN - 1
+BN_WORD_BYTES = BN_WORD_LEN // 8
 BN_LIMB_MASK = 2**BN_LIMB_LEN - 1
 BN_MAX_WORDS = 16  # Max number of bn words per val (for 4096 bit words)
-DMEM_DEPTH = 1024
-PROGRAM_HEX_FILE = "hex/dcrypto_bn.hex"
-PROGRAM_ASM_FILE = "asm/dcrypto_bn.asm"
-PROGRAM_OTBN_ASM_FILE = "asm/modexp.S"
+DMEM_DEPTH = Machine.DMEM_DEPTH  # 256 bit words
+# program sources, relative to this script rather than the working directory
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROGRAM_HEX_FILE = os.path.join(_SCRIPT_DIR, "hex", "dcrypto_bn.hex")
+PROGRAM_ASM_FILE = os.path.join(_SCRIPT_DIR, "asm", "dcrypto_bn.asm")
+PROGRAM_OTBN_ASM_FILE = os.path.join(_SCRIPT_DIR, "asm", "modexp.S")
 
 # pointers to dmem areas according to calling conventions for bignum lib
 dmem_mult = 32 if DMEM_BYTE_ADDRESSING else 1
@@ -50,6 +66,10 @@ DMEM_LOC_SQR_PTRS = 1
 DMEM_LOC_MUL_PTRS = 2
 DMEM_LOC_OUT_PTRS = 3
 
+# dmem word ranges [first, last) that modexp_window may fill with its table:
+# the blinding areas and the tail of dmem, plus the exponent area (unused there)
+DMEM_WINDOW_TBL_AREAS = ((87, DMEM_DEPTH), (54, 71))
+
 # RSA private keys
 RSA_D = {}
 # noinspection LongLine
@@ -88,6 +108,42 @@ RSA_N[3072] = (
     0xDA7B57497C76318A1B0E4EB6DC59584918FDED8D11E48869DB8471C8FBA5C5FC4388602C7DAD25D74FD55314988CA03F5BB0233BB5FCB6538EEEB1E9144E46A3900289E2042BBB0B37FC3026B10CCCBB9DBBFEC4C30EED248C39F35F55CA95D3075621F42EF7072D80DE32597048F21869F77898057AEACA5FA54B21A93DE8A5C1FB5E60DEA0CC1DB872A217D09A58F21F3D4E3C76A8CBEE5B8B7C6A683024C1402A13A3C5F175F63C1D15E8958CD10965E06C7CF21F8EDCEE55861DA81E7220842E168CB1180C95AF0DF9CDA50818E5519B50CDACF23A1D63571245975DBEC04FA511278F069CC0D3D8E471241BF13939C9D0034860B536D29A3162D9EC5D684AC20EAD2CD4F46C49522323A8D3650D63796A76B6B07B4B7BDD98922B7AF54F5C67E51AAF5D84D4A2A3A104C0FA7F343F468F27F93C74FCE64F86BEE7CA6DE90A2F3CB2D696E68C9C044FEF54D54F3A15CEDB2E8B54F90F3B3426CAB25C9F8F08AC0496B5026F8B2F6470837DA95855DDF20215E6010F3E48CAA441EE813625
 )
 
+# RSA prime factors, RSA_N = RSA_P * RSA_Q
+RSA_P = {}
+# noinspection LongLine
+RSA_P[768] = (
+    0xD60964C8F35C02C7C6474E7F439D31467A3385A0A416EA227BCD649B50ECA72F7ECFEB6929348EB7B5B3BA7F9B017D69  # pylint: disable=line-too-long
+)
+# noinspection LongLine
+RSA_P[1024] = (
+    0xF95E796543704083500ABB61B3877B248F2A035BB54B949467AA98D61440903CA40D6D5831C542F12D150EE7CDE63ECAD89437AA4CD6F3212EA4FE1D7944D7B3  # pylint: disable=line-too-long
+)
+# noinspection LongLine
+RSA_P[2048] = (
+    0xC8806FF62FFB498B7739E23D3D1F4DF9BB54060D71BF54B11EA2207EDDCF2116E9C0BA9402D2A42E783CFB64A0E7E92764291974C577BBE16DB4831D435A8072EC3C32C3202CCEF7BAF6C60CF456FDDF2155F3E25625A6B396A49CB8FD9CEC87FADA2EA4F60F14E6812284E7C01DD13FEDB0BAD8E4E9D41833AE29517979D10F  # pylint: disable=line-too-long
+)
+# noinspection LongLine
+RSA_P[3072] = (
+    0xF799A9BA4DDC9FE3B02AA730F751DFAA350D94B455EE2809C6788316F46DA3FC07977B70B95B6CE24A533D2057EF76F0681A806BDD5E46A1C39D204A40DE2550CD1FEE55F645DAD9ABAE6402BF1D041A26EED02FB1BEE3F5BF65BE1C98B3F79220A2391C49CCCEAE8F8F71E11EB624A58B75E42AC5D0E0B2E5AA652561F9FA3C10A8E07042D0A660F0484B6BE94772806AAECEEC4B80F1C4B7E4A04568804510BE6E075843956F37A545ECBFF8570885A470BEE5301CF7A7E77A0EA4AB7D6F51  # pylint: disable=line-too-long
+)
+RSA_Q = {}
+# noinspection LongLine
+RSA_Q[768] = (
+    0xD388922DD5C629F4F02E61F060ADA94611A90C69143109368B701B119B26393434FDF19A8951630AC6600BBA188EC801  # pylint: disable=line-too-long
+)
+# noinspection LongLine
+RSA_Q[1024] = (
+    0xE53ECD4B97C5963970973A10A9C3350AD62BF5128DB2C00B1C5FA00B8683A790E9F816929FCE134C14E89E4C24EFFF582206F9CFFD19B723F9E3B3E37A9BB0AB  # pylint: disable=line-too-long
+)
+# noinspection LongLine
+RSA_Q[2048] = (
+    0xC8412A42F16A81AC06ABD0B7C0BBC613DDFD5E3C77FEC12E76F094C05D248B300DF82AC726781B815A4296ADF70EA41B2C8F3806058D986E3765B42C80E238D579D2EA62F232AC7B8890C34E9E53E57EEF13B1E3D541D1A915043C61745E1A005C8A8B17D578AD5EE0CF35630A951E70BE97F2D378068A889B27C8B2B13D8AD7  # pylint: disable=line-too-long
+)
+# noinspection LongLine
+RSA_Q[3072] = (
+    0xE1E4CAEA01C6B6413969BD1E8548D457E54E292FD0DDEBE0FD7022BA9378AFD73ADD8A72EF3EA5DD6D881A64C9A894FFFB4AB5AB2C2EB2860A2B89ACA97421EF62514F118137EC373389502F5553C5A3DECFF244710BE4692842CBD0B6DF23B0D412FD6E23653E2E9F73722F5050BDB783CBD75D99831B109ED1E38034B30A733E1C0246FBA271112400B910661BBBCEE8BFBC1F9689484F10E439BA3E2456D0A45CC2394E19EDA1753645DBAF3667129C6AD585AC2DD9B5BB8A058E7125AC95  # pylint: disable=line-too-long
+)
+
 # RSA public exponent
 EXP_PUB = 65537
 
@@ -99,98 +155,88 @@ stats = init_stats()
 
 
 # Helper functions
-def bit_len(int_type):
-    """Helper function returning the number of bits required to binary encode an integer."""
-    length = 0
-    while int_type:
-        int_type >>= 1
-        length += 1
-    return length
-
-
-def test_bit(int_type, offset):
-    """Helper function indicationg if a specific bit in the bin representation of an int is set."""
-    mask = 1 << offset
-    return bool(int_type & mask)
-
-
-def egcd(a, b):
-    """Helper function to run the extended euclidian algorithm"""
-    if a == 0:
-        return b, 0, 1
-    g, y, x = egcd(b % a, a)
-    return g, x - (b // a) * y, y
-
-
 def mod_inv(val, mod):
     """Helper function to compute a modular inverse"""
-    g, x, _ = egcd(val, mod)
-    if g != 1:
-        raise Exception("modular inverse does not exist")
-    return x % mod
+    try:
+        return pow(val, -1, mod)
+    except ValueError:
+        raise Exception("modular inverse does not exist") from None
 
 
 def get_msg_val(msg):
     """Helper function to return a ascii encoded bignum value for a string"""
-    msg_hex_str = "".join(format(ord(x), "02x") for x in msg)
-    msg_val = int(msg_hex_str, 16)
-    return msg_val
+    return int.from_bytes(msg.encode("latin-1"), "big")
 
 
 def get_msg_str(val):
     """Helper function to return a string for an ascii bignum value"""
-    hex_str = hex(val)
-    ret = ""
-    for i in range(2, len(hex_str), 2):
-        ret += chr(int(hex_str[i : i + 2], 16))
-    return ret
+    return val.to_bytes((val.bit_length() + 7) // 8, "big").decode("latin-1")
 
 
 # DMEM manipulation
 def init_dmem():
-    global dmem
     """Create the simulator side of dmem and init with zeros."""
-    dmem = [0] * DMEM_DEPTH
+    dmem[:] = [0] * DMEM_DEPTH
+
+
+@lru_cache(maxsize=64)
+def _pack_pointer(bn_words, p_a, p_b, p_c):
+    """Helper function returning the packed pointer word for load_pointer"""
+    return (
+        DMEMP_MOD
+        | DMEMP_DINV << BN_LIMB_LEN * 1
+        | DMEMP_RR << BN_LIMB_LEN * 2
+        | p_a << BN_LIMB_LEN * 3
+        | p_b << BN_LIMB_LEN * 4
+        | p_c << BN_LIMB_LEN * 5
+        | bn_words << BN_LIMB_LEN * 6
+        | (bn_words - 1) << BN_LIMB_LEN * 7
+    )
 
 
 def load_pointer(bn_words, p_loc, p_a, p_b, p_c):
     """Load pointers into 1st dmem word according to calling conventions"""
-    pval = DMEMP_MOD
-    pval += DMEMP_DINV << BN_LIMB_LEN * 1
-    pval += DMEMP_RR << BN_LIMB_LEN * 2
-    pval += p_a << BN_LIMB_LEN * 3
-    pval += p_b << BN_LIMB_LEN * 4
-    pval += p_c << BN_LIMB_LEN * 5
-    pval += bn_words << BN_LIMB_LEN * 6
-    pval += (bn_words - 1) << BN_LIMB_LEN * 7
-    dmem[p_loc] = pval
+    dmem[p_loc] = _pack_pointer(bn_words, p_a, p_b, p_c)
+
+
+@lru_cache(maxsize=64)
+def _pack_blinding(pubexp, rnd, pad1, pad2):
+    """Helper function returning the packed blinding word for load_blinding"""
+    return (
+        (pubexp & BN_LIMB_MASK)
+        | (pad1 & (2 ** (BN_LIMB_LEN * 3) - 1)) << BN_LIMB_LEN * 1
+        | (rnd & (2 ** (BN_LIMB_LEN * 2) - 1)) << BN_LIMB_LEN * 4
+        | (pad2 & (2 ** (BN_LIMB_LEN * 2) - 1)) << BN_LIMB_LEN * 6
+    )
 
 
 def load_blinding(pubexp, rnd, pad1, pad2):
     """Load pointers into 1st dmem word according to calling conventions"""
-    bval = pubexp
-    bval += (pad1 & BN_LIMB_MASK) << BN_LIMB_LEN * 1
-    bval += ((pad1 >> BN_LIMB_LEN) & BN_LIMB_MASK) << BN_LIMB_LEN * 2
-    bval += ((pad1 >> BN_LIMB_LEN * 2) & BN_LIMB_MASK) << BN_LIMB_LEN * 3
-    bval += (rnd & BN_LIMB_MASK) << BN_LIMB_LEN * 4
-    bval += ((rnd >> BN_LIMB_LEN) & BN_LIMB_MASK) << BN_LIMB_LEN * 5
-    bval += (pad2 & BN_LIMB_MASK) << BN_LIMB_LEN * 6
-    bval += ((pad2 >> BN_LIMB_LEN) & BN_LIMB_MASK) << BN_LIMB_LEN * 7
-    dmem[DMEMP_BLINDING] = bval
+    dmem[DMEMP_BLINDING] = _pack_blinding(pubexp, rnd, pad1, pad2)
 
 
 def load_full_bn_val(dmem_p, bn_val):
     """Load a full multi-word bignum value into dmem"""
+    buf = bn_val.to_bytes(BN_MAX_WORDS * BN_WORD_BYTES, "little")
+    base = dmem_p // dmem_mult
     for i in range(0, BN_MAX_WORDS):
-        dmem[dmem_p // dmem_mult + i] = (bn_val >> (BN_WORD_LEN * i)) & BN_MASK
+        dmem[base + i] = int.from_bytes(
+            buf[i * BN_WORD_BYTES : (i + 1) * BN_WORD_BYTES], "little"
+        )
 
 
 def get_full_bn_val(dmem_p, machine, bn_words=BN_MAX_WORDS):
     """Get a full multi-word bignum value form dmem"""
-    bn_val = 0
-    for i in range(0, bn_words):
-        bn_val += machine.get_dmem(i + dmem_p // dmem_mult) << (BN_WORD_LEN * i)
-    return bn_val
+    words = machine.get_dmem_range(dmem_p // dmem_mult, bn_words)
+    buf = b"".join(w.to_bytes(BN_WORD_BYTES, "little") for w in words)
+    return int.from_bytes(buf, "little")
+
+
+def copy_full_bn_val(src_p, dst_p):
+    """Copy a full multi-word bignum value between dmem locations"""
+    src = src_p // dmem_mult
+    dst = dst_p // dmem_mult
+    dmem[dst : dst + BN_MAX_WORDS] = dmem[src : src + BN_MAX_WORDS]
 
 
 def load_mod(mod):
@@ -272,6 +318,8 @@ def load_program_otbn_asm():
         insfile, dmem_byte_addressing=DMEM_BYTE_ADDRESSING, otbn_only=True
     )
     insfile.close()
+    if FAST_MONTMUL:
+        ins_objects = install_mont_mul_fast_path(ins_objects, ctx)
 
     # reverse label address dictionary for function addresses (OTBN asm does not differentiate between generic
     # und function labels)
@@ -285,50 +333,59 @@ def load_program_otbn_asm():
     }
     stop_addr_dict = {
         "modload": len(ins_objects) - 1,
-        "mulx": function_addr["mm1_sub_cx"] - 1,
+        "mulx": function_addr["mm1_sub_cx"] - 2,
         "mul1": function_addr["sqrx_exp"] - 1,
         "modexp": function_addr["modexp_65537"] - 1,
         "modexp_65537": function_addr["modload"] - 1,
     }
 
 
-def dump_trace_str(trace_string):
-    if ENABLE_TRACE_DUMP:
-        print(trace_string)
-
-
 # primitive access
-def run_modload(bn_words):
-    """Runs the modload primitive (modload).
+def _run_primitive(name):
+    """Runs a primitive on a fresh machine until it reaches its stop address.
 
-    Other than it's name suggests this primitive computes RR and the
-    montgomery inverse dinv. The modulus is actually directly loaded into dmem
-    beforehand. This primitive has to be executed every time, dmem was cleared.
+    Every primitive starts from cleared registers, flags and stacks, so no
+    state carries over from the previous one. dmem is copied into the machine
+    and its content copied back into the module's dmem list afterwards.
     """
-    global dmem
     global inst_cnt
     global cycle_cnt
-    global stats
-    global ctx
-
-    load_pointer(bn_words, DMEM_LOC_IN_PTRS, DMEMP_IN, DMEMP_EXP, DMEMP_OUT)
-    # breakpoints.append(start_addr_dict['modload'])
     machine = Machine(
-        dmem.copy(),
+        dmem,
         ins_objects,
-        start_addr_dict["modload"],
-        stop_addr_dict["modload"],
+        start_addr_dict[name],
+        stop_addr_dict[name],
         ctx=ctx,
         breakpoints=breakpoints,
     )
     machine.stats = stats
+    step = machine.step
+    trace = ENABLE_TRACE_DUMP
+    insts = 0
+    total_cycles = 0
     cont = True
     while cont:
-        cont, trace_str, cycles = machine.step()
-        dump_trace_str(trace_str)
-        inst_cnt += 1
-        cycle_cnt += cycles
-    dmem = machine.dmem.copy()
+        cont, trace_str, cycles = step()
+        if trace:
+            print(trace_str)
+        insts += 1
+        total_cycles += cycles
+    inst_cnt += insts
+    cycle_cnt += total_cycles
+    dmem[:] = machine.dmem
+    return machine
+
+
+def run_modload(bn_words):
+    """Runs the modload primitive (modload).
+
+    Other than it's name suggests this primitive computes RR and the
+    montgomery inverse dinv. The modulus is actually directly loaded into dmem
+    beforehand. This primitive has to be executed every time, dmem was cleared.
+    """
+    load_pointer(bn_words, DMEM_LOC_IN_PTRS, DMEMP_IN, DMEMP_EXP, DMEMP_OUT)
+    # breakpoints.append(start_addr_dict['modload'])
+    machine = _run_primitive("modload")
     dinv_res = dmem[DMEMP_DINV // dmem_mult]
     rr_res = get_full_bn_val(DMEMP_RR, machine, bn_words)
     return dinv_res, rr_res
@@ -336,134 +393,61 @@ def run_modload(bn_words):
 
 def run_montmul(bn_words, p_a, p_b, p_out):
     """Runs the primitive for montgomery multiplication (mulx)"""
-    global dmem
-    global inst_cnt
-    global cycle_cnt
-    global stats
-    global ctx
-    global breakpoints
     load_pointer(bn_words, DMEM_LOC_IN_PTRS, p_a, p_b, p_out)
-    machine = Machine(
-        dmem.copy(),
-        ins_objects,
-        start_addr_dict["mulx"],
-        stop_addr_dict["mulx"],
-        ctx=ctx,
-        breakpoints=breakpoints,
-    )
-    machine.stats = stats
-    cont = True
-    i = 0
-    while cont:
-        cont, trace_str, cycles = machine.step()
-        i += 1
-        dump_trace_str(trace_str)
-        inst_cnt += 1
-        cycle_cnt += cycles
-    res = get_full_bn_val(DMEMP_OUT, machine, bn_words)
-    dmem = machine.dmem.copy()
+    machine = _run_primitive("mulx")
+    res = get_full_bn_val(p_out, machine, bn_words)
     return res
 
 
 def run_montout(bn_words, p_a, p_out):
     """Runs the primitive for back-transformation from the montgomery domain (mul1)"""
-    global dmem
-    global inst_cnt
-    global cycle_cnt
-    global stats
-    global ctx
     load_pointer(bn_words, DMEM_LOC_IN_PTRS, p_a, 0, p_out)
-    machine = Machine(
-        dmem.copy(),
-        ins_objects,
-        start_addr_dict["mul1"],
-        stop_addr_dict["mul1"],
-        ctx=ctx,
-        breakpoints=breakpoints,
-    )
-    machine.stats = stats
-    cont = True
-    while cont:
-        cont, trace_str, cycles = machine.step()
-        dump_trace_str(trace_str)
-        inst_cnt += 1
-        cycle_cnt += cycles
-    res = get_full_bn_val(DMEMP_OUT, machine, bn_words)
-    dmem = machine.dmem.copy()
+    machine = _run_primitive("mul1")
+    res = get_full_bn_val(p_out, machine, bn_words)
     return res
 
 
 def run_modexp(bn_words, exp):
     """Runs the primitive for modular exponentiation (modexp)"""
-    global dmem
-    global inst_cnt
-    global cycle_cnt
-    global stats
-    global ctx
     load_full_bn_val(DMEMP_EXP, exp)
     load_pointer(bn_words, DMEM_LOC_IN_PTRS, DMEMP_IN, DMEMP_RR, DMEMP_IN)
     load_pointer(bn_words, DMEM_LOC_SQR_PTRS, DMEMP_OUT, DMEMP_OUT, DMEMP_OUT)
     load_pointer(bn_words, DMEM_LOC_MUL_PTRS, DMEMP_IN, DMEMP_OUT, DMEMP_OUT)
     load_pointer(bn_words, DMEM_LOC_OUT_PTRS, DMEMP_OUT, DMEMP_EXP, DMEMP_OUT)
-    machine = Machine(
-        dmem.copy(),
-        ins_objects,
-        start_addr_dict["modexp"],
-        stop_addr_dict["modexp"],
-        ctx=ctx,
-    )
-    machine.stats = stats
-    cont = True
-    while cont:
-        cont, trace_str, cycles = machine.step()
-        dump_trace_str(trace_str)
-        inst_cnt += 1
-        cycle_cnt += cycles
+    machine = _run_primitive("modexp")
     res = get_full_bn_val(DMEMP_OUT, machine, bn_words)
-    dmem = machine.dmem.copy()
     return res
 
 
 def run_modexp_65537(bn_words, inval):
-    """Runs modular exponentiation for e=65537 using the generic modexp primitive.
+    """Runs modular exponentiation for e=65537 based on the montmul primitive.
 
-    Uses the generic modexp routine which scans all exponent bits. A specialized
-    modexp_65537 assembly routine exists but has a known subtle bug with flag state
-    propagation between squaring iterations when called in a tight loop. Using the
-    generic routine is slower (~84x for 768-bit) but produces correct results.
+    Since 65537 = 2^16 + 1, the result is inval * inval^(2^16). After
+    transforming inval into the montgomery domain this takes 16 squarings and
+    a single multiplication, followed by the back-transformation.
+    The specialized modexp_65537 assembly routine is not used, as it has a
+    known bug with flag state propagation between squaring iterations.
     """
-    return run_modexp(bn_words, 65537)
+    load_full_bn_val(DMEMP_IN, inval)
+    run_montmul(bn_words, DMEMP_IN, DMEMP_RR, DMEMP_IN)
+    copy_full_bn_val(DMEMP_IN, DMEMP_OUT)
+    for _ in range(16):
+        run_montmul(bn_words, DMEMP_OUT, DMEMP_OUT, DMEMP_OUT)
+    run_montmul(bn_words, DMEMP_IN, DMEMP_OUT, DMEMP_OUT)
+    res = run_montout(bn_words, DMEMP_OUT, DMEMP_OUT)
+    return res
 
 
 def run_modexp_blinded(bn_words, exp):
     """Runs the primitive for modular exponentiation (modexp)"""
-    global dmem
-    global inst_cnt
-    global cycle_cnt
-    global stats
-    global ctx
     load_full_bn_val(DMEMP_EXP, exp)
     load_pointer(bn_words, DMEM_LOC_IN_PTRS, DMEMP_IN, DMEMP_RR, DMEMP_IN)
     load_pointer(bn_words, DMEM_LOC_SQR_PTRS, DMEMP_OUT, DMEMP_OUT, DMEMP_OUT)
     load_pointer(bn_words, DMEM_LOC_MUL_PTRS, DMEMP_IN, DMEMP_OUT, DMEMP_OUT)
     load_pointer(bn_words, DMEM_LOC_OUT_PTRS, DMEMP_OUT, DMEMP_EXP, DMEMP_OUT)
     load_blinding(EXP_PUB, 0, 0, 0)
-    machine = Machine(
-        dmem.copy(),
-        ins_objects,
-        start_addr_dict["modexp_blinded"],
-        stop_addr_dict["modexp_blinded"],
-        ctx=ctx,
-    )
-    machine.stats = stats
-    cont = True
-    while cont:
-        cont, trace_str, cycles = machine.step()
-        dump_trace_str(trace_str)
-        inst_cnt += 1
-        cycle_cnt += cycles
+    machine = _run_primitive("modexp_blinded")
     res = get_full_bn_val(DMEMP_OUT, machine, bn_words)
-    dmem = machine.dmem.copy()
     return res
 
 
@@ -474,42 +458,95 @@ def modexp_word(bn_words, inval, exp):
     Performs a full modular exponentiation with a "small" exponent fitting into a single bignum
     word.
     After calculating constants (RR and dinv) the primitive for montgomery multiplication is wrapped
-    with a standard square-and-multiply algorithm.
+    with a left-to-right square-and-multiply algorithm, using the montgomery form of inval in IN
+    as the constant multiplicand.
     Finally performs back-transformation from montgomery domain with the mul1 primitive
     """
     load_full_bn_val(DMEMP_IN, inval)
-    run_montmul(bn_words, DMEMP_IN, DMEMP_RR, DMEMP_OUT)
     run_montmul(bn_words, DMEMP_IN, DMEMP_RR, DMEMP_IN)
-    exp_bits = bit_len(exp)
-    for i in range(exp_bits - 2, -1, -1):
+    copy_full_bn_val(DMEMP_IN, DMEMP_OUT)
+    # scan the exponent below its MSB from a single binary string conversion
+    for bit in format(exp, "b")[1:]:
         run_montmul(bn_words, DMEMP_OUT, DMEMP_OUT, DMEMP_OUT)
-        if test_bit(exp, i):
+        if bit == "1":
             run_montmul(bn_words, DMEMP_IN, DMEMP_OUT, DMEMP_OUT)
     res = run_montout(bn_words, DMEMP_OUT, DMEMP_OUT)
     return res
 
 
+def modexp_window(bn_words, inval, exp, k=5):
+    """Performs a full modular exponentiation using fixed-window exponentiation.
+
+    Precomputes inval^1 .. inval^(2^k-1) in the montgomery domain, then scans
+    the exponent from the MSB in k-bit windows, doing k squarings and at most
+    one multiplication per window. This needs about 1/k as many
+    multiplications as square-and-multiply.
+    The table lives in dmem: inval^1 stays in IN, the other entries are packed
+    into DMEM_WINDOW_TBL_AREAS, and every multiplication points straight at
+    its entry. k is lowered to the largest window size whose table fits.
+    """
+    if exp == 0:
+        # there are no windows to scan; moduli have their MSB set, so 1 < mod
+        return 1
+    slots = [
+        word * dmem_mult
+        for first, last in DMEM_WINDOW_TBL_AREAS
+        for word in range(first, last - bn_words + 1, bn_words)
+    ]
+    while k > 1 and 2**k - 2 > len(slots):
+        k -= 1
+    load_full_bn_val(DMEMP_IN, inval)
+    run_montmul(bn_words, DMEMP_IN, DMEMP_RR, DMEMP_IN)
+    tbl = [None, DMEMP_IN] + slots[: 2**k - 2]
+    for i in range(2, 2**k):
+        run_montmul(bn_words, tbl[i - 1], DMEMP_IN, tbl[i])
+    n_windows = -(-exp.bit_length() // k)
+    wmask = 2**k - 1
+    top = tbl[(exp >> (n_windows - 1) * k) & wmask] // dmem_mult
+    out = DMEMP_OUT // dmem_mult
+    dmem[out : out + BN_MAX_WORDS] = dmem[top : top + bn_words] + [0] * (
+        BN_MAX_WORDS - bn_words
+    )
+    for i in range(n_windows - 2, -1, -1):
+        for _ in range(k):
+            run_montmul(bn_words, DMEMP_OUT, DMEMP_OUT, DMEMP_OUT)
+        window = (exp >> i * k) & wmask
+        if window:
+            run_montmul(bn_words, tbl[window], DMEMP_OUT, DMEMP_OUT)
+    res = run_montout(bn_words, DMEMP_OUT, DMEMP_OUT)
+    return res
+
+
 # tests
 # noinspection PyPep8Naming
+@lru_cache(maxsize=16)
+def _ref_rr(mod):
+    """Helper function returning the locally computed RR for a modulus"""
+    R = 1 << mod.bit_length()
+    return R * R % mod
+
+
+@lru_cache(maxsize=16)
+def _ref_dinv(r_mod, mod):
+    """Helper function returning the locally computed montgomery constant"""
+    return (-mod_inv(mod, r_mod)) % r_mod
+
+
 def check_rr(mod, rr_test):
     """Check if RR calculated with simulator matches a locally computed one"""
-    R = 1 << bit_len(mod)
-    RR = R * R % mod
-    assert rr_test == RR, "Mismatch of local and machine calculated RR"
+    assert rr_test == _ref_rr(mod), "Mismatch of local and machine calculated RR"
 
 
 def check_dinv(dinv_test, r_mod, mod):
     """Check if montgomery modular inverse from simulator matches a locally computed one"""
-    mod_i = mod_inv(mod, r_mod)
-    dinv = (-mod_i) % r_mod
-    assert dinv_test == dinv, (
+    assert dinv_test == _ref_dinv(r_mod, mod), (
         "Mismatch of local and machine calculated montgomery constant"
     )
 
 
 def check_modexp(modexp_test, inval, exp, mod):
     """Check if modular exponentiation result from simulator matches locally computed result"""
-    modexp_cmp = (inval**exp) % mod
+    modexp_cmp = pow(inval, exp, mod)
     assert modexp_test == modexp_cmp, (
         "Mismatch of local and machine calculated modular exponentiation result"
     )
@@ -530,6 +567,7 @@ def rsa_encrypt(mod, bn_words, msg):
     check_rr(mod, rr)
     load_full_bn_val(DMEMP_IN, msg)
     # enc = modexp_word(bn_words, msg, EXP_PUB)
+    # enc = modexp_window(bn_words, msg, EXP_PUB, k=1)
     enc = run_modexp_65537(bn_words, msg)
     check_modexp(enc, msg, EXP_PUB, mod)
     return enc
@@ -540,37 +578,130 @@ def rsa_decrypt(mod, bn_words, priv_key, enc):
     init_dmem()
     load_mod(mod)
     run_modload(bn_words)
-    load_full_bn_val(DMEMP_IN, enc)
-    decrypt = run_modexp(bn_words, priv_key)
+    if USE_ASM_MODEXP:
+        load_full_bn_val(DMEMP_IN, enc)
+        decrypt = run_modexp(bn_words, priv_key)
+    else:
+        decrypt = modexp_window(bn_words, enc, priv_key)
     # decrypt = run_modexp_blinded(bn_words, priv_key)
     return decrypt
 
 
-def main():
-    """main"""
-    global inst_cnt
-    global cycle_cnt
-    global stats
-    global ctx
-    global start_addr_dict
-    global stop_addr_dict
-    global breakpoints
-    init_dmem()
+def rsa_decrypt_crt(p, q, bn_words, priv_key, enc):
+    """RSA decrypt using the chinese remainder theorem
 
+    Runs two half-width modexps (mod p and mod q) and recombines the results,
+    which takes about a third of the instructions of a full-width modexp for
+    1024 bit keys. The modexp library only accepts moduli filling whole bignum
+    words with the MSB set, so keys whose primes are not word aligned (e.g.
+    768 bit) use rsa_decrypt.
+    """
+    half_words = bn_words // 2
+    half_len = half_words * BN_WORD_LEN
+    if bn_words % 2 or p.bit_length() != half_len or q.bit_length() != half_len:
+        return rsa_decrypt(p * q, bn_words, priv_key, enc)
+    m_p = rsa_decrypt(p, half_words, priv_key % (p - 1), enc % p)
+    m_q = rsa_decrypt(q, half_words, priv_key % (q - 1), enc % q)
+    h = mod_inv(q, p) * (m_p - m_q) % p
+    return m_q + h * q
+
+
+def _init_test_worker():
+    """Load the program once per worker process"""
     # select program source
     # load_program_hex()
     # load_program_asm()
     load_program_otbn_asm()
 
+
+def _encrypt_uncounted(mod, bn_words, msg):
+    """Encrypt msg on the simulator without counting it towards the test"""
+    global inst_cnt
+    global cycle_cnt
+    global stats
+    enc = rsa_encrypt(mod, bn_words, msg)
+    inst_cnt = 0
+    cycle_cnt = 0
+    stats = init_stats()
+    init_dmem()
+    return enc
+
+
+def run_test(test_op, test_width, msg, rand_n, rand_d):
+    """Runs a single RSA test and returns its output lines, counters and stats.
+
+    Decryption tests encrypt the message on the simulator themselves instead
+    of using the result of a preceding encryption test, so tests do not
+    depend on each other and can run in separate processes. Only the
+    decryption is counted.
+    """
+    global inst_cnt
+    global cycle_cnt
+    global stats
+    # reset global counter variables
+    inst_cnt = 0
+    cycle_cnt = 0
+    stats = init_stats()
+    init_dmem()
+    out = []
+
+    if test_op == "enc_rand":
+        enc = rsa_encrypt(rand_n[test_width], test_width // 256, msg)
+        out.append("random key modulus: " + hex(rand_n[test_width]))
+        out.append("encrypted message (random key): " + hex(enc))
+    elif test_op == "enc":
+        enc = rsa_encrypt(RSA_N[test_width], test_width // 256, msg)
+        out.append("encrypted message: " + hex(enc))
+    elif test_op == "dec_rand":
+        enc = _encrypt_uncounted(rand_n[test_width], test_width // 256, msg)
+        decrypt = rsa_decrypt(
+            rand_n[test_width], test_width // 256, rand_d[test_width], enc
+        )
+        # check_decrypt(msg, decrypt)
+        out.append("random key modulus: " + hex(rand_n[test_width]))
+        out.append("random private exponent: " + hex(rand_d[test_width]))
+        out.append("decrypted message (random key): " + get_msg_str(decrypt))
+    elif test_op == "dec_crt":
+        enc = _encrypt_uncounted(RSA_N[test_width], test_width // 256, msg)
+        decrypt = rsa_decrypt_crt(
+            RSA_P[test_width],
+            RSA_Q[test_width],
+            test_width // 256,
+            RSA_D[test_width],
+            enc,
+        )
+        check_decrypt(msg, decrypt)
+        out.append("decrypted message: " + get_msg_str(decrypt))
+    elif test_op == "dec":
+        enc = _encrypt_uncounted(RSA_N[test_width], test_width // 256, msg)
+        decrypt = rsa_decrypt(
+            RSA_N[test_width], test_width // 256, RSA_D[test_width], enc
+        )
+        check_decrypt(msg, decrypt)
+        out.append("decrypted message: " + get_msg_str(decrypt))
+    else:
+        raise ValueError(test_op)
+
+    return out, inst_cnt, cycle_cnt, stats
+
+
+def main():
+    """main"""
     msg_str = "Hello bignum, can you encrypt and decrypt this for me?"
     msg = get_msg_val(msg_str)
     print(hex(msg))
 
+    # Load the program in this process first: a missing or broken program
+    # fails here with its own error instead of killing every pool worker in
+    # its initializer, which the pool keeps restarting forever.
+    _init_test_worker()
+
     tests = [
         ("enc", 768),
         ("dec", 768),
         # ('enc', 1024),
         # ('dec', 1024),
+        ("dec_crt", 1024),
         # ('enc_rand', 1024),
         # ('dec_rand', 1024),
         # ('enc', 2048),
@@ -580,72 +711,45 @@ def main():
     ]
     tests_results = []
 
-    rand_key_1024 = RSA.generate(1024)
-    rand_key_2048 = RSA.generate(2048)
-    rand_key_3072 = RSA.generate(3072)
-
+    # only generate random keys for widths used by enabled tests
     RSA_rand_N = {}
-    RSA_rand_N[1024] = rand_key_1024.n
-    RSA_rand_N[2048] = rand_key_2048.n
-    RSA_rand_N[3072] = rand_key_3072.n
-
     RSA_rand_D = {}
-    RSA_rand_D[1024] = rand_key_1024.d
-    RSA_rand_D[2048] = rand_key_2048.d
-    RSA_rand_D[3072] = rand_key_3072.d
+    for width in sorted({w for op, w in tests if op.endswith("_rand")}):
+        rand_key = RSA.generate(width)
+        RSA_rand_N[width] = rand_key.n
+        RSA_rand_D[width] = rand_key.d
+        print("random key modulus %d: " % width + hex(RSA_rand_N[width]))
+        print("random key private exponent %d: " % width + hex(RSA_rand_D[width]))
+        print("random key public exponent %d: " % width + hex(rand_key.e))
+
+    # the tests are independent simulations, run them in parallel
+    with multiprocessing.Pool(
+        min(len(tests), multiprocessing.cpu_count()), initializer=_init_test_worker
+    ) as pool:
+        results = pool.starmap(
+            run_test,
+            [(op, width, msg, RSA_rand_N, RSA_rand_D) for op, width in tests],
+        )
+
+    for i, (test, (out, test_inst_cnt, test_cycle_cnt, test_stats)) in enumerate(
+        zip(tests, results)
+    ):
+        print_test_headline(i + 1, len(tests), str(test))
+        for line in out:
+            print(line)
 
-    print("random key modulus 3072: " + hex(RSA_rand_N[3072]))
-    print("random key private exponent 3072: " + hex(RSA_rand_D[3072]))
-    print("random key public exponent 3072: " + hex(RSA_rand_D[3072]))
+        tests_results.append(
+            {
+                "inst_cnt": test_inst_cnt,
+                "cycle_cnt": test_cycle_cnt,
+                "stats": test_stats,
+            }
+        )
 
-    for i in range(len(tests)):
-        test = tests[i]
-        test_op, test_width = test
-        print_test_headline(i + 1, len(tests), str(test))
-        test_results = {
-            "inst_cnt": 0,
-            "cycle_cnt": 0,
-            "stats": {},
-        }
-        # reset global counter variables
-        inst_cnt = 0
-        cycle_cnt = 0
-        stats = init_stats()
-
-        if test_op == "enc_rand":
-            enc = rsa_encrypt(RSA_rand_N[test_width], test_width // 256, msg)
-            print("random key modulus: " + hex(RSA_rand_N[test_width]))
-            print("encrypted message (random key): " + hex(enc))
-        elif test_op == "enc":
-            enc = rsa_encrypt(RSA_N[test_width], test_width // 256, msg)
-            print("encrypted message: " + hex(enc))
-        elif test_op == "dec_rand":
-            decrypt = rsa_decrypt(
-                RSA_rand_N[test_width], test_width // 256, RSA_rand_D[test_width], enc
-            )
-            # check_decrypt(msg, decrypt)
-            print("random key modulus: " + hex(RSA_rand_N[test_width]))
-            print("random private exponent: " + hex(RSA_rand_D[test_width]))
-            print("decrypted message (random key): " + get_msg_str(decrypt))
-        elif test_op == "dec":
-            decrypt = rsa_decrypt(
-                RSA_N[test_width], test_width // 256, RSA_D[test_width], enc
-            )
-            check_decrypt(msg, decrypt)
-            print("decrypted message: " + get_msg_str(decrypt))
-        else:
-            assert True
-
-        test_results["inst_cnt"] = inst_cnt
-        test_results["cycle_cnt"] = cycle_cnt
-        test_results["stats"] = stats
-
-        tests_results.append(test_results)
-
-        dump_stats(stats, STATS_CONFIG)
-
-        print("Cycle count: " + str(cycle_cnt))
-        print("Instruction count " + str(inst_cnt))
+        dump_stats(test_stats, STATS_CONFIG)
+
+        print("Cycle count: " + str(test_cycle_cnt))
+        print("Instruction count " + str(test_inst_cnt))
 
         print("\n\n")
 
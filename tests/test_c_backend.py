@@ -1,11 +1,38 @@
 import random
 import unittest
-from contextlib import contextmanager
+from contextlib import nullcontext
+from unittest import mock
 
 from ot_dsim.bignum_lib import c_backend
 from ot_dsim.bignum_lib.machine import Machine
 
 
+# Words sitting on the 32-bit limb and 64-bit word seams, where carry/borrow
+# propagation and compare bugs show up and uniform random draws rarely land.
+_SEAMS = range(c_backend.LIMB_BITS, c_backend.XLEN_BITS, c_backend.LIMB_BITS)
+EDGE_U256 = tuple(
+    sorted(
+        {0, 1, c_backend.XLEN_MASK, 1 << (c_backend.XLEN_BITS - 1)}
+        | {(1 << bit) - 1 for bit in _SEAMS}
+        | {1 << bit for bit in _SEAMS}
+        | {c_backend.XLEN_MASK ^ ((1 << bit) - 1) for bit in _SEAMS}
+    )
+)
+
+
+def python_backend():
+    """Patch out _cops and rebind the unchecked helpers to their pure versions."""
+    return mock.patch.multiple(
+        c_backend,
+        _native=None,
+        _add_u256=c_backend._py_add_u256,
+        _sub_u256=c_backend._py_sub_u256,
+        _cmp_u256=c_backend._py_cmp_u256,
+        _shl_u256=c_backend._py_shl_u256,
+        _shr_u256=c_backend._py_shr_u256,
+    )
+
+
 class CBackendTest(unittest.TestCase):
     def setUp(self):
         self.rng = random.Random(0xC0FFEE)
@@ -13,97 +40,234 @@ class CBackendTest(unittest.TestCase):
     def rand_u256(self):
         return self.rng.getrandbits(c_backend.XLEN_BITS)
 
-    @contextmanager
-    def force_python_backend(self):
-        native = c_backend._native
-        c_backend._native = None
-        try:
-            yield
-        finally:
-            c_backend._native = native
+    def fuzz_u256(self):
+        """Random word, drawn from EDGE_U256 one time in four"""
+        if not self.rng.getrandbits(2):
+            return self.rng.choice(EDGE_U256)
+        return self.rand_u256()
+
+    def rand_bytes(self, nbytes):
+        # Random.randbytes() only exists from Python 3.9; this is the same
+        # draw it makes.
+        return self.rng.getrandbits(nbytes * 8).to_bytes(nbytes, "little")
 
     def test_add_sub_matches_python_math(self):
-        for _ in range(200):
-            lhs = self.rand_u256()
-            rhs = self.rand_u256()
-            carry_in = bool(self.rng.getrandbits(1))
-
-            add_val, add_carry = c_backend.add_u256(lhs, rhs, carry_in)
-            add_expected = lhs + rhs + int(carry_in)
-            self.assertEqual(add_val, add_expected & c_backend.XLEN_MASK)
-            self.assertEqual(add_carry, int(add_expected >> c_backend.XLEN_BITS))
-
-            borrow_in = bool(self.rng.getrandbits(1))
-            sub_val, sub_borrow = c_backend.sub_u256(lhs, rhs, borrow_in)
-            sub_expected = lhs - rhs - int(borrow_in)
-            expected_borrow = 1 if sub_expected < 0 else 0
-            if expected_borrow:
-                sub_expected += 1 << c_backend.XLEN_BITS
-            self.assertEqual(sub_val, sub_expected & c_backend.XLEN_MASK)
-            self.assertEqual(sub_borrow, expected_borrow)
+        n = 200
+        mask = c_backend.XLEN_MASK
+        bits = c_backend.XLEN_BITS
+        lhs = [self.fuzz_u256() for _ in range(n)]
+        rhs = [self.fuzz_u256() for _ in range(n)]
+        cin = [self.rng.getrandbits(1) for _ in range(n)]
+
+        add_expected = [a + b + c for a, b, c in zip(lhs, rhs, cin)]
+        add_expected = (
+            [v & mask for v in add_expected],
+            [v >> bits for v in add_expected],
+        )
+        sub_expected = [a - b - c for a, b, c in zip(lhs, rhs, cin)]
+        sub_expected = (
+            [v & mask for v in sub_expected],
+            [int(v < 0) for v in sub_expected],
+        )
+        for forced in (False, True):
+            with self.subTest(python_backend=forced):
+                with python_backend() if forced else nullcontext():
+                    self.assertEqual(
+                        tuple(c_backend.add_u256_batch(lhs, rhs, cin)), add_expected
+                    )
+                    self.assertEqual(
+                        tuple(c_backend.sub_u256_batch(lhs, rhs, cin)), sub_expected
+                    )
+
+    def test_mul_matches_python_math(self):
+        edge = [0, 1, c_backend.XLEN_MASK, 1 << (c_backend.XLEN_BITS - 1)]
+        pairs = [(a, b) for a in edge for b in edge]
+        pairs += [(self.rand_u256(), self.rand_u256()) for _ in range(200)]
+        for lhs, rhs in pairs:
+            self.assertEqual(c_backend.mul_u256(lhs, rhs), lhs * rhs)
+
+    def test_mont_mul_matches_python_math(self):
+        for words in (1, 3, 16):
+            bits = words * c_backend.XLEN_BITS
+            r = 1 << bits
+            for _ in range(20):
+                n = self.rng.getrandbits(bits) | 1
+                dinv = -pow(n, -1, r) % r
+                x = self.rng.getrandbits(bits)
+                y = self.rng.getrandbits(bits)
+                m = (x * y * dinv) % r
+                t = (x * y + m * n) >> bits
+                expected = t - n if t >= r else t
+                for forced in (False, True):
+                    with python_backend() if forced else nullcontext():
+                        self.assertEqual(
+                            c_backend.mont_mul(x, y, n, dinv, words), expected
+                        )
+                        if words == 1:
+                            self.assertEqual(
+                                c_backend.mont_mul_u256(x, y, n, dinv), expected
+                            )
 
     def test_compare_bitwise_and_shift(self):
-        for _ in range(200):
-            lhs = self.rand_u256()
-            rhs = self.rand_u256()
-            shift = self.rng.randrange(0, c_backend.XLEN_BITS + 64)
+        n = 200
+        mask = c_backend.XLEN_MASK
+        bits = c_backend.XLEN_BITS
+        # One draw for all operands: lhs/rhs pairs are adjacent 32-byte
+        # slices of the blob.
+        blob = self.rand_bytes(n * 2 * c_backend.XLEN_BYTES)
+        words = [
+            int.from_bytes(blob[off : off + c_backend.XLEN_BYTES], "little")
+            for off in range(0, len(blob), c_backend.XLEN_BYTES)
+        ]
+        lhs = words[0::2]
+        rhs = words[1::2]
+        shifts = [self.rng.randrange(0, bits + 64) for _ in range(n)]
+        pairs = list(zip(lhs, rhs))
+
+        self.assertEqual(
+            [c_backend.cmp_u256(a, b) for a, b in pairs],
+            [(a > b) - (a < b) for a, b in pairs],
+        )
+        self.assertEqual(
+            [c_backend.and_u256(a, b) for a, b in pairs], [a & b for a, b in pairs]
+        )
+        self.assertEqual(
+            [c_backend.or_u256(a, b) for a, b in pairs], [a | b for a, b in pairs]
+        )
+        self.assertEqual(
+            [c_backend.xor_u256(a, b) for a, b in pairs], [a ^ b for a, b in pairs]
+        )
+        self.assertEqual([c_backend.not_u256(a) for a in lhs], [a ^ mask for a in lhs])
 
-            expected_cmp = 0
-            if lhs < rhs:
-                expected_cmp = -1
-            elif lhs > rhs:
-                expected_cmp = 1
-            self.assertEqual(c_backend.cmp_u256(lhs, rhs), expected_cmp)
+        # Bits that survive a left shift by s, indexed by s; masking before
+        # shifting keeps the oracle at 256 bits and differs from the
+        # shift-then-mask form under test.
+        keep_masks = [mask >> s for s in range(bits + 64)]
+        self.assertEqual(
+            [c_backend.shl_u256(a, s) for a, s in zip(lhs, shifts)],
+            [(a & keep_masks[s]) << s for a, s in zip(lhs, shifts)],
+        )
+        self.assertEqual(
+            [c_backend.shr_u256(a, s) for a, s in zip(lhs, shifts)],
+            [a >> s for a, s in zip(lhs, shifts)],
+        )
+
+    def test_compare_edge_cases(self):
+        edge = [0, 1, 1 << 64, (1 << 64) - 1, 1 << 255, c_backend.XLEN_MASK]
+        for lhs in edge:
+            for rhs in edge:
+                self.assertEqual(
+                    c_backend.cmp_u256(lhs, rhs), (lhs > rhs) - (lhs < rhs)
+                )
 
-            self.assertEqual(c_backend.and_u256(lhs, rhs), lhs & rhs)
-            self.assertEqual(c_backend.or_u256(lhs, rhs), lhs | rhs)
-            self.assertEqual(c_backend.xor_u256(lhs, rhs), lhs ^ rhs)
-            self.assertEqual(c_backend.not_u256(lhs), (~lhs) & c_backend.XLEN_MASK)
+    def test_compare_batch(self):
+        edge = [0, 1, 1 << 64, (1 << 64) - 1, 1 << 255, c_backend.XLEN_MASK]
+        pairs = [(a, b) for a in edge for b in edge]
+        pairs += [(self.rand_u256(), self.rand_u256()) for _ in range(200)]
+        pairs += [(value, value) for value, _ in pairs[-20:]]
+        lhs = [a for a, _ in pairs]
+        rhs = [b for _, b in pairs]
+        expected = [(a > b) - (a < b) for a, b in pairs]
+        for forced in (False, True):
+            with self.subTest(python_backend=forced):
+                with python_backend() if forced else nullcontext():
+                    self.assertEqual(c_backend.cmp_u256_batch(lhs, rhs), expected)
+                    with self.assertRaises(ValueError):
+                        c_backend.cmp_u256_batch(lhs, rhs[1:])
+                    with self.assertRaises(OverflowError):
+                        c_backend.cmp_u256_batch([0, -1], [0, 0])
 
-            expected_shl = (lhs << shift) & c_backend.XLEN_MASK
-            expected_shr = lhs >> shift if shift < c_backend.XLEN_BITS else 0
-            self.assertEqual(c_backend.shl_u256(lhs, shift), expected_shl)
-            self.assertEqual(c_backend.shr_u256(lhs, shift), expected_shr)
+    def test_shift_every_amount(self):
+        bits = c_backend.XLEN_BITS
+        mask = c_backend.XLEN_MASK
+        value = self.rand_u256() | 1 | (1 << (bits - 1))
+        for shift in range(bits + 2):
+            self.assertEqual(c_backend.shl_u256(value, shift), (value << shift) & mask)
+            self.assertEqual(c_backend.shr_u256(value, shift), value >> shift)
 
     def test_limb_updates_are_exact(self):
-        for _ in range(200):
-            base = self.rand_u256()
-            idx = self.rng.randrange(0, c_backend.LIMBS)
-            new_limb = self.rng.getrandbits(c_backend.LIMB_BITS)
+        n = 200
+        word_bytes = c_backend.XLEN_BYTES
+        limb_bytes = c_backend.LIMB_BITS // 8
+        blob = bytearray(self.rand_bytes(n * word_bytes))
+        bases = [
+            int.from_bytes(blob[off : off + word_bytes], "little")
+            for off in range(0, len(blob), word_bytes)
+        ]
+        idxs = [self.rng.randrange(0, c_backend.LIMBS) for _ in range(n)]
+        new_limbs = [self.rng.getrandbits(c_backend.LIMB_BITS) for _ in range(n)]
 
-            updated = c_backend.set_limb(base, idx, new_limb)
-            self.assertEqual(c_backend.get_limb(updated, idx), new_limb)
+        # Oracle: overwrite the limb's bytes in place and re-read each word,
+        # independent of the shift/mask arithmetic under test.
+        for row, (idx, limb) in enumerate(zip(idxs, new_limbs)):
+            off = row * word_bytes + idx * limb_bytes
+            blob[off : off + limb_bytes] = limb.to_bytes(limb_bytes, "little")
+        expected = [
+            int.from_bytes(blob[off : off + word_bytes], "little")
+            for off in range(0, len(blob), word_bytes)
+        ]
 
-            shift = idx * c_backend.LIMB_BITS
-            expected = (base & ~(c_backend.LIMB_MASK << shift)) | (new_limb << shift)
-            self.assertEqual(updated, expected)
+        for forced in (False, True):
+            with self.subTest(python_backend=forced):
+                with python_backend() if forced else nullcontext():
+                    updated = c_backend.set_limb_batch(bases, idxs, new_limbs)
+                    self.assertEqual(updated, expected)
+                    self.assertEqual(
+                        c_backend.get_limb_batch(updated, idxs), new_limbs
+                    )
 
     def test_half_limb_and_half_word_updates_are_exact(self):
-        for _ in range(100):
-            base = self.rand_u256()
-            idx = self.rng.randrange(0, c_backend.LIMBS)
-            upper = bool(self.rng.getrandbits(1))
-            half_limb_val = self.rng.getrandbits(c_backend.HALF_LIMB_BITS)
-
-            updated_half_limb = c_backend.set_half_limb(base, idx, half_limb_val, upper)
-            half_shift = idx * c_backend.LIMB_BITS + (
-                c_backend.HALF_LIMB_BITS if upper else 0
-            )
-            expected_half_limb = (base & ~(c_backend.HALF_LIMB_MASK << half_shift)) | (
-                half_limb_val << half_shift
+        n = 100
+        word_bytes = c_backend.XLEN_BYTES
+        limb_bytes = c_backend.LIMB_BITS // 8
+        half_limb_bytes = c_backend.HALF_LIMB_BITS // 8
+        half_word_bytes = c_backend.HALF_WORD_BITS // 8
+        rng = self.rng
+        bases = [self.rand_u256() for _ in range(n)]
+        half_limb_params = [
+            (
+                rng.randrange(0, c_backend.LIMBS),
+                bool(rng.getrandbits(1)),
+                rng.getrandbits(c_backend.HALF_LIMB_BITS),
             )
-            self.assertEqual(updated_half_limb, expected_half_limb)
+            for _ in range(n)
+        ]
+        half_word_params = [
+            (rng.randrange(0, 2), rng.getrandbits(c_backend.HALF_WORD_BITS))
+            for _ in range(n)
+        ]
 
-            half_word_idx = self.rng.randrange(0, 2)
-            half_word_val = self.rng.getrandbits(c_backend.HALF_WORD_BITS)
-            updated_half_word = c_backend.set_half_word(
-                base, half_word_idx, half_word_val
-            )
-            hw_shift = half_word_idx * c_backend.HALF_WORD_BITS
-            expected_half_word = (base & ~(c_backend.HALF_WORD_MASK << hw_shift)) | (
-                half_word_val << hw_shift
-            )
-            self.assertEqual(updated_half_word, expected_half_word)
+        # Oracle: overwrite the field's bytes in a copy of the word.
+        def patched(base, offset, value, nbytes):
+            raw = bytearray(base.to_bytes(word_bytes, "little"))
+            raw[offset : offset + nbytes] = value.to_bytes(nbytes, "little")
+            return int.from_bytes(raw, "little")
+
+        self.assertEqual(
+            [
+                c_backend.set_half_limb(base, idx, val, upper)
+                for base, (idx, upper, val) in zip(bases, half_limb_params)
+            ],
+            [
+                patched(
+                    base,
+                    idx * limb_bytes + (half_limb_bytes if upper else 0),
+                    val,
+                    half_limb_bytes,
+                )
+                for base, (idx, upper, val) in zip(bases, half_limb_params)
+            ],
+        )
+        self.assertEqual(
+            [
+                c_backend.set_half_word(base, idx, val)
+                for base, (idx, val) in zip(bases, half_word_params)
+            ],
+            [
+                patched(base, idx * half_word_bytes, val, half_word_bytes)
+                for base, (idx, val) in zip(bases, half_word_params)
+            ],
+        )
 
     def test_machine_set_reg_limb_overwrites_full_limb(self):
         machine = Machine([], [None])
@@ -116,18 +280,106 @@ class CBackendTest(unittest.TestCase):
     def test_backend_flag(self):
         self.assertIsInstance(c_backend.is_available(), bool)
 
+    @python_backend()
     def test_python_fallback_path(self):
         lhs = self.rand_u256()
         rhs = self.rand_u256()
-        with self.force_python_backend():
-            add_val, add_carry = c_backend.add_u256(lhs, rhs)
-            self.assertEqual(add_val, (lhs + rhs) & c_backend.XLEN_MASK)
-            self.assertEqual(add_carry, int((lhs + rhs) >> c_backend.XLEN_BITS))
-
-            idx = self.rng.randrange(0, c_backend.LIMBS)
-            limb = self.rng.getrandbits(c_backend.LIMB_BITS)
-            updated = c_backend.set_limb(lhs, idx, limb)
-            self.assertEqual(c_backend.get_limb(updated, idx), limb)
+        add_val, add_carry = c_backend.add_u256(lhs, rhs)
+        self.assertEqual(add_val, (lhs + rhs) & c_backend.XLEN_MASK)
+        self.assertEqual(add_carry, int((lhs + rhs) >> c_backend.XLEN_BITS))
+
+        idx = self.rng.randrange(0, c_backend.LIMBS)
+        limb = self.rng.getrandbits(c_backend.LIMB_BITS)
+        updated = c_backend.set_limb(lhs, idx, limb)
+        self.assertEqual(c_backend.get_limb(updated, idx), limb)
+
+    def test_pure_unchecked_helpers_match_python_math(self):
+        mask = c_backend.XLEN_MASK
+        bits = c_backend.XLEN_BITS
+        for _ in range(200):
+            lhs = self.rand_u256()
+            rhs = self.rand_u256()
+            carry = self.rng.getrandbits(1)
+            shift = self.rng.randrange(0, bits)
+            total = lhs + rhs + carry
+            diff = lhs - rhs - carry
+            self.assertEqual(
+                c_backend._py_add_u256(lhs, rhs, carry), (total & mask, total >> bits)
+            )
+            self.assertEqual(
+                c_backend._py_sub_u256(lhs, rhs, carry), (diff & mask, int(diff < 0))
+            )
+            self.assertEqual(
+                c_backend._py_cmp_u256(lhs, rhs), (lhs > rhs) - (lhs < rhs)
+            )
+            self.assertEqual(
+                c_backend._py_shl_u256(lhs, shift), (lhs << shift) & mask
+            )
+            self.assertEqual(c_backend._py_shr_u256(lhs, shift), lhs >> shift)
+
+    def test_unchecked_helpers_match_public_api(self):
+        # The pure kernels are the reference: the bound unchecked helpers
+        # (native when _cops is built) and the checked wrappers on both
+        # backends must agree with them.
+        for forced in (False, True):
+            with self.subTest(python_backend=forced):
+                with python_backend() if forced else nullcontext():
+                    for _ in range(50):
+                        lhs = self.fuzz_u256()
+                        rhs = self.fuzz_u256()
+                        carry = self.rng.getrandbits(1)
+                        shift = self.rng.randrange(0, c_backend.XLEN_BITS)
+                        expected = c_backend._py_add_u256(lhs, rhs, carry)
+                        self.assertEqual(c_backend._add_u256(lhs, rhs, carry), expected)
+                        self.assertEqual(c_backend.add_u256(lhs, rhs, carry), expected)
+                        expected = c_backend._py_sub_u256(lhs, rhs, carry)
+                        self.assertEqual(c_backend._sub_u256(lhs, rhs, carry), expected)
+                        self.assertEqual(c_backend.sub_u256(lhs, rhs, carry), expected)
+                        expected = c_backend._py_cmp_u256(lhs, rhs)
+                        self.assertEqual(c_backend._cmp_u256(lhs, rhs), expected)
+                        self.assertEqual(c_backend.cmp_u256(lhs, rhs), expected)
+                        self.assertEqual(
+                            c_backend._not_u256(lhs), c_backend.not_u256(lhs)
+                        )
+                        expected = c_backend._py_shl_u256(lhs, shift)
+                        self.assertEqual(c_backend._shl_u256(lhs, shift), expected)
+                        self.assertEqual(c_backend.shl_u256(lhs, shift), expected)
+                        expected = c_backend._py_shr_u256(lhs, shift)
+                        self.assertEqual(c_backend._shr_u256(lhs, shift), expected)
+                        self.assertEqual(c_backend.shr_u256(lhs, shift), expected)
+
+    def test_invalid_operands_rejected_by_both_backends(self):
+        for forced in (False, True):
+            with self.subTest(python_backend=forced):
+                with python_backend() if forced else nullcontext():
+                    with self.assertRaises(TypeError):
+                        c_backend.add_u256(1.0, 1)
+                    with self.assertRaises(OverflowError):
+                        c_backend.add_u256(1 << c_backend.XLEN_BITS, 1)
+                    with self.assertRaises(OverflowError):
+                        c_backend.sub_u256(0, -1)
+                    with self.assertRaises(OverflowError):
+                        c_backend.xor_u256(-1, 0)
+                    with self.assertRaises(ValueError):
+                        c_backend.shl_u256(1, -1)
+                    with self.assertRaises(IndexError):
+                        c_backend.get_limb(0, c_backend.LIMBS)
+                    with self.assertRaises(TypeError):
+                        c_backend.get_limb(1.0, 0)
+                    with self.assertRaises(OverflowError):
+                        c_backend.get_limb(-1, 0)
+                    with self.assertRaises(OverflowError):
+                        c_backend.set_limb(0, 0, 1 << c_backend.LIMB_BITS)
+                    with self.assertRaises(OverflowError):
+                        c_backend.set_half_word(0, 1, 1 << c_backend.HALF_WORD_BITS)
+                    with self.assertRaises(OverflowError):
+                        c_backend.add_u256_batch([0, -1], [0, 0], [0, 0])
+                    with self.assertRaises(ValueError):
+                        c_backend.sub_u256_batch([0, 1], [0], [0, 0])
+                    with self.assertRaises(IndexError):
+                        c_backend.set_limb_batch([0, 0], [0, c_backend.LIMBS], [1, 1])
+                    with self.assertRaises(OverflowError):
+                        c_backend.set_limb_batch([0], [0], [1 << c_backend.LIMB_BITS])
 
 
 if __name__ == "__main__":
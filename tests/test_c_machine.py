@@ -5,58 +5,54 @@ original pure-Python Machine for all core operations: register access,
 limb manipulation, flags, DMEM, GPRs, CSRs/WSRs, loop/call stacks.
 """
 
+import importlib.util
 import random
 import os
-import subprocess
-import sys
 import unittest
+from unittest import mock
 
-from ot_dsim.bignum_lib.machine import Machine, CallStackUnderrun, _USE_C_MACHINE
+from ot_dsim.bignum_lib.machine import (
+    Machine,
+    CallStackUnderrun,
+    Flag,
+    MontSqrFastPath,
+    _C_MACHINE_ABI_VERSION,
+    _PyMachine,
+    _USE_C_MACHINE,
+)
 
 
 class CMachineTest(unittest.TestCase):
     """Test the Machine class (which should be backed by C when available)."""
 
-    def test_c_backend_active(self):
-        """Verify C backend is being used (if built)."""
-        # This test documents which backend is active; it doesn't fail
-        # if C isn't available, but it does assert consistency.
-        print(f"C Machine active: {_USE_C_MACHINE}")
+    def setUp(self):
+        # Three IMEM slots so the PC and loop stack tests have room to move.
+        self.m = Machine([], [None, None, None])
 
+    @unittest.skipUnless(_USE_C_MACHINE, "C Machine not built; using pure Python")
     def test_machine_abi_version_constant(self):
-        if not _USE_C_MACHINE:
-            return
         from ot_dsim import _machine as machine_mod
 
-        self.assertTrue(hasattr(machine_mod, "ABI_VERSION"))
-        self.assertIsInstance(machine_mod.ABI_VERSION, int)
-        self.assertGreaterEqual(machine_mod.ABI_VERSION, 1)
+        self.assertEqual(machine_mod.ABI_VERSION, _C_MACHINE_ABI_VERSION)
 
     def test_runtime_force_pure_python_env(self):
-        env = os.environ.copy()
-        env["OT_DSIM_PURE_PYTHON"] = "1"
-        proc = subprocess.run(
-            [
-                sys.executable,
-                "-c",
-                "from ot_dsim.bignum_lib.machine import _USE_C_MACHINE; print(int(_USE_C_MACHINE))",
-            ],
-            capture_output=True,
-            text=True,
-            env=env,
-            cwd=os.getcwd(),
-        )
+        # Execute a private copy of the module rather than reloading it, so
+        # the Machine/CallStackUnderrun objects other modules already
+        # imported stay the ones the package exports.
+        spec = importlib.util.find_spec("ot_dsim.bignum_lib.machine")
+        mod = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(os.environ, {"OT_DSIM_PURE_PYTHON": "1"}):
+            spec.loader.exec_module(mod)
 
-        self.assertEqual(proc.returncode, 0, msg=proc.stderr)
-        self.assertEqual(proc.stdout.strip().splitlines()[-1], "0")
+        self.assertFalse(mod._USE_C_MACHINE)
+        self.assertIs(mod.Machine, mod._PyMachine)
 
     def test_basic_construction(self):
-        m = Machine([], [None])
-        self.assertEqual(m.XLEN, 256)
-        self.assertEqual(m.LIMBS, 8)
-        self.assertEqual(m.NUM_REGS, 32)
-        self.assertEqual(m.NUM_GPRS, 32)
-        self.assertEqual(m.DMEM_DEPTH, 128)
+        self.assertEqual(self.m.XLEN, 256)
+        self.assertEqual(self.m.LIMBS, 8)
+        self.assertEqual(self.m.NUM_REGS, 32)
+        self.assertEqual(self.m.NUM_GPRS, 32)
+        self.assertEqual(self.m.DMEM_DEPTH, 128)
 
     def test_class_level_constants(self):
         """Constants must be accessible on the class, not just instances."""
@@ -67,66 +63,83 @@ class CMachineTest(unittest.TestCase):
         self.assertEqual(Machine.DMEM_DEPTH, 128)
         self.assertEqual(Machine.IMEM_DEPTH, 1024)
 
+    def test_no_instance_dict(self):
+        """Machine state is slotted in both backends."""
+        self.assertFalse(hasattr(self.m, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.m.not_a_machine_attribute = 1
+
     def test_register_get_set(self):
-        m = Machine([], [None])
         val = 0xDEADBEEFCAFEBABE12345678AABBCCDD
-        m.set_reg(5, val)
-        self.assertEqual(m.get_reg(5), val)
+        self.m.set_reg(5, val)
+        self.assertEqual(self.m.get_reg(5), val)
 
     def test_register_256bit_max(self):
-        m = Machine([], [None])
         max_val = (1 << 256) - 1
-        m.set_reg(0, max_val)
-        self.assertEqual(m.get_reg(0), max_val)
+        self.m.set_reg(0, max_val)
+        self.assertEqual(self.m.get_reg(0), max_val)
 
     def test_special_registers(self):
-        m = Machine([], [None])
         val = 0xABCD
         for name in ["mod", "dmp", "rfp", "lc"]:
-            m.set_reg(name, val)
-            self.assertEqual(m.get_reg(name), val)
+            self.m.set_reg(name, val)
+            self.assertEqual(self.m.get_reg(name), val)
 
     def test_limb_get_set(self):
-        m = Machine([], [None])
-        m.set_reg(3, (1 << 256) - 1)  # all 1s
-        m.set_reg_limb(3, 0, 0)
-        self.assertEqual(m.get_reg_limb(3, 0), 0)
+        self.m.set_reg(3, (1 << 256) - 1)  # all 1s
+        self.m.set_reg_limb(3, 0, 0)
+        self.assertEqual(self.m.get_reg_limb(3, 0), 0)
         # Other limbs should still be all 1s
         for i in range(1, 8):
-            self.assertEqual(m.get_reg_limb(3, i), 0xFFFFFFFF)
+            self.assertEqual(self.m.get_reg_limb(3, i), 0xFFFFFFFF)
 
     def test_half_limb_set(self):
-        m = Machine([], [None])
-        m.set_reg(4, 0)
-        m.set_reg_half_limb(4, 0, 0xABCD, True)  # upper half of limb 0
+        self.m.set_reg(4, 0)
+        self.m.set_reg_half_limb(4, 0, 0xABCD, True)  # upper half of limb 0
         # Lower half should be 0, upper half should be 0xABCD
-        limb0 = m.get_reg_limb(4, 0)
+        limb0 = self.m.get_reg_limb(4, 0)
         self.assertEqual(limb0, 0xABCD0000)
 
     def test_flags(self):
-        m = Machine([], [None])
-        for flag in ["M", "L", "Z", "C", "XM", "XL", "XZ", "XC"]:
-            m.set_flag(flag, True)
-            self.assertTrue(m.get_flag(flag))
-            m.set_flag(flag, False)
-            self.assertFalse(m.get_flag(flag))
+        for flag in Flag:
+            self.m.set_flag(flag, True)
+            self.assertTrue(self.m.get_flag(flag))
+            self.assertTrue(self.m.get_flag(flag.name))
+            self.m.set_flag(flag.name, False)
+            self.assertFalse(self.m.get_flag(flag))
+
+    def test_invalid_flag_identifier(self):
+        for flag in ("Q", 8, -1):
+            with self.assertRaises(Exception):
+                self.m.get_flag(flag)
+            with self.assertRaises(Exception):
+                self.m.set_flag(flag, True)
+
+    def test_bool_is_not_a_flag_identifier(self):
+        # True == Flag.L and False == Flag.C, but neither names a flag.
+        for m in (self.m, _PyMachine([], [None])):
+            for flag in (True, False):
+                with self.subTest(machine=type(m).__name__, flag=flag):
+                    with self.assertRaises(Exception):
+                        m.get_flag(flag)
+                    with self.assertRaises(Exception):
+                        m.set_flag(flag, True)
 
     def test_set_c_z_m_l(self):
-        m = Machine([], [None])
         # Value 0: Z should be set, C/M/L should be unset
-        m.set_c_z_m_l(0)
-        self.assertTrue(m.get_flag("Z"))
-        self.assertFalse(m.get_flag("C"))
-        self.assertFalse(m.get_flag("M"))
-        self.assertFalse(m.get_flag("L"))
+        self.m.set_c_z_m_l(0)
+        self.assertTrue(self.m.get_flag(Flag.Z))
+        self.assertFalse(self.m.get_flag(Flag.C))
+        self.assertFalse(self.m.get_flag(Flag.M))
+        self.assertFalse(self.m.get_flag(Flag.L))
 
         # Value with bit 256 set (carry)
-        m.set_c_z_m_l(1 << 256)
-        self.assertTrue(m.get_flag("C"))
+        self.m.set_c_z_m_l(1 << 256)
+        self.assertTrue(self.m.get_flag(Flag.C))
 
         # Odd value: L should be set
-        m.set_c_z_m_l(1)
-        self.assertTrue(m.get_flag("L"))
+        self.m.set_c_z_m_l(1)
+        self.assertTrue(self.m.get_flag(Flag.L))
 
     def test_dmem(self):
         m = Machine([42, 99], [None])
@@ -136,99 +149,229 @@ class CMachineTest(unittest.TestCase):
         self.assertEqual(m.get_dmem(2), 777)
 
     def test_dmem_bounds(self):
-        m = Machine([], [None])
         with self.assertRaises(IndexError):
-            m.get_dmem(128)
+            self.m.get_dmem(128)
         with self.assertRaises(IndexError):
-            m.set_dmem(-1, 0)
+            self.m.set_dmem(-1, 0)
+
+    def test_dmem_range(self):
+        m = Machine(list(range(128)), [None])
+        self.assertEqual(m.get_dmem_range(5, 3), [5, 6, 7])
+        self.assertEqual(m.get_dmem_range(120, 8), list(range(120, 128)))
+        self.assertEqual(m.get_dmem_range(0, 0), [])
+        with self.assertRaises(IndexError):
+            m.get_dmem_range(120, 9)
+        with self.assertRaises(IndexError):
+            m.get_dmem_range(-1, 2)
 
     def test_gpr_operations(self):
-        m = Machine([], [None])
-        m.set_gpr(2, 42)
-        self.assertEqual(m.get_gpr(2), 42)
-        m.set_gpr(2, 0xFFFFFFFF)
-        m.inc_gpr(2)
-        self.assertEqual(m.get_gpr(2), 0)  # wrap around
+        self.m.set_gpr(2, 42)
+        self.assertEqual(self.m.get_gpr(2), 42)
+        self.m.set_gpr(2, 0xFFFFFFFF)
+        self.m.inc_gpr(2)
+        self.assertEqual(self.m.get_gpr(2), 0)  # wrap around
 
     def test_gpr_x0_is_zero(self):
-        m = Machine([], [None])
-        self.assertEqual(m.get_gpr(0), 0)
+        self.assertEqual(self.m.get_gpr(0), 0)
 
     def test_call_stack(self):
-        m = Machine([], [None])
-        m.push_call_stack(100)
-        m.push_call_stack(200)
-        self.assertEqual(m.pop_call_stack(), 200)
-        self.assertEqual(m.pop_call_stack(), 100)
+        self.m.push_call_stack(100)
+        self.m.push_call_stack(200)
+        self.assertEqual(self.m.pop_call_stack(), 200)
+        self.assertEqual(self.m.pop_call_stack(), 100)
 
     def test_call_stack_underrun(self):
-        m = Machine([], [None])
         with self.assertRaises(OverflowError):
-            m.pop_call_stack()
+            self.m.pop_call_stack()
 
     def test_loop_stack(self):
-        m = Machine([], [None, None, None])
-        m.push_loop_stack(5, 2, 0)
-        self.assertEqual(m.get_top_loop_end_addr(), 2)
-        self.assertEqual(m.get_top_loop_start_addr(), 0)
-        self.assertTrue(m.dec_top_loop_cnt())  # 5->4, returns True
-        self.assertEqual(m.pop_loop_stack(), 0)
+        self.m.push_loop_stack(5, 2, 0)
+        self.assertEqual(self.m.get_top_loop_end_addr(), 2)
+        self.assertEqual(self.m.get_top_loop_start_addr(), 0)
+        self.assertTrue(self.m.dec_top_loop_cnt())  # 5->4, returns True
+        self.assertEqual(self.m.pop_loop_stack(), 0)
 
     def test_pc_operations(self):
-        m = Machine([], [None, None, None])
-        self.assertEqual(m.get_pc(), 0)
-        m.set_pc(2)
-        self.assertEqual(m.get_pc(), 2)
-        m.set_pc(0)
-        m.inc_pc()
-        self.assertEqual(m.get_pc(), 1)
+        self.assertEqual(self.m.get_pc(), 0)
+        self.m.set_pc(2)
+        self.assertEqual(self.m.get_pc(), 2)
+        self.m.set_pc(0)
+        self.m.inc_pc()
+        self.assertEqual(self.m.get_pc(), 1)
 
     def test_csr_flags(self):
-        m = Machine([], [None])
-        m.set_flag("C", True)
-        m.set_flag("Z", True)
-        flags_bin = m.get_flags_as_bin()
-        self.assertEqual(flags_bin & 0x1, 1)  # C
-        self.assertEqual((flags_bin >> 3) & 1, 1)  # Z
+        self.m.set_flag(Flag.C, True)
+        self.m.set_flag(Flag.Z, True)
+        self.assertEqual(self.m.get_flags_as_bin(), (1 << Flag.C) | (1 << Flag.Z))
+
+    def test_flags_as_bin_roundtrip(self):
+        for flags in range(256):
+            self.m.set_flags_as_bin(flags)
+            self.assertEqual(self.m.get_flags_as_bin(), flags)
+            self.assertEqual(
+                [bool(self.m.get_flag(flag)) for flag in Flag],
+                [bool(flags >> flag & 1) for flag in Flag],
+            )
+
+    def test_result_flags_match_value_bits(self):
+        xlen = 256
+        mask = (1 << xlen) - 1
+        values = [0, 1, 2, mask, 1 << xlen, (1 << xlen) + 1, 1 << (xlen - 1)]
+        values += [-1, -(1 << xlen), 3 << (xlen + 7), (5 << 300) | 1]
+        for val in values:
+            expected = [
+                bool(val >> xlen & 1),
+                not val & mask,
+                bool(val >> (xlen - 1) & 1),
+                bool(val & 1),
+            ]
+            self.m.set_flags_as_bin(0)
+            self.m.set_c_z_m_l(val)
+            self.m.setx_c_z_m_l(val)
+            self.assertEqual(
+                [
+                    bool(self.m.get_flag(flag))
+                    for flag in (Flag.C, Flag.Z, Flag.M, Flag.L)
+                ],
+                expected,
+                msg=hex(val),
+            )
+            self.assertEqual(
+                [
+                    bool(self.m.get_flag(flag))
+                    for flag in (Flag.XC, Flag.XZ, Flag.XM, Flag.XL)
+                ],
+                expected,
+                msg=hex(val),
+            )
 
     def test_xlen_hex_str(self):
-        m = Machine([], [None])
-        s = m.get_xlen_hex_str(0xDEADBEEF)
+        s = self.m.get_xlen_hex_str(0xDEADBEEF)
         self.assertIn("deadbeef", s)
 
     def test_masks(self):
-        m = Machine([], [None])
-        self.assertEqual(m.xlen_mask, (1 << 256) - 1)
-        self.assertEqual(m.limb_mask, (1 << 32) - 1)
-        self.assertEqual(m.half_limb_mask, (1 << 16) - 1)
-        self.assertEqual(m.hw_mask, (1 << 128) - 1)
+        self.assertEqual(self.m.xlen_mask, (1 << 256) - 1)
+        self.assertEqual(self.m.limb_mask, (1 << 32) - 1)
+        self.assertEqual(self.m.half_limb_mask, (1 << 16) - 1)
+        self.assertEqual(self.m.hw_mask, (1 << 128) - 1)
 
     def test_acc(self):
-        m = Machine([], [None])
-        m.set_acc(12345)
-        self.assertEqual(m.get_acc(), 12345)
+        self.m.set_acc(12345)
+        self.assertEqual(self.m.get_acc(), 12345)
 
     def test_clear_regs(self):
-        m = Machine([], [None])
-        m.set_reg(5, 0xDEAD)
-        m.clear_regs()
-        self.assertEqual(m.get_reg(5), 0)
+        rnd_reset = self.m.get_reg("rnd")
+        for reg in range(32):
+            self.m.set_reg(reg, 0xDEAD + reg)
+        for name in ("mod", "dmp", "rfp", "lc", "rnd"):
+            self.m.set_reg(name, 0xBEEF)
+        self.m.set_gpr(2, 42)
+        self.m.set_pc(2)
+        self.m.clear_regs()
+        self.assertEqual([self.m.get_reg(reg) for reg in range(32)], [0] * 32)
+        self.assertEqual(
+            [self.m.get_reg(name) for name in ("mod", "dmp", "rfp", "lc")], [0] * 4
+        )
+        self.assertEqual(self.m.get_reg("rnd"), rnd_reset)
+        self.assertEqual(self.m.get_gpr(2), 0)
+        self.assertEqual(self.m.get_pc(), 0)
 
     def test_wsr(self):
-        m = Machine([], [None])
-        m.set_wsr(0, 0x42)  # WSR_MOD
-        self.assertEqual(m.get_wsr(0), 0x42)
+        self.m.set_wsr(0, 0x42)  # WSR_MOD
+        self.assertEqual(self.m.get_wsr(0), 0x42)
 
     def test_random_limb_operations(self):
         """Stress test: random set_reg_limb / get_reg_limb consistency."""
         rng = random.Random(0xBEEF)
-        m = Machine([], [None])
-        for _ in range(500):
-            reg = rng.randrange(0, 32)
-            limb_idx = rng.randrange(0, 8)
-            limb_val = rng.getrandbits(32)
-            m.set_reg_limb(reg, limb_idx, limb_val)
-            self.assertEqual(m.get_reg_limb(reg, limb_idx), limb_val)
+        ops = [
+            (rng.randrange(0, 32), rng.randrange(0, 8), rng.getrandbits(32))
+            for _ in range(500)
+        ]
+        # Shadow register file as a flat 32x8 limb table.
+        shadow = [[0] * 8 for _ in range(32)]
+        for reg, limb_idx, limb_val in ops:
+            self.m.set_reg_limb(reg, limb_idx, limb_val)
+            shadow[reg][limb_idx] = limb_val
+
+        self.assertEqual(
+            [[self.m.get_reg_limb(reg, idx) for idx in range(8)] for reg in range(32)],
+            shadow,
+        )
+        self.assertEqual(
+            [self.m.get_reg(reg) for reg in range(32)],
+            [
+                sum(limb << (32 * idx) for idx, limb in enumerate(limbs))
+                for limbs in shadow
+            ],
+        )
+
+
+_MODEXP_ASM = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "asm", "modexp.S"
+)
+
+
+@unittest.skipUnless(os.path.isfile(_MODEXP_ASM), "modexp.S not available")
+class MontSqrFastPathTest(unittest.TestCase):
+    """The fused sqrx_exp must leave DMEM as the simulated routine does."""
+
+    def run_modexp(self, rsa, fast_path, inval, exp):
+        words = 3
+        with mock.patch.object(rsa, "PROGRAM_OTBN_ASM_FILE", _MODEXP_ASM):
+            with mock.patch.object(rsa, "FAST_MONTMUL", fast_path):
+                rsa.init_dmem()
+                rsa.load_program_otbn_asm()
+        installed = any(isinstance(ins, MontSqrFastPath) for ins in rsa.ins_objects)
+        self.assertEqual(installed, fast_path)
+        rsa.load_mod(rsa.RSA_N[768])
+        rsa.run_modload(words)
+        rsa.load_full_bn_val(rsa.DMEMP_IN, inval)
+        machines = []
+        run_primitive = rsa._run_primitive
+
+        def run(name):
+            machines.append(run_primitive(name))
+            return machines[-1]
+
+        with mock.patch.object(rsa, "_run_primitive", run):
+            res = rsa.run_modexp(words, exp)
+        (machine,) = machines
+        return res, list(rsa.dmem), list(machine.call_stack)
+
+    def test_fused_modexp_matches_simulated_routine(self):
+        from ot_dsim import sim_rsa_tests as rsa
+
+        rng = random.Random(0x5A5A)
+        inval = rng.randrange(rsa.RSA_N[768])
+        exp = rng.getrandbits(48) | 1
+        slow_res, slow_dmem, slow_stack = self.run_modexp(rsa, False, inval, exp)
+        fast_res, fast_dmem, fast_stack = self.run_modexp(rsa, True, inval, exp)
+        self.assertEqual(slow_res, pow(inval, exp, rsa.RSA_N[768]))
+        self.assertEqual(fast_res, slow_res)
+        # Covers the DMEM output area as well as everything the routine
+        # leaves behind outside of it.
+        self.assertEqual(fast_dmem, slow_dmem)
+        # Every fused call returned through the caller's pushed address.
+        self.assertEqual(fast_stack, slow_stack)
+
+    def test_fused_routine_needs_a_return_address(self):
+        from ot_dsim import sim_rsa_tests as rsa
+
+        self.run_modexp(rsa, True, 1, 1)
+        rsa.load_pointer(
+            3, rsa.DMEM_LOC_SQR_PTRS, rsa.DMEMP_OUT, rsa.DMEMP_OUT, rsa.DMEMP_OUT
+        )
+        addr = rsa.stop_addr_dict["mul1"] + 1
+        fused = rsa.ins_objects[addr]
+        self.assertIsInstance(fused, MontSqrFastPath)
+        machine = Machine(rsa.dmem, rsa.ins_objects, addr, addr, ctx=rsa.ctx)
+        with self.assertRaises(CallStackUnderrun):
+            fused.execute(machine)
+        ret_addr = rsa.start_addr_dict["modexp"]
+        machine.push_call_stack(ret_addr)
+        _, ret = fused.execute(machine)
+        self.assertEqual(ret, ret_addr)
+        self.assertEqual(list(machine.call_stack), [])
 
 
 if __name__ == "__main__":
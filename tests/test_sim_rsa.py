@@ -0,0 +1,98 @@
+"""Tests for the RSA driver built on the primitives of the OTBN modexp library."""
+
+import os
+import unittest
+from unittest import mock
+
+from ot_dsim import sim_rsa_tests as rsa
+from ot_dsim.bignum_lib.machine import Flag
+
+_MODEXP_ASM = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "asm", "modexp.S"
+)
+
+
+def machine_state(machine):
+    """Architectural state a primitive leaves behind"""
+    return {
+        "r": list(machine.r),
+        "gpr": list(machine.gpr),
+        "flags": [machine.get_flag(flag) for flag in Flag],
+        "call_stack": list(machine.call_stack),
+        "loop_stack": list(machine.loop_stack),
+        "dmem": list(machine.dmem),
+    }
+
+
+@unittest.skipUnless(os.path.isfile(_MODEXP_ASM), "modexp.S not available")
+class PrimitiveTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(rsa, "PROGRAM_OTBN_ASM_FILE", _MODEXP_ASM):
+            rsa.init_dmem()
+            rsa.load_program_otbn_asm()
+        rsa.load_mod(rsa.RSA_N[768])
+        rsa.run_modload(3)
+        rsa.load_full_bn_val(rsa.DMEMP_IN, 0x1234567890ABCDEF)
+        self.dmem = list(rsa.dmem)
+
+    def run_mul1(self):
+        rsa.dmem[:] = self.dmem
+        rsa.load_pointer(3, rsa.DMEM_LOC_IN_PTRS, rsa.DMEMP_IN, 0, rsa.DMEMP_OUT)
+        return machine_state(rsa._run_primitive("mul1"))
+
+    def test_primitives_do_not_share_machine_state(self):
+        alone = self.run_mul1()
+        rsa.dmem[:] = self.dmem
+        rsa.run_montmul(3, rsa.DMEMP_IN, rsa.DMEMP_RR, rsa.DMEMP_IN)
+        self.assertEqual(self.run_mul1(), alone)
+
+    def test_modexp_window_keeps_table_in_dmem(self):
+        mod = rsa.RSA_N[768]
+        inval, exp = 0x1234567890ABCDEF, 0x9E3779B97F4A7C15
+        for k in (2, 5):
+            with self.subTest(k=k):
+                rsa.dmem[:] = self.dmem
+                with mock.patch.object(
+                    rsa, "load_full_bn_val", wraps=rsa.load_full_bn_val
+                ) as load:
+                    res = rsa.modexp_window(3, inval, exp, k)
+                self.assertEqual(res, pow(inval, exp, mod))
+                # only the input is loaded, table entries are never copied in
+                load.assert_called_once_with(rsa.DMEMP_IN, inval)
+                self.assertEqual(len(rsa.dmem), rsa.DMEM_DEPTH)
+                self.assertEqual(rsa.dmem[4:38], self.dmem[4:38])
+
+
+@unittest.skipUnless(os.path.isfile(_MODEXP_ASM), "modexp.S not available")
+class DecryptCrtTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(rsa, "PROGRAM_OTBN_ASM_FILE", _MODEXP_ASM):
+            rsa.init_dmem()
+            rsa.load_program_otbn_asm()
+        self.msg = rsa.get_msg_val("ot_dsim CRT decryption")
+
+    def test_crt_decrypts_word_aligned_key(self):
+        enc = pow(self.msg, rsa.EXP_PUB, rsa.RSA_N[1024])
+        with mock.patch.object(rsa, "rsa_decrypt", wraps=rsa.rsa_decrypt) as dec:
+            res = rsa.rsa_decrypt_crt(
+                rsa.RSA_P[1024], rsa.RSA_Q[1024], 4, rsa.RSA_D[1024], enc
+            )
+        self.assertEqual(res, self.msg)
+        # two half-width decryptions, one per prime
+        self.assertEqual(
+            [call.args[:2] for call in dec.call_args_list],
+            [(rsa.RSA_P[1024], 2), (rsa.RSA_Q[1024], 2)],
+        )
+
+    def test_crt_falls_back_for_unaligned_primes(self):
+        enc = pow(self.msg, rsa.EXP_PUB, rsa.RSA_N[768])
+        with mock.patch.object(rsa, "rsa_decrypt", return_value=self.msg) as dec:
+            res = rsa.rsa_decrypt_crt(
+                rsa.RSA_P[768], rsa.RSA_Q[768], 3, rsa.RSA_D[768], enc
+            )
+        self.assertEqual(res, self.msg)
+        dec.assert_called_once_with(rsa.RSA_N[768], 3, rsa.RSA_D[768], enc)
+
+
+if __name__ == "__main__":
+    unittest.main()